@@ -3,49 +3,74 @@
 from __future__ import annotations
 
 from collections.abc import Callable
-from typing import Any, TypeVar, cast
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, TypeVar, cast
 
-import requests
 from ovos_bus_client.message import Message
-from ovos_number_parser import extract_number
 from ovos_utils import classproperty
 from ovos_utils.log import LOG
 from ovos_utils.process_utils import RuntimeRequirements
 from ovos_workshop.decorators import intent_handler
 from ovos_workshop.skills import OVOSSkill
-from padacioso import IntentContainer
-from soco.exceptions import MusicServiceAuthException, SoCoException
 
+from .announce import AnnouncementCache, clip_path
 from .auth import AuthenticationBroker
 from .constants import (
+    DEFAULT_COMMAND_TIMEOUT,
     DEFAULT_SOURCE,
     DEFAULT_URL_SHORTENER,
     DEFAULT_VOLUME_STEP,
     LARGE_VOLUME_STEP,
 )
-from .controller import PlaybackResult, SonosController, normalize_name
+from .deadline import Deadline
+from .discovery import DiscoveryHistory
 from .exceptions import (
     AmbiguousSpeakerError,
     AuthenticationNotSupportedError,
     AuthenticationRequiredError,
     CategoryNotSupportedError,
+    FeatureNotSupportedError,
     NoResultsError,
     NoSpeakersError,
     ServiceNotFoundError,
+    SonosControllerError,
     SpeakerNotFoundError,
+    SpeechSynthesisError,
 )
+from .hardware import SpeakerInfoStore
+from .lazy import LazyModule
+from .library import LocalLibrary
+from .locales import LocaleResources
+from .scenes import SceneStore
+from .templates import SlotEngine, TemplateIndex
+from .warmup import WarmUp
+
+if TYPE_CHECKING:
+    from .controller import PlaybackResult
+
+# SoCo and requests are only needed once the skill talks to the household, so
+# importing the package for its metadata stays cheap.
+requests = LazyModule("requests")
+soco_exceptions = LazyModule("soco.exceptions")
 
 DEFAULT_SETTINGS = {
     "default_source": DEFAULT_SOURCE,
     "link_code": "",
     "duck": False,
+    "group_volume": False,
+    "local_music_path": "",
     "playing_confirmation": False,
     "searching_confirmation": True,
     "url_shortener": DEFAULT_URL_SHORTENER,
+    "warm_up": True,
 }
 
 Handler = TypeVar("Handler", bound=Callable[..., Any])
 CLASSIFIER_INTENT_HANDLERS: dict[str, str] = {}
+_LOCALE_DIR = Path(__file__).parent / "locale"
+# Below this classifier confidence every Sonos intent is matched, so that a
+# likely misclassification can be rerouted.
+_TEMPLATE_CONFIDENCE = 0.5
 
 
 def sonos_intent_handler(intent_file: str) -> Callable[[Handler], Handler]:
@@ -65,13 +90,16 @@ def _as_bool(value: Any) -> bool:
     return bool(value)
 
 
-def _spelling_alphabet(values: dict[str, str]) -> dict[str, str]:
-    """Index standard OVOS display/system values by the code character."""
-    return {
-        str(system_value).upper(): str(spoken_value)
-        for spoken_value, system_value in values.items()
-        if str(system_value).strip()
-    }
+def _command_deadline() -> Deadline:
+    """Bound one voice command so an unresponsive room cannot stall it."""
+    return Deadline(DEFAULT_COMMAND_TIMEOUT)
+
+
+def _store_entities(message: Message, entities: dict[str, Any]) -> None:
+    """Add hydrated slots without overriding entities the pipeline sent."""
+    for name, value in entities.items():
+        key = {"groupspeaker": "group_speaker"}.get(name, name)
+        message.data.setdefault(key, value)
 
 
 class SonosControllerSkill(OVOSSkill):
@@ -80,14 +108,25 @@ class SonosControllerSkill(OVOSSkill):
     def __init__(
         self, bus: Any | None = None, skill_id: str = "", **kwargs: Any
     ) -> None:
+        from .controller import SonosController
+
         # Domain state is available before OVOS starts registering the skill.
-        self.controller = SonosController()
+        self.controller = SonosController(events=True)
         self.service = DEFAULT_SOURCE
         self.duck_enabled = False
         self.playing_confirmation = False
         self.searching_confirmation = True
-        self.nato_dict: dict[str, str] = {}
-        self._entity_parsers: dict[str, IntentContainer] = {}
+        self.locales = LocaleResources(
+            lambda lang: self.load_lang(lang=lang),
+            CLASSIFIER_INTENT_HANDLERS,
+            _LOCALE_DIR,
+        )
+        self.scenes = SceneStore()
+        self.announcements: AnnouncementCache | None = None
+        # Bus clients may only play files below these folders.
+        self.clip_roots: tuple[Path, ...] = ()
+        self._tts: Any | None = None
+        self.warm_up: WarmUp | None = None
         super().__init__(bus=bus, skill_id=skill_id, **kwargs)
 
         # The current OVOS loader supplies both values. Keeping unbound
@@ -97,15 +136,30 @@ class SonosControllerSkill(OVOSSkill):
             return
 
         self.settings.merge(DEFAULT_SETTINGS, new_only=True)
-        self.nato_dict = _spelling_alphabet(
-            self.resources.load_named_value_file("codes") or {}
+        self.scenes = SceneStore(Path(self.file_system.path) / "scenes.json")
+        self.locales.index = TemplateIndex(Path(self.file_system.path) / "templates")
+        self.controller.hardware = SpeakerInfoStore(
+            Path(self.file_system.path) / "speakers.json"
+        )
+        self.controller.discovery_history = DiscoveryHistory(
+            Path(self.file_system.path) / "discovery.json"
+        )
+        self.announcements = AnnouncementCache(
+            Path(self.file_system.path) / "announcements", self._synthesize
         )
+        self.clip_roots = (
+            Path(self.file_system.path) / "clips",
+            self.announcements.directory,
+        )
+        self.locales.pin(self.lang)
         self.register_entity_file("service.entity")
         self.settings_change_callback = self.on_settings_changed
         self.on_settings_changed()
         self._register_audio_events()
+        self._register_bus_api()
 
         self._refresh_household(announce=False)
+        self._start_warm_up()
 
     @classproperty
     def runtime_requirements(self) -> RuntimeRequirements:
@@ -132,6 +186,215 @@ class SonosControllerSkill(OVOSSkill):
         self.add_event("mycroft.audio.service.pause", self._handle_pause_music)
         self.add_event("mycroft.audio.service.resume", self._handle_resume_music)
 
+    def _register_bus_api(self) -> None:
+        """Register message-bus requests that have no voice intent."""
+        self.add_event("sonos.scene.save", self._handle_scene_save)
+        self.add_event("sonos.scene.apply", self._handle_scene_apply)
+        self.add_event("sonos.scene.delete", self._handle_scene_delete)
+        self.add_event("sonos.scene.list", self._handle_scene_list)
+        self.add_event("sonos.announce", self._handle_announce)
+        self.add_event("sonos.batch", self._handle_batch)
+        self.add_event("sonos.state.get", self._handle_state_get)
+        self.add_event("sonos.speakers.get", self._handle_speakers_get)
+        self.add_event("sonos.now_playing.get", self._handle_now_playing_get)
+        self.add_event("sonos.diagnostics.get", self._handle_diagnostics_get)
+        self.controller.state.add_listener(self._emit_state_change)
+
+    def _reply(self, message: Message, **data: Any) -> None:
+        self.bus.emit(message.response(data))
+
+    def _handle_scene_save(self, message: Message) -> None:
+        """Capture named rooms, or the whole household, as a scene."""
+        name = str(message.data.get("name") or "").strip()
+        if not name:
+            self._reply(message, error="missing scene name")
+            return
+        try:
+            scene = self.controller.capture_scene(
+                name, message.data.get("speakers"), deadline=_command_deadline()
+            )
+            self.scenes.save(scene)
+        except (OSError, soco_exceptions.SoCoException, SonosControllerError) as error:
+            LOG.warning("Sonos scene %s was not saved: %s", name, error)
+            self._reply(message, name=name, error=str(error) or type(error).__name__)
+            return
+        self._reply(message, name=name, rooms=[room.name for room in scene.rooms])
+
+    def _handle_scene_apply(self, message: Message) -> None:
+        """Restore a stored scene with the fewest possible changes."""
+        name = str(message.data.get("name") or "")
+        scene = self.scenes.get(name)
+        if scene is None:
+            self._reply(message, name=name, error="unknown scene")
+            return
+        try:
+            changed = self.controller.apply_scene(scene, deadline=_command_deadline())
+        except (OSError, soco_exceptions.SoCoException, SonosControllerError) as error:
+            LOG.warning("Sonos scene %s was not applied: %s", name, error)
+            self._reply(message, name=name, error=str(error) or type(error).__name__)
+            return
+        self._reply(message, name=scene.name, changed=changed)
+
+    def _handle_scene_delete(self, message: Message) -> None:
+        name = str(message.data.get("name") or "")
+        try:
+            deleted = self.scenes.delete(name)
+        except OSError as error:
+            LOG.warning("Sonos scene %s was not deleted: %s", name, error)
+            self._reply(message, name=name, error=str(error) or type(error).__name__)
+            return
+        self._reply(message, name=name, deleted=deleted)
+
+    def _handle_scene_list(self, message: Message) -> None:
+        self._reply(message, scenes=list(self.scenes.names()))
+
+    def _handle_announce(self, message: Message) -> None:
+        """Play TTS text, a local clip, or a URL on Sonos rooms.
+
+        Prior playback is restored once the clip ends.
+        """
+        data = message.data
+        speakers = data.get("speakers") or (
+            [data["speaker"]] if data.get("speaker") else None
+        )
+        try:
+            uri = self._announcement_uri(message)
+            if uri is None:
+                self._reply(message, error="missing text, path, or uri")
+                return
+            rooms = self.controller.announce(
+                uri, speakers, data.get("volume"), deadline=_command_deadline()
+            )
+        except (
+            OSError,
+            soco_exceptions.SoCoException,
+            SonosControllerError,
+            ValueError,
+        ) as error:
+            LOG.warning("Sonos announcement failed: %s", error)
+            self._reply(message, error=str(error) or type(error).__name__)
+            return
+        self._reply(message, rooms=rooms)
+
+    def _handle_batch(self, message: Message) -> None:
+        """Run several room operations and reply with one result each."""
+        operations = message.data.get("operations")
+        if not isinstance(operations, list) or not all(
+            isinstance(operation, dict) for operation in operations
+        ):
+            self._reply(message, error="operations must be a list of objects")
+            return
+        try:
+            results = self.controller.run_batch(
+                operations, deadline=_command_deadline()
+            )
+        except (OSError, soco_exceptions.SoCoException, SonosControllerError) as error:
+            LOG.warning("Sonos batch failed: %s", error)
+            self._reply(message, error=str(error) or type(error).__name__)
+            return
+        self._reply(message, results=results)
+
+    def _handle_state_get(self, message: Message) -> None:
+        """Reply with every room's cached state without contacting players."""
+        self._reply(message, rooms=self.controller.cached_rooms())
+
+    def _handle_speakers_get(self, message: Message) -> None:
+        """Reply with every room and any hardware details already stored."""
+        speakers = []
+        for speaker in self.controller.speakers:
+            uid = str(getattr(speaker, "uid", speaker.player_name))
+            entry = {
+                "name": speaker.player_name,
+                "uid": uid,
+                "ip_address": getattr(speaker, "ip_address", None),
+            }
+            info = self.controller.hardware.get(uid)
+            if info is not None:
+                entry.update(
+                    model_name=info.model_name,
+                    software_version=info.software_version,
+                    capabilities=info.capabilities(),
+                )
+            speakers.append(entry)
+        self._reply(message, speakers=speakers)
+
+    def _handle_now_playing_get(self, message: Message) -> None:
+        """Reply with the cached track of every playing group."""
+        self._reply(
+            message,
+            rooms=[
+                room
+                for room in self.controller.cached_rooms()
+                if room.get("transport_state") == "PLAYING"
+                and room.get("coordinator") == room["uid"]
+            ],
+        )
+
+    def _handle_diagnostics_get(self, message: Message) -> None:
+        """Reply with speaker health, loaded locale tables, and warm-up timings."""
+        self._reply(
+            message,
+            **self.controller.diagnostics(),
+            locales=self.locales.stats(),
+            warm_up=self.warm_up.stats() if self.warm_up is not None else None,
+        )
+
+    def _emit_state_change(self, uid: str, changes: dict[str, Any]) -> None:
+        """Publish event-driven state changes so consumers need not poll."""
+        room = self.controller.cached_room(uid)
+        if room is None or not room["subscribed"]:
+            return
+        self.bus.emit(
+            Message(
+                "sonos.state.changed",
+                {"uid": uid, "name": room["name"], "changes": changes, "room": room},
+            )
+        )
+
+    def _announcement_uri(self, message: Message) -> str | None:
+        data = message.data
+        if data.get("uri"):
+            return str(data["uri"])
+        if data.get("path"):
+            path = clip_path(str(data["path"]), self.clip_roots)
+        elif data.get("text") and self.announcements is not None:
+            lang = str(data.get("lang") or self.lang)
+            try:
+                path = self.announcements.path_for(
+                    str(data["text"]), lang, self._voice()
+                )
+            except Exception as error:
+                # TTS plugins fail with arbitrary exceptions, including a
+                # missing plugin package.
+                raise SpeechSynthesisError(
+                    str(error) or type(error).__name__
+                ) from error
+        else:
+            return None
+        if not self.controller.speakers:
+            raise NoSpeakersError()
+        return self.controller.media_server.url_for(
+            path, self.controller.speakers[0].ip_address
+        )
+
+    def _tts_engine(self) -> Any:
+        if self._tts is None:
+            from ovos_plugin_manager.tts import OVOSTTSFactory
+
+            self._tts = OVOSTTSFactory.create()
+        return self._tts
+
+    def _voice(self) -> str:
+        engine = self._tts_engine()
+        return f"{engine.tts_name}:{getattr(engine, 'voice', '')}"
+
+    def _synthesize(self, text: str, lang: str, target: Path) -> Path:
+        """Render one phrase with the configured OVOS TTS engine."""
+        engine = self._tts_engine()
+        path = target.with_suffix(f".{engine.audio_ext}")
+        engine.get_tts(text, str(path), lang=lang)
+        return path
+
     def on_settings_changed(self) -> None:
         """Reload inexpensive settings without rediscovery or event duplication."""
         configured_service = str(
@@ -139,6 +402,12 @@ class SonosControllerSkill(OVOSSkill):
         ).strip()
         self.service = configured_service or DEFAULT_SOURCE
         self.duck_enabled = _as_bool(self.settings.get("duck", False))
+        self.controller.group_volume = _as_bool(
+            self.settings.get("group_volume", False)
+        )
+        self._configure_local_library(
+            str(self.settings.get("local_music_path") or "").strip()
+        )
         self.playing_confirmation = _as_bool(
             self.settings.get("playing_confirmation", False)
         )
@@ -146,10 +415,30 @@ class SonosControllerSkill(OVOSSkill):
             self.settings.get("searching_confirmation", True)
         )
 
+    def shutdown(self) -> None:
+        """Release Sonos event subscriptions before the skill is unloaded."""
+        if self.warm_up is not None:
+            self.warm_up.cancel()
+        self.controller.state.remove_listener(self._emit_state_change)
+        self.controller.close()
+        super().shutdown()
+
+    def _configure_local_library(self, path: str) -> None:
+        """Index a local music folder, keeping the index if it is unchanged."""
+        library = self.controller.local_library
+        if not path:
+            self.controller.local_library = None
+        elif library is None or library.directories != (Path(path).expanduser(),):
+            self.controller.local_library = LocalLibrary((path,))
+
     def _refresh_household(self, announce: bool) -> bool:
         try:
-            speakers = self.controller.refresh()
-        except (OSError, SoCoException, requests.RequestException) as error:
+            speakers = self.controller.refresh(on_found=self._emit_speaker_found)
+        except (
+            OSError,
+            soco_exceptions.SoCoException,
+            requests.RequestException,
+        ) as error:
             LOG.warning("Sonos discovery failed: %s", error)
             speakers = ()
         if not speakers:
@@ -158,9 +447,26 @@ class SonosControllerSkill(OVOSSkill):
             return False
         return True
 
+    def _emit_speaker_found(self, speaker: Any) -> None:
+        """Publish each room while discovery is still listening for others."""
+        self.bus.emit(
+            Message(
+                "sonos.speaker.found",
+                {
+                    "uid": str(getattr(speaker, "uid", speaker.player_name)),
+                    "name": speaker.player_name,
+                    "ip_address": getattr(speaker, "ip_address", None),
+                },
+            )
+        )
+
     @sonos_intent_handler("sonos.discovery.intent")
     def _handle_speaker_discovery(self, message: Message) -> None:
-        """Refresh and optionally list Sonos rooms."""
+        """Refresh and optionally list Sonos rooms.
+
+        The count is spoken as soon as no new player has answered for a short
+        quiet period, rather than after the full discovery timeout.
+        """
         if self._hydrate_message_entities(message, "sonos.discovery.intent"):
             return
         if not self._refresh_household(announce=True):
@@ -196,20 +502,42 @@ class SonosControllerSkill(OVOSSkill):
         requested_service = str(message.data.get("service") or "").strip()
         return requested_service or self.service or DEFAULT_SOURCE
 
-    def _entity_parser(self, lang: str) -> IntentContainer:
-        """Return the cached local parser used to hydrate classifier results."""
-        cache_key = lang.casefold()
-        parser = self._entity_parsers.get(cache_key)
-        if parser is None:
-            resources = self.load_lang(lang=lang)
-            parser = IntentContainer(n_workers=1)
-            for candidate in CLASSIFIER_INTENT_HANDLERS:
-                parser.add_intent(
-                    candidate,
-                    resources.load_intent_file(candidate),
-                )
-            self._entity_parsers[cache_key] = parser
-        return parser
+    def _entity_parser(self, lang: str) -> SlotEngine:
+        """Return the local parser used to hydrate classifier results."""
+        return self.locales.parser(lang)
+
+    def _start_warm_up(self) -> None:
+        """Prepare what the first commands need without delaying them."""
+        if not _as_bool(self.settings.get("warm_up", True)):
+            return
+        self.warm_up = WarmUp(
+            (
+                ("parser", self._warm_entity_parser),
+                ("service", self._warm_default_service),
+            )
+        )
+        self.warm_up.start()
+
+    def _warm_entity_parser(self) -> None:
+        """Build the parser for the configured language before it is needed."""
+        try:
+            self._entity_parser(self.lang)
+        except (OSError, RuntimeError, ValueError) as error:
+            LOG.warning("Unable to prepare the Sonos entity parser: %s", error)
+
+    def _warm_default_service(self) -> None:
+        """Build the default service's provider and read its search categories."""
+        if not self.controller.speakers:
+            return
+        try:
+            self.controller.prepare_service(self.service, deadline=_command_deadline())
+        except (
+            OSError,
+            soco_exceptions.SoCoException,
+            requests.RequestException,
+            SonosControllerError,
+        ) as error:
+            LOG.warning("Unable to prepare Sonos service %s: %s", self.service, error)
 
     def _hydrate_message_entities(self, message: Message, intent_file: str) -> bool:
         """Verify a classifier label and recover its free-form slots.
@@ -219,6 +547,10 @@ class SonosControllerSkill(OVOSSkill):
         extract their free-form slots. A local template match also corrects a
         semantic-model collision before the selected handler changes Sonos.
 
+        A confident label is checked against its own templates first. Only
+        when none matches, or confidence is low, are all Sonos intents
+        matched.
+
         Returns True when the message was rerouted to a different handler.
         """
         generic = {"confidence", "lang", "utterance", "utterances"}
@@ -233,13 +565,16 @@ class SonosControllerSkill(OVOSSkill):
         lang = str(message.data.get("lang") or getattr(message, "lang", self.lang))
         try:
             parser = self._entity_parser(lang)
-            match = parser.calc_intent(utterance) or {}
-            entities = match.get("entities") or {}
-            for name, value in entities.items():
-                key = {"groupspeaker": "group_speaker"}.get(name, name)
-                message.data.setdefault(key, value)
-            matched_intent = str(match.get("name") or "")
-            if matched_intent and matched_intent != intent_file:
+            confidence = float(message.data.get("confidence", 1.0) or 0.0)
+            match = None
+            if confidence >= _TEMPLATE_CONFIDENCE:
+                match = parser.match(utterance, intent_file)
+            match = match or parser.match(utterance)
+            if match is None:
+                return False
+            matched_intent, slots = match
+            _store_entities(message, slots)
+            if matched_intent != intent_file:
                 self.bus.emit(
                     Message(
                         "sonos.classifier.rerouted",
@@ -277,6 +612,7 @@ class SonosControllerSkill(OVOSSkill):
                 category=category,
                 query=query,
                 artist=str(artist).strip() if artist else None,
+                deadline=_command_deadline(),
             )
         except NoResultsError:
             dialog = {
@@ -299,13 +635,17 @@ class SonosControllerSkill(OVOSSkill):
             self.speak_dialog("error.support", data={"service": service})
         except AuthenticationNotSupportedError:
             self.speak_dialog("error.auth.unsupported", data={"service": service})
-        except (AuthenticationRequiredError, MusicServiceAuthException):
+        except (AuthenticationRequiredError, soco_exceptions.MusicServiceAuthException):
             self.speak_dialog("error.auth", data={"service": service})
         except (SpeakerNotFoundError, AmbiguousSpeakerError):
             self.speak_dialog("error.speaker", data={"speaker": speaker})
         except NoSpeakersError:
             self.speak_dialog("error.discovery")
-        except (OSError, SoCoException, requests.RequestException) as error:
+        except (
+            OSError,
+            soco_exceptions.SoCoException,
+            requests.RequestException,
+        ) as error:
             LOG.exception("Sonos could not play %s: %s", query, error)
             self.speak_dialog("error.sonos")
         else:
@@ -318,7 +658,12 @@ class SonosControllerSkill(OVOSSkill):
                 self.speak_dialog(
                     "sonos.speaker.muted", data={"speaker": result.speaker}
                 )
-        except (OSError, NoSpeakersError, SpeakerNotFoundError, SoCoException):
+        except (
+            OSError,
+            NoSpeakersError,
+            SpeakerNotFoundError,
+            soco_exceptions.SoCoException,
+        ):
             LOG.debug("Unable to read Sonos volume after starting playback")
 
         if not self.playing_confirmation:
@@ -380,6 +725,7 @@ class SonosControllerSkill(OVOSSkill):
                 speaker=message.data.get("speaker"),
                 required_state=required_state,
                 mode=mode,
+                deadline=_command_deadline(),
             )
         except (SpeakerNotFoundError, AmbiguousSpeakerError):
             self.speak_dialog(
@@ -387,7 +733,7 @@ class SonosControllerSkill(OVOSSkill):
             )
         except NoSpeakersError:
             self.speak_dialog("error.discovery")
-        except (OSError, SoCoException) as error:
+        except (OSError, soco_exceptions.SoCoException) as error:
             LOG.warning("Sonos %s command failed: %s", command, error)
             self.speak_dialog("error.sonos")
 
@@ -435,7 +781,10 @@ class SonosControllerSkill(OVOSSkill):
             return
         try:
             self.controller.set_playback_option(
-                option, enabled, message.data.get("speaker")
+                option,
+                enabled,
+                message.data.get("speaker"),
+                deadline=_command_deadline(),
             )
         except (SpeakerNotFoundError, AmbiguousSpeakerError):
             self.speak_dialog(
@@ -443,7 +792,7 @@ class SonosControllerSkill(OVOSSkill):
             )
         except NoSpeakersError:
             self.speak_dialog("error.discovery")
-        except (OSError, SoCoException) as error:
+        except (OSError, soco_exceptions.SoCoException) as error:
             LOG.warning("Sonos %s change failed: %s", option, error)
             self.speak_dialog("error.sonos")
 
@@ -457,14 +806,16 @@ class SonosControllerSkill(OVOSSkill):
         if self._hydrate_message_entities(message, intent_name):
             return
         try:
-            self.controller.change_volume(delta, message.data.get("speaker"))
+            self.controller.change_volume(
+                delta, message.data.get("speaker"), deadline=_command_deadline()
+            )
         except (SpeakerNotFoundError, AmbiguousSpeakerError):
             self.speak_dialog(
                 "error.speaker", data={"speaker": message.data.get("speaker", "")}
             )
         except NoSpeakersError:
             self.speak_dialog("error.discovery")
-        except (OSError, SoCoException) as error:
+        except (OSError, soco_exceptions.SoCoException) as error:
             LOG.warning("Sonos volume change failed: %s", error)
             self.speak_dialog("error.sonos")
 
@@ -489,6 +840,8 @@ class SonosControllerSkill(OVOSSkill):
         """Set an exact 0-100 volume using OVOS's locale-aware parser."""
         if self._hydrate_message_entities(message, "sonos.volume.set.intent"):
             return
+        from ovos_number_parser import extract_number
+
         raw_level = str(message.data.get("volume") or "").strip()
         lang = str(message.data.get("lang") or getattr(message, "lang", self.lang))
         level = extract_number(raw_level, lang=lang)
@@ -501,14 +854,16 @@ class SonosControllerSkill(OVOSSkill):
             self.speak_dialog("error.volume", data={"volume": raw_level})
             return
         try:
-            self.controller.set_volume(int(level), message.data.get("speaker"))
+            self.controller.set_volume(
+                int(level), message.data.get("speaker"), deadline=_command_deadline()
+            )
         except (SpeakerNotFoundError, AmbiguousSpeakerError):
             self.speak_dialog(
                 "error.speaker", data={"speaker": message.data.get("speaker", "")}
             )
         except NoSpeakersError:
             self.speak_dialog("error.discovery")
-        except (OSError, SoCoException) as error:
+        except (OSError, soco_exceptions.SoCoException) as error:
             LOG.warning("Sonos exact volume change failed: %s", error)
             self.speak_dialog("error.sonos")
 
@@ -517,14 +872,16 @@ class SonosControllerSkill(OVOSSkill):
         if self._hydrate_message_entities(message, intent_name):
             return
         try:
-            self.controller.set_mute(muted, message.data.get("speaker"))
+            self.controller.set_mute(
+                muted, message.data.get("speaker"), deadline=_command_deadline()
+            )
         except (SpeakerNotFoundError, AmbiguousSpeakerError):
             self.speak_dialog(
                 "error.speaker", data={"speaker": message.data.get("speaker", "")}
             )
         except NoSpeakersError:
             self.speak_dialog("error.discovery")
-        except (OSError, SoCoException) as error:
+        except (OSError, soco_exceptions.SoCoException) as error:
             LOG.warning("Sonos mute change failed: %s", error)
             self.speak_dialog("error.sonos")
 
@@ -547,6 +904,7 @@ class SonosControllerSkill(OVOSSkill):
         intent_name = intent_names[operation]
         if self._hydrate_message_entities(message, intent_name):
             return
+        deadline = _command_deadline()
         try:
             if operation == "group":
                 group_speaker = message.data.get("group_speaker") or message.data.get(
@@ -555,11 +913,16 @@ class SonosControllerSkill(OVOSSkill):
                 self.controller.group_speakers(
                     str(message.data.get("speaker") or ""),
                     (str(group_speaker or ""),),
+                    deadline=deadline,
                 )
             elif operation == "all":
-                self.controller.group_all(str(message.data.get("speaker") or ""))
+                self.controller.group_all(
+                    str(message.data.get("speaker") or ""), deadline=deadline
+                )
             else:
-                self.controller.ungroup_speaker(str(message.data.get("speaker") or ""))
+                self.controller.ungroup_speaker(
+                    str(message.data.get("speaker") or ""), deadline=deadline
+                )
         except (SpeakerNotFoundError, AmbiguousSpeakerError):
             speaker = (
                 message.data.get("group_speaker")
@@ -569,7 +932,7 @@ class SonosControllerSkill(OVOSSkill):
             self.speak_dialog("error.speaker", data={"speaker": speaker})
         except NoSpeakersError:
             self.speak_dialog("error.discovery")
-        except (OSError, SoCoException) as error:
+        except (OSError, soco_exceptions.SoCoException) as error:
             LOG.warning("Sonos grouping failed: %s", error)
             self.speak_dialog("error.sonos")
 
@@ -596,16 +959,21 @@ class SonosControllerSkill(OVOSSkill):
         if self._hydrate_message_entities(message, intent_name):
             return
         speaker = str(message.data.get("speaker") or "")
+        deadline = _command_deadline()
         try:
             if option == "tv":
-                self.controller.switch_to_tv(speaker)
+                self.controller.switch_to_tv(speaker, deadline=deadline)
             else:
-                self.controller.set_home_theater_option(option, bool(enabled), speaker)
+                self.controller.set_home_theater_option(
+                    option, bool(enabled), speaker, deadline=deadline
+                )
         except (SpeakerNotFoundError, AmbiguousSpeakerError):
             self.speak_dialog("error.speaker", data={"speaker": speaker})
+        except FeatureNotSupportedError as error:
+            self.speak_dialog("error.capability", data={"speaker": str(error)})
         except NoSpeakersError:
             self.speak_dialog("error.discovery")
-        except (OSError, SoCoException) as error:
+        except (OSError, soco_exceptions.SoCoException) as error:
             LOG.warning("Sonos home-theater change failed: %s", error)
             self.speak_dialog("error.sonos")
 
@@ -633,16 +1001,16 @@ class SonosControllerSkill(OVOSSkill):
         if not self.duck_enabled:
             return
         try:
-            self.controller.duck(DEFAULT_VOLUME_STEP)
-        except (OSError, SoCoException, NoSpeakersError) as error:
+            self.controller.duck(DEFAULT_VOLUME_STEP, _command_deadline())
+        except (OSError, soco_exceptions.SoCoException, NoSpeakersError) as error:
             LOG.debug("Sonos ducking skipped: %s", error)
 
     def _handle_unduck_volume(self, _: Message) -> None:
         if not self.duck_enabled:
             return
         try:
-            self.controller.unduck()
-        except (OSError, SoCoException, NoSpeakersError) as error:
+            self.controller.unduck(_command_deadline())
+        except (OSError, soco_exceptions.SoCoException, NoSpeakersError) as error:
             LOG.debug("Sonos volume restore skipped: %s", error)
 
     @sonos_intent_handler("sonos.what.is.playing.intent")
@@ -662,46 +1030,32 @@ class SonosControllerSkill(OVOSSkill):
         if self._hydrate_message_entities(message, intent_name):
             return
         try:
-            if message.data.get("speaker"):
-                devices = (self.controller.resolve_speaker(message.data["speaker"]),)
-            else:
-                devices = self.controller.coordinators("PLAYING")
-            playing = []
-            for device in devices:
-                if self.controller.transport_state(device) != "PLAYING":
-                    continue
-                info = device.get_current_track_info()
-                if info.get("title") or info.get("artist"):
-                    playing.append((device, info))
+            playing = self.controller.now_playing(
+                message.data.get("speaker"), deadline=_command_deadline()
+            )
             if not playing:
                 self.speak_dialog("sonos.nothing.playing")
                 return
-            for device, info in playing:
+            for track in playing:
                 if artist_only and message.data.get("speaker"):
-                    self.speak(info.get("artist") or info.get("title"))
+                    self.speak(track.artist or track.title)
                 elif artist_only:
                     self.speak_dialog(
                         "sonos.playing.artist.on",
-                        data={
-                            "artist": info.get("artist", ""),
-                            "speaker": device.player_name,
-                        },
+                        data={"artist": track.artist or "", "speaker": track.speaker},
                     )
                 elif message.data.get("speaker"):
                     self.speak_dialog(
                         "sonos.playing",
-                        data={
-                            "title": info.get("title", ""),
-                            "artist": info.get("artist", ""),
-                        },
+                        data={"title": track.title or "", "artist": track.artist or ""},
                     )
                 else:
                     self.speak_dialog(
                         "sonos.playing.on",
                         data={
-                            "title": info.get("title", ""),
-                            "artist": info.get("artist", ""),
-                            "speaker": device.player_name,
+                            "title": track.title or "",
+                            "artist": track.artist or "",
+                            "speaker": track.speaker,
                         },
                     )
         except (SpeakerNotFoundError, AmbiguousSpeakerError):
@@ -710,7 +1064,7 @@ class SonosControllerSkill(OVOSSkill):
             )
         except NoSpeakersError:
             self.speak_dialog("error.discovery")
-        except (OSError, SoCoException) as error:
+        except (OSError, soco_exceptions.SoCoException) as error:
             LOG.warning("Unable to read Sonos track information: %s", error)
             self.speak_dialog("error.sonos")
 
@@ -720,22 +1074,22 @@ class SonosControllerSkill(OVOSSkill):
             return
         speaker_name = str(message.data.get("speaker") or "")
         try:
-            device = self.controller.resolve_speaker(speaker_name, coordinator=False)
-            info = device.get_speaker_info()
-            model_name = str(info.get("model_name", "Sonos")).replace(":", " ")
+            info = self.controller.speaker_info(
+                speaker_name, deadline=_command_deadline()
+            )
             data = {
-                "model_name": model_name,
-                "model_number": info.get("model_number", ""),
-                "display_version": info.get("display_version", ""),
+                "model_name": info.model_name.replace(":", " "),
+                "model_number": info.model_number,
+                "display_version": info.display_version,
             }
             if message.data.get("detailed"):
                 data.update(
                     {
-                        "uid": info.get("uid", ""),
-                        "serial_number": info.get("serial_number", ""),
-                        "software_version": info.get("software_version", ""),
-                        "hardware_version": info.get("hardware_version", ""),
-                        "mac_address": info.get("mac_address", ""),
+                        "uid": info.uid,
+                        "serial_number": info.serial_number,
+                        "software_version": info.software_version,
+                        "hardware_version": info.hardware_version,
+                        "mac_address": info.mac_address,
                     }
                 )
                 self.speak_dialog("sonos.speaker.info.detailed", data=data)
@@ -745,7 +1099,7 @@ class SonosControllerSkill(OVOSSkill):
             self.speak_dialog("error.speaker", data={"speaker": speaker_name})
         except NoSpeakersError:
             self.speak_dialog("error.discovery")
-        except (OSError, SoCoException) as error:
+        except (OSError, soco_exceptions.SoCoException) as error:
             LOG.warning("Unable to read Sonos speaker information: %s", error)
             self.speak_dialog("error.sonos")
 
@@ -754,6 +1108,8 @@ class SonosControllerSkill(OVOSSkill):
         """Begin or finish authentication for any compatible SMAPI service."""
         if self._hydrate_message_entities(message, "sonos.authenticate.intent"):
             return
+        from .controller import normalize_name
+
         requested_service = self._message_service(message)
         broker = AuthenticationBroker(
             str(self.settings.get("url_shortener", DEFAULT_URL_SHORTENER))
@@ -799,9 +1155,9 @@ class SonosControllerSkill(OVOSSkill):
                 provider.link_device_id,
                 provider.service_name,
             )
+            spelling = self.locales.spelling(self.lang)
             spoken_code = ". ".join(
-                self.nato_dict.get(character.upper(), character)
-                for character in short_code
+                spelling.get(character.upper(), character) for character in short_code
             )
             self.speak_dialog("sonos.link_code", data={"code": spoken_code}, wait=True)
         except AuthenticationNotSupportedError:
@@ -817,7 +1173,7 @@ class SonosControllerSkill(OVOSSkill):
         except requests.RequestException as error:
             LOG.warning("Sonos authentication broker failed: %s", error)
             self.speak_dialog("error.urlshortener")
-        except (OSError, SoCoException) as error:
+        except (OSError, soco_exceptions.SoCoException) as error:
             LOG.warning("Sonos authentication failed: %s", error)
             self.speak_dialog("error.auth", data={"service": requested_service})
 
@@ -0,0 +1,98 @@
+"""Rendered announcement audio cached by a hash of voice and text."""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Callable, Sequence
+from hashlib import sha256
+from pathlib import Path
+from threading import Lock
+
+from .library import AUDIO_SUFFIXES
+
+# Rendered phrases are small. A few hundred cover the repeated announcements
+# of a household without the directory growing without bound.
+_MAX_ENTRIES = 256
+
+Synthesizer = Callable[[str, str, Path], Path]
+
+
+def clip_path(path: str, roots: Sequence[Path]) -> Path:
+    """Return an audio file below one of ``roots`` for a requested clip.
+
+    Relative paths are looked up in the first root. Other suffixes and paths
+    outside the roots, including links that lead out of them, raise
+    :class:`ValueError`, so bus clients cannot publish arbitrary files
+    through the media server.
+    """
+    resolved_roots = [root.resolve() for root in roots]
+    if not resolved_roots:
+        raise ValueError("local clips are not available")
+    candidate = (resolved_roots[0] / Path(path).expanduser()).resolve()
+    if candidate.suffix.lower() not in AUDIO_SUFFIXES or not any(
+        candidate.is_relative_to(root) for root in resolved_roots
+    ):
+        raise ValueError(f"not an announcement clip: {path}")
+    if not candidate.is_file():
+        raise ValueError(f"missing announcement clip: {path}")
+    return candidate
+
+
+class AnnouncementCache:
+    """Render each distinct phrase once and reuse the file afterwards.
+
+    ``synthesize`` receives the text, the language, and a target path without
+    a suffix. It returns the file it actually wrote, because TTS engines
+    choose their own audio format.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        synthesize: Synthesizer,
+        max_entries: int = _MAX_ENTRIES,
+    ) -> None:
+        self.directory = Path(directory)
+        self.max_entries = max_entries
+        self._synthesize = synthesize
+        self._guard = Lock()
+        self._locks: dict[str, Lock] = {}
+
+    @staticmethod
+    def key(text: str, lang: str, voice: str = "") -> str:
+        """Return the cache key of a phrase rendered by one voice."""
+        normalized = " ".join(text.split())
+        payload = "\0".join((lang.lower(), voice, normalized))
+        return sha256(payload.encode("utf-8")).hexdigest()
+
+    def path_for(self, text: str, lang: str, voice: str = "") -> Path:
+        """Return rendered audio for ``text``, synthesizing it on a miss."""
+        key = self.key(text, lang, voice)
+        with self._guard:
+            lock = self._locks.setdefault(key, Lock())
+        # Concurrent requests for one phrase wait for a single rendering.
+        with lock:
+            cached = self._lookup(key)
+            if cached is not None:
+                cached.touch()
+                return cached
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = self._synthesize(text, lang, self.directory / key)
+            self._prune()
+            return path
+
+    def _lookup(self, key: str) -> Path | None:
+        return next(
+            (path for path in self.directory.glob(f"{key}.*") if path.is_file()),
+            None,
+        )
+
+    def _prune(self) -> None:
+        """Remove the least recently used files beyond ``max_entries``."""
+        files = sorted(
+            (path for path in self.directory.iterdir() if path.is_file()),
+            key=lambda path: path.stat().st_mtime,
+            reverse=True,
+        )
+        for path in files[self.max_entries :]:
+            path.unlink(missing_ok=True)
@@ -3,13 +3,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any
+from typing import TYPE_CHECKING, Any
 from urllib.parse import quote, urlparse
 
-import requests
-
 from .constants import DEFAULT_URL_SHORTENER, HTTP_REQUEST_TIMEOUT
 
+if TYPE_CHECKING:
+    import requests
+
 
 @dataclass(frozen=True)
 class AuthenticationLink:
@@ -30,7 +31,11 @@ class AuthenticationBroker:
         timeout: int = HTTP_REQUEST_TIMEOUT,
     ) -> None:
         self.base_url = base_url.rstrip("/")
-        self.session = session or requests.Session()
+        if session is None:
+            import requests
+
+            session = requests.Session()
+        self.session = session
         self.timeout = timeout
 
     def create(
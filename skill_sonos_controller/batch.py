@@ -0,0 +1,207 @@
+"""Plan and run several household operations sent as one bus request."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from soco.exceptions import SoCoException
+
+from .deadline import Deadline
+from .exceptions import SonosControllerError
+
+if TYPE_CHECKING:
+    from .controller import SonosController
+
+_TRANSPORT = frozenset({"next", "pause", "play", "previous", "stop"})
+# ``None`` in a footprint means every room, for operations without a target.
+Footprint = frozenset[str] | None
+
+
+@dataclass
+class BatchOperation:
+    """One requested operation with the rooms it touches."""
+
+    request: Mapping[str, Any]
+    run: Callable[[Deadline], Any] | None = None
+    rooms: Footprint = None
+    error: str | None = None
+    wave: int = 0
+    result: dict[str, Any] = field(default_factory=dict)
+
+
+def plan(
+    controller: SonosController,
+    operations: Iterable[Mapping[str, Any]],
+    deadline: Deadline,
+) -> list[BatchOperation]:
+    """Resolve every operation against the current topology.
+
+    Each operation is assigned to the earliest wave after every earlier
+    operation that touches one of its rooms. Operations in the same wave are
+    independent and run concurrently, while requests for one room keep their
+    order. An operation that cannot be resolved gets an error instead.
+    """
+    planned: list[BatchOperation] = []
+    for request in operations:
+        operation = BatchOperation(request)
+        try:
+            operation.run, operation.rooms = _bind(controller, request, deadline)
+        except (OSError, SoCoException, SonosControllerError, ValueError) as error:
+            operation.error = _describe(error)
+        else:
+            operation.wave = 1 + max(
+                (
+                    earlier.wave
+                    for earlier in planned
+                    if earlier.run is not None
+                    and _overlaps(earlier.rooms, operation.rooms)
+                ),
+                default=-1,
+            )
+        planned.append(operation)
+    return planned
+
+
+def run(
+    controller: SonosController,
+    operations: Iterable[Mapping[str, Any]],
+    deadline: Deadline,
+    executor: Executor,
+) -> list[dict[str, Any]]:
+    """Run a planned batch wave by wave and return one result per request."""
+    planned = plan(controller, operations, deadline)
+    waves = sorted({op.wave for op in planned if op.run is not None})
+    for wave in waves:
+        current = [op for op in planned if op.run is not None and op.wave == wave]
+        futures = [(op, executor.submit(op.run, deadline)) for op in current]
+        for op, future in futures:
+            try:
+                op.result = {"ok": True, "result": future.result()}
+            except (OSError, SoCoException, SonosControllerError, ValueError) as error:
+                op.error = _describe(error)
+    return [
+        {
+            "op": op.request.get("op"),
+            **(op.result if op.error is None else {"ok": False, "error": op.error}),
+        }
+        for op in planned
+    ]
+
+
+def _bind(
+    controller: SonosController, request: Mapping[str, Any], deadline: Deadline
+) -> tuple[Callable[[Deadline], Any], Footprint]:
+    """Return the call for one request and the room UIDs it touches."""
+    op = str(request.get("op") or "").lower()
+    speaker = request.get("speaker")
+    if speaker is not None and not isinstance(speaker, str):
+        raise ValueError("speaker must be a room name")
+    rooms = _footprint(controller, speaker, group=op in _TRANSPORT, deadline=deadline)
+    if op in _TRANSPORT:
+        # Like the resume intent, a household-wide play only resumes paused
+        # rooms and leaves stopped ones alone.
+        required = "PLAYING" if op != "play" else None
+        if op == "play" and not speaker:
+            required = "PAUSED_PLAYBACK"
+        return (
+            lambda budget: controller.run_command(
+                op, speaker, required_state=required, deadline=budget
+            ),
+            rooms,
+        )
+    if op == "volume" and "level" in request:
+        level = _number(request, "level")
+        return (
+            lambda budget: controller.set_volume(level, speaker, deadline=budget),
+            rooms,
+        )
+    if op == "volume" and "delta" in request:
+        delta = _number(request, "delta")
+        return (
+            lambda budget: controller.change_volume(delta, speaker, deadline=budget),
+            rooms,
+        )
+    if op == "mute":
+        muted = _flag(request, "muted")
+        return (
+            lambda budget: controller.set_mute(muted, speaker, deadline=budget),
+            rooms,
+        )
+    if op in {"shuffle", "repeat"}:
+        enabled = _flag(request, "enabled")
+        return (
+            lambda budget: controller.set_playback_option(
+                op, enabled, speaker, deadline=budget
+            ),
+            _footprint(controller, speaker, group=True, deadline=deadline),
+        )
+    if op == "group":
+        coordinator = str(request.get("coordinator") or speaker or "")
+        if not coordinator:
+            raise ValueError("A group operation needs a coordinator")
+        members = request.get("members", [])
+        if not isinstance(members, list) or not all(
+            isinstance(member, str) for member in members
+        ):
+            raise ValueError("members must be a list of room names")
+        footprint = frozenset().union(
+            *(
+                _footprint(controller, name, group=True, deadline=deadline) or ()
+                for name in (coordinator, *members)
+            )
+        )
+        return (
+            lambda budget: controller.group_speakers(
+                coordinator, members, deadline=budget
+            ),
+            footprint,
+        )
+    if op == "ungroup":
+        if not speaker:
+            raise ValueError("An ungroup operation needs a speaker")
+        return (
+            lambda budget: controller.ungroup_speaker(str(speaker), deadline=budget),
+            _footprint(controller, speaker, group=True, deadline=deadline),
+        )
+    raise ValueError(f"Unsupported Sonos batch operation: {op or request!r}")
+
+
+def _number(request: Mapping[str, Any], name: str) -> int:
+    """Return an integer option, accepting numbers and numeric strings only."""
+    value = request[name]
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    if isinstance(value, bool) or not isinstance(value, int | str):
+        raise ValueError(f"{name} must be a whole number")
+    return int(value)
+
+
+def _flag(request: Mapping[str, Any], name: str) -> bool:
+    """Return a boolean option, which defaults to ``True`` when omitted."""
+    value = request.get(name, True)
+    if not isinstance(value, bool):
+        raise ValueError(f"{name} must be true or false")
+    return value
+
+
+def _footprint(
+    controller: SonosController,
+    speaker: str | None,
+    group: bool,
+    deadline: Deadline,
+) -> Footprint:
+    """Return the UIDs an operation on ``speaker`` can change."""
+    if not speaker:
+        return None
+    return controller.room_uids(speaker, group=group, deadline=deadline)
+
+
+def _overlaps(first: Footprint, second: Footprint) -> bool:
+    return first is None or second is None or bool(first & second)
+
+
+def _describe(error: Exception) -> str:
+    return str(error) or type(error).__name__
@@ -0,0 +1,65 @@
+"""Merge bursts of relative volume changes into one request per player."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any
+
+
+@dataclass
+class _Batch:
+    delta: int = 0
+    future: Future[Any] = field(default_factory=Future)
+
+
+@dataclass
+class _Queue:
+    pending: _Batch | None = None
+    busy: bool = False
+
+
+class DeltaCoalescer:
+    """Send one relative change per key and fold later ones into the next.
+
+    The first change for an idle key is sent at once, so a single command
+    pays no extra latency. Changes that arrive while that request is in
+    flight are summed into one follow-up request. Every merged caller gets
+    the combined result.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._queues: dict[str, _Queue] = {}
+
+    def submit(self, key: str, delta: int, send: Callable[[int], Any]) -> Any:
+        """Apply ``delta`` through ``send`` and return the combined result."""
+        with self._lock:
+            queue = self._queues.setdefault(key, _Queue())
+            if queue.busy:
+                if queue.pending is None:
+                    queue.pending = _Batch()
+                queue.pending.delta += int(delta)
+                batch = queue.pending
+                leader = False
+            else:
+                queue.busy = True
+                batch = _Batch(int(delta))
+                leader = True
+        if not leader:
+            return batch.future.result()
+
+        current: _Batch | None = batch
+        while current is not None:
+            try:
+                current.future.set_result(send(current.delta))
+            except Exception as error:
+                current.future.set_exception(error)
+            with self._lock:
+                current, queue.pending = queue.pending, None
+                if current is None:
+                    queue.busy = False
+                    del self._queues[key]
+        return batch.future.result()
@@ -1,6 +1,9 @@
 """Constants shared by the Sonos controller skill."""
 
+DEFAULT_COMMAND_TIMEOUT = 8
 DEFAULT_DISCOVERY_TIMEOUT = 5
+DEFAULT_FADE_DURATION = 5
+DEFAULT_RAMP_DURATION = 3
 DEFAULT_SOURCE = "Music Library"
 DEFAULT_VOLUME_STEP = 10
 LARGE_VOLUME_STEP = 30
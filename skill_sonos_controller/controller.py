@@ -2,36 +2,57 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable, Iterable
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextlib import suppress
 from dataclasses import dataclass
 from difflib import SequenceMatcher
+from functools import partial
+from threading import Event, Lock
+from time import monotonic, sleep
 from typing import Any, ClassVar
 from unicodedata import normalize
 from urllib.parse import urljoin, urlsplit
+from xml.etree import ElementTree
 
 import requests
-from soco import discover
+from soco import config as soco_config
 from soco.exceptions import MusicServiceAuthException, SoCoException, SoCoUPnPException
 from soco.music_library import MusicLibrary
 from soco.music_services import Account, MusicService
 from soco.xml import XML
 
+from . import batch, discovery
+from .coalesce import DeltaCoalescer
 from .constants import (
     CATEGORY_ALIASES,
     DEFAULT_DISCOVERY_TIMEOUT,
+    DEFAULT_FADE_DURATION,
+    DEFAULT_RAMP_DURATION,
     MUSIC_LIBRARY,
     MUSIC_LIBRARY_CATEGORIES,
 )
+from .deadline import Deadline
 from .exceptions import (
     AmbiguousSpeakerError,
     AuthenticationNotSupportedError,
     AuthenticationRequiredError,
     CategoryNotSupportedError,
+    DeadlineExceededError,
+    FeatureNotSupportedError,
     NoResultsError,
     NoSpeakersError,
     ServiceNotFoundError,
     SpeakerNotFoundError,
+    SpeakerUnavailableError,
 )
+from .hardware import SpeakerInfo, SpeakerInfoStore, description_services
+from .health import HealthTracker
+from .library import LocalLibrary, LocalTrack
+from .media_server import MediaServer
+from .ramp import RampScheduler
+from .scenes import PlaybackState, RoomState, Scene
+from .state import StateCache, coordinator_uid, values_from_event
 
 _PLAYLIST_CONTENT_TYPES = frozenset(
     {
@@ -44,10 +65,46 @@ _PLAYLIST_CONTENT_TYPES = frozenset(
 )
 _MAX_PLAYLIST_BYTES = 64 * 1024
 _MEDIA_URI_TIMEOUT = 10
+# A device description is a few kilobytes served by the player itself.
+_DESCRIPTION_TIMEOUT = 5
+# SoCo's SMAPI socket timeout. Providers are shared, so every search sets its
+# own timeout from this instead of narrowing the previous one.
+_SMAPI_TIMEOUT = 9
 # Current Sonos firmware reports 800 for live SMAPI streams and 804 for some
 # on-demand SMAPI items when they cannot be inserted into a queue. Both remain
 # directly playable through the provider's getMediaURI endpoint.
 _DIRECT_PLAY_FALLBACK_CODES = frozenset({"800", "804"})
+# Calls abandoned at a deadline keep a worker until SoCo's socket timeout, so
+# the pool is sized for a large household plus a few stalled players.
+_MAX_WORKERS = 16
+_MAX_BATCH_WORKERS = 4
+_QUEUE_URI_PREFIX = "x-rincon-queue:"
+# Local files are only guessed from their names, so a fuzzy title match must
+# be close before it is played instead of reporting no results.
+_LOCAL_MATCH_RATIO = 0.75
+_MAX_LOCAL_QUEUE = 100
+# Announcements are short clips; restoring playback must not wait forever on
+# a player that keeps a stream open.
+_ANNOUNCEMENT_TIMEOUT = 30.0
+_CLIP_POLL_INTERVAL = 0.25
+_CLIP_START_GRACE = 2.0
+# Upper bound for confirming a regrouping through ZoneGroupTopology events.
+_TOPOLOGY_SETTLE_TIMEOUT = 2.0
+# Players answer a search within its one-second MX, so a second without a new
+# responder means the household has been found.
+_DISCOVERY_QUIET_PERIOD = 1.0
+
+
+def _read_zones(player: Any) -> tuple[tuple[Any, ...], tuple[Any, ...]]:
+    """Return a player's visible rooms and every player of its household."""
+    return tuple(player.visible_zones), tuple(player.all_zones)
+
+
+def _absolute_art(device: Any, uri: str | None) -> str | None:
+    """Return album art as a URL, resolving player-relative paths."""
+    if uri and uri.startswith("/"):
+        return f"http://{device.ip_address}:1400{uri}"
+    return uri or None
 
 
 def normalize_name(value: str | None) -> str:
@@ -77,6 +134,22 @@ class PlaybackResult:
     artist: str | None = None
 
 
+@dataclass(frozen=True)
+class NowPlaying:
+    """The current track of one playing group.
+
+    ``position`` is only known when the track was read from the player;
+    events do not report elapsed time.
+    """
+
+    speaker: str
+    title: str | None = None
+    artist: str | None = None
+    album: str | None = None
+    album_art: str | None = None
+    position: str | None = None
+
+
 class ServiceRegistry:
     """Resolve service names from descriptors advertised by Sonos."""
 
@@ -201,73 +274,531 @@ class SonosController:
     def __init__(
         self,
         discovery_timeout: int = DEFAULT_DISCOVERY_TIMEOUT,
-        discoverer: Callable[..., Iterable[Any] | None] = discover,
+        discoverer: Callable[..., Iterable[Any] | None] | None = None,
+        searcher: Callable[..., Iterable[discovery.Responder]] = discovery.search,
+        player_factory: Callable[[str], Any] | None = None,
         music_service_cls: type[MusicService] = MusicService,
         music_library_cls: type[MusicLibrary] = MusicLibrary,
         account_cls: type[Account] = Account,
+        health: HealthTracker | None = None,
+        events: bool = False,
+        group_volume: bool = False,
+        media_server: MediaServer | None = None,
+        hardware: SpeakerInfoStore | None = None,
+        discovery_history: discovery.DiscoveryHistory | None = None,
     ) -> None:
         self.discovery_timeout = discovery_timeout
         self._discoverer = discoverer
+        self._searcher = searcher
+        self._player_factory = player_factory
+        # Rooms and timings of earlier discoveries decide when to stop.
+        self.discovery_history = discovery_history or discovery.DiscoveryHistory()
         self._music_service_cls = music_service_cls
         self._music_library_cls = music_library_cls
         self.registry = ServiceRegistry(music_service_cls, account_cls)
         self.speakers: tuple[Any, ...] = ()
+        self.health = health or HealthTracker()
+        self.state = StateCache()
+        self.events_enabled = events
+        # Address complete groups through their coordinator's group volume.
+        self.group_volume = group_volume
+        # Files below these folders are played when the Sonos Music Library
+        # has not indexed them.
+        self.local_library: LocalLibrary | None = None
+        self.media_server = media_server or MediaServer()
+        # Model, serial, and version details only change with new firmware.
+        self.hardware = hardware or SpeakerInfoStore()
+        self._subscriptions: dict[str, tuple[Any, ...]] = {}
         self._volume_snapshot: dict[str, int] = {}
+        self._ducked_groups: set[str] = set()
+        # Record-begin/record-end pairs can overlap on the bus. A per-room lock
+        # serializes each duck and restore, and the generation lets a restore
+        # cancel a duck that has not reached the room yet. Rooms still reading
+        # their volume are in flight, so a restore waits for their snapshot.
+        self._duck_guard = Lock()
+        self._duck_locks: dict[str, Lock] = {}
+        self._duck_generation = 0
+        self._ducking: set[str] = set()
+        # Workers are only started by the first bounded or multi-room call.
+        self._executor = ThreadPoolExecutor(
+            max_workers=_MAX_WORKERS, thread_name_prefix="sonos"
+        )
+        self.ramps = RampScheduler(self._executor.submit)
+        # Batch operations wait on the worker pool themselves, so they run on
+        # their own threads to never starve it.
+        self._batch_executor = ThreadPoolExecutor(
+            max_workers=_MAX_BATCH_WORKERS, thread_name_prefix="sonos-batch"
+        )
+        self._volume_deltas = DeltaCoalescer()
+        # SMAPI providers by service name. Building one reads its descriptor
+        # and token store, and its search categories are fetched once.
+        self._providers: dict[str, Any] = {}
+        self._provider_lock = Lock()
+
+    def _call(
+        self,
+        deadline: Deadline,
+        function: Callable[..., Any],
+        *args: Any,
+        **kwargs: Any,
+    ) -> Any:
+        """Run one network call, abandoning it when the command budget ends.
+
+        Functions passed here must not wait on this executor themselves.
+        """
+        if not deadline.bounded:
+            return function(*args, **kwargs)
+        operation = getattr(function, "__name__", "Sonos call")
+        deadline.check(operation)
+        future = self._executor.submit(function, *args, **kwargs)
+        done, _pending = wait((future,), timeout=deadline.remaining())
+        if not done:
+            future.cancel()
+            raise DeadlineExceededError(operation)
+        return future.result()
+
+    def _fan_out(
+        self,
+        targets: Iterable[Any],
+        function: Callable[[Any], Any],
+        deadline: Deadline,
+    ) -> list[tuple[Any, Any]]:
+        """Apply one call per device concurrently and keep finished results.
+
+        Results keep the target order. Players with an open circuit breaker
+        are skipped at once, and calls still running when the budget ends are
+        abandoned, so the caller can report a partial result. The first
+        failure is re-raised, as the former sequential loops did.
+        """
+        requested = tuple(targets)
+        targets = tuple(device for device in requested if self._available(device))
+        if requested and not targets:
+            raise SpeakerUnavailableError(
+                ", ".join(device.player_name for device in requested)
+            )
+        if not targets:
+            return []
+        tracked = self._tracked(function)
+        if len(targets) == 1:
+            try:
+                return [(targets[0], self._call(deadline, tracked, targets[0]))]
+            except DeadlineExceededError:
+                self.health.record_failure(self._uid(targets[0]))
+                raise
+        deadline.check()
+        futures = [self._executor.submit(tracked, device) for device in targets]
+        done, pending = wait(futures, timeout=deadline.remaining())
+        for device, future in zip(targets, futures, strict=True):
+            if future in pending:
+                future.cancel()
+                self.health.record_failure(self._uid(device))
+        if not done:
+            raise DeadlineExceededError(getattr(function, "__name__", "Sonos call"))
+        return [
+            (device, future.result())
+            for device, future in zip(targets, futures, strict=True)
+            if future in done
+        ]
+
+    def _tracked(self, function: Callable[[Any], Any]) -> Callable[[Any], Any]:
+        """Wrap a per-device call with latency and failure accounting."""
+
+        def run(device: Any) -> Any:
+            uid = self._uid(device)
+            started = monotonic()
+            try:
+                result = function(device)
+            except OSError:
+                self.health.record_failure(uid)
+                raise
+            except Exception:
+                # A UPnP or validation error still proves the player answered.
+                self.health.record_success(uid, monotonic() - started)
+                raise
+            self.health.record_success(uid, monotonic() - started)
+            return result
+
+        run.__name__ = getattr(function, "__name__", "Sonos call")
+        return run
+
+    def _available(self, device: Any) -> bool:
+        """Check a player's breaker and start a recovery probe when due."""
+        uid = self._uid(device)
+        if self.health.allow(uid):
+            return True
+        if self.health.begin_probe(uid):
+            self._executor.submit(self._probe, device)
+        return False
+
+    def _probe(self, device: Any) -> None:
+        """Close an open breaker once the player answers a cheap query."""
+        # The wrapper records the outcome; a failure keeps the breaker open.
+        with suppress(OSError, SoCoException):
+            self._tracked(self.transport_state)(device)
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return JSON-compatible controller health for support tooling."""
+        names = {self._uid(device): device.player_name for device in self.speakers}
+        return {
+            "speakers": {
+                uid: {"name": names.get(uid, uid), **health}
+                for uid, health in self.health.snapshot().items()
+            },
+            "discovery": {
+                "timeout": self.discovery_timeout,
+                **self.discovery_history.snapshot(),
+            },
+        }
+
+    def refresh(
+        self,
+        deadline: Deadline | None = None,
+        on_found: Callable[[Any], None] | None = None,
+    ) -> tuple[Any, ...]:
+        """Discover speakers and refresh household music services.
 
-    def refresh(self) -> tuple[Any, ...]:
-        """Discover speakers and refresh household music services."""
-        discovered = self._discoverer(timeout=self.discovery_timeout) or set()
+        ``on_found`` is called with each room as soon as it is found, and new
+        rooms can be addressed from then on. Rooms that did not answer are
+        dropped once discovery ends.
+        """
+        deadline = deadline or Deadline(None)
+        if self._discoverer is None:
+            discovered = self._search_household(deadline, on_found)
+        else:
+            timeout = deadline.timeout(self.discovery_timeout, "discovery")
+            discovered = tuple(self._discoverer(timeout=timeout) or ())
+            for device in discovered:
+                if on_found is not None:
+                    on_found(device)
         self.speakers = tuple(
             sorted(discovered, key=lambda item: item.player_name.casefold())
         )
         if self.speakers:
-            self.registry.refresh(self.speakers[0])
+            self._call(deadline, self.registry.refresh, self.speakers[0])
+        with self._provider_lock:
+            self._providers.clear()
+        if self.events_enabled:
+            self.subscribe_events(deadline)
         return self.speakers
 
-    def _require_speakers(self) -> None:
+    def _search_household(
+        self, deadline: Deadline, on_found: Callable[[Any], None] | None
+    ) -> tuple[Any, ...]:
+        """Return the visible rooms of every player answering an SSDP search.
+
+        The first responder's topology usually lists the whole household.
+        Later responders are only asked for theirs when that topology missed
+        them, which happens while a player is still joining.
+
+        The search stops as soon as every room of the previous discovery is
+        found. While one is missing, it waits as long as the household took
+        before, instead of ending after a quiet period. Without history, a
+        quiet period ends it.
+        """
+        factory = self._player_factory or soco_config.SOCO_CLASS
+        expected = self.discovery_history.expected()
+        if expected:
+            limit = self.discovery_history.timeout(self.discovery_timeout)
+            quiet_period = None
+        else:
+            limit, quiet_period = self.discovery_timeout, _DISCOVERY_QUIET_PERIOD
+        timeout = deadline.timeout(limit, "discovery")
+        started_at = monotonic()
+        complete_after: float | None = None
+        ended = "quiet"
+        found: dict[str, Any] = {}
+        hidden: set[str] = set()
+        for responder in self._searcher(timeout=timeout, quiet_period=quiet_period):
+            if responder.uid in found or responder.uid in hidden:
+                continue
+            player = factory(responder.ip_address)
+            try:
+                visible, every = self._call(deadline, _read_zones, player)
+            except DeadlineExceededError:
+                break
+            except (OSError, SoCoException):
+                continue
+            hidden.update(self._uid(zone) for zone in every)
+            new = [zone for zone in visible if self._uid(zone) not in found]
+            found.update((self._uid(zone), zone) for zone in visible)
+            hidden.difference_update(found)
+            if not new:
+                continue
+            merged = {self._uid(device): device for device in self.speakers}
+            merged.update(found)
+            self.speakers = tuple(
+                sorted(merged.values(), key=lambda item: item.player_name.casefold())
+            )
+            complete_after = round(monotonic() - started_at, 3)
+            for zone in sorted(new, key=lambda item: item.player_name.casefold()):
+                if on_found is not None:
+                    on_found(zone)
+            if expected and expected <= found.keys():
+                ended = "complete"
+                break
+        seconds = round(monotonic() - started_at, 3)
+        if ended != "complete" and seconds >= timeout:
+            ended = "timeout"
+        self.discovery_history.record(
+            discovery.DiscoveryRun(
+                seconds,
+                complete_after,
+                len(found),
+                tuple(sorted(expected - found.keys())),
+                ended,
+            ),
+            found,
+        )
+        return tuple(found.values())
+
+    def subscribe_events(self, deadline: Deadline | None = None) -> int:
+        """Keep volume, mute, and transport state current from UPnP events.
+
+        Players that cannot be subscribed keep using live queries. Returns the
+        number of newly subscribed players.
+        """
+        deadline = deadline or Deadline(None)
+        pending = tuple(
+            device
+            for device in self.speakers
+            if self._uid(device) not in self._subscriptions
+            and hasattr(device, "renderingControl")
+        )
+
+        def subscribe(device: Any) -> tuple[Any, ...]:
+            uid = self._uid(device)
+            subscriptions = []
+            try:
+                for service in (device.renderingControl, device.avTransport):
+                    subscription = service.subscribe(auto_renew=True)
+                    subscription.callback = partial(self._handle_event, uid)
+                    subscription.auto_renew_fail = partial(self._drop_events, uid)
+                    subscriptions.append(subscription)
+            except (OSError, SoCoException):
+                for subscription in subscriptions:
+                    with suppress(OSError, SoCoException):
+                        subscription.unsubscribe()
+                return ()
+            return tuple(subscriptions)
+
+        subscribed = 0
+        for device, subscriptions in self._fan_out(pending, subscribe, deadline):
+            if subscriptions:
+                self._subscriptions[self._uid(device)] = subscriptions
+                subscribed += 1
+        return subscribed
+
+    def _handle_event(self, uid: str, event: Any) -> None:
+        self.state.update(uid, **values_from_event(getattr(event, "variables", {})))
+
+    def _drop_events(self, uid: str, _error: Exception | None = None) -> None:
+        """Stop trusting cached state once a subscription cannot be renewed."""
+        for subscription in self._subscriptions.pop(uid, ()):
+            with suppress(OSError, SoCoException):
+                subscription.unsubscribe()
+        self.state.forget(uid)
+
+    def _cached(self, device: Any, key: str) -> Any:
+        """Return event-fed state, or ``None`` when a live query is needed."""
+        uid = self._uid(device)
+        if uid not in self._subscriptions:
+            return None
+        return self.state.get(uid, key)
+
+    def cached_rooms(self) -> list[dict[str, Any]]:
+        """Return every discovered room with its event-fed state.
+
+        No player is contacted. Rooms without an event subscription only
+        report their identity, because write-through values alone may be
+        stale.
+        """
+        return [self._cached_room(device) for device in self.speakers]
+
+    def cached_room(self, uid: str) -> dict[str, Any] | None:
+        """Return one discovered room's event-fed state by UID."""
+        for device in self.speakers:
+            if self._uid(device) == uid:
+                return self._cached_room(device)
+        return None
+
+    def _cached_room(self, device: Any) -> dict[str, Any]:
+        uid = self._uid(device)
+        room: dict[str, Any] = {"uid": uid, "name": device.player_name}
+        if uid not in self._subscriptions:
+            return {**room, "subscribed": False}
+        values = self.state.room(uid)
+        return {
+            **room,
+            "subscribed": True,
+            "coordinator": coordinator_uid(uid, values),
+            **values,
+        }
+
+    def _current_transport_state(self, device: Any) -> str:
+        cached = self._cached(device, "transport_state")
+        return cached if cached is not None else self.transport_state(device)
+
+    def close(self) -> None:
+        """Cancel ramps and subscriptions, then stop the media server and workers."""
+        self.ramps.cancel_all()
+        for uid in tuple(self._subscriptions):
+            self._drop_events(uid)
+        self.media_server.stop()
+        self._batch_executor.shutdown(wait=False, cancel_futures=True)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _require_speakers(self, deadline: Deadline | None = None) -> None:
         if not self.speakers:
-            self.refresh()
+            self.refresh(deadline)
         if not self.speakers:
             raise NoSpeakersError("No Sonos speakers were discovered")
 
-    def resolve_speaker(self, spoken_name: str | None, coordinator: bool = True) -> Any:
-        """Resolve a room exactly, or by an unambiguous partial name."""
-        self._require_speakers()
+    def resolve_speaker(
+        self,
+        spoken_name: str | None,
+        coordinator: bool = True,
+        deadline: Deadline | None = None,
+    ) -> Any:
+        """Resolve a room exactly, or by an unambiguous partial name.
+
+        An unknown name triggers one targeted topology read, which picks up
+        new or renamed rooms without a multicast discovery.
+        """
+        deadline = deadline or Deadline(None)
+        self._require_speakers(deadline)
         if not spoken_name:
             raise SpeakerNotFoundError("No speaker was provided")
         key = normalize_name(spoken_name)
+        matches = self._match_speakers(key)
+        if not matches and self._refresh_topology(deadline):
+            matches = self._match_speakers(key)
+        if not matches:
+            raise SpeakerNotFoundError(spoken_name)
+        if len(matches) > 1:
+            raise AmbiguousSpeakerError(spoken_name)
+        device = matches[0]
+        if coordinator and len(device.group.members) > 1:
+            return device.group.coordinator
+        return device
+
+    def _match_speakers(self, key: str) -> list[Any]:
         exact = [
             device
             for device in self.speakers
             if normalize_name(device.player_name) == key
         ]
-        matches = exact or [
+        return exact or [
             device
             for device in self.speakers
             if key and key in normalize_name(device.player_name)
         ]
-        if not matches:
-            raise SpeakerNotFoundError(spoken_name)
-        if len(matches) > 1:
-            raise AmbiguousSpeakerError(spoken_name)
-        device = matches[0]
-        if coordinator and len(device.group.members) > 1:
-            return device.group.coordinator
-        return device
 
-    def coordinators(self, state: str | None = None) -> tuple[Any, ...]:
-        """Return each group coordinator once, optionally filtered by state."""
-        self._require_speakers()
-        coordinators: dict[str, Any] = {}
-        for speaker in self.speakers:
-            coordinator = (
-                speaker.group.coordinator if len(speaker.group.members) > 1 else speaker
+    def _refresh_topology(self, deadline: Deadline) -> bool:
+        """Merge rooms from one coordinator's ZoneGroupTopology in place.
+
+        Players stay the same SoCo instances, so renamed rooms pick up their
+        new name from the same read. Players missing from the answer are
+        kept, because they may only be restarting.
+        """
+        source = next(
+            (
+                device
+                for device in self.speakers
+                if hasattr(type(device), "visible_zones")
+                and self.health.allow(self._uid(device))
+            ),
+            None,
+        )
+        if source is None:
+            return False
+
+        def read_topology(device: Any) -> tuple[Any, ...]:
+            # Bypass SoCo's short polling cache so the read is current.
+            device.zone_group_state.clear_cache()
+            return tuple(device.visible_zones)
+
+        try:
+            [(_device, zones)] = self._fan_out((source,), read_topology, deadline)
+        except (OSError, SoCoException):
+            return False
+        merged = {self._uid(device): device for device in self.speakers}
+        merged.update((self._uid(device), device) for device in zones)
+        self.speakers = tuple(
+            sorted(merged.values(), key=lambda item: item.player_name.casefold())
+        )
+        return True
+
+    def coordinators(
+        self, state: str | None = None, deadline: Deadline | None = None
+    ) -> tuple[Any, ...]:
+        """Return each group coordinator once, optionally filtered by state.
+
+        State queries run concurrently. Coordinators that do not answer
+        before the deadline are left out of the result.
+        """
+        deadline = deadline or Deadline(None)
+        coordinators = {
+            self._uid(coordinator): coordinator
+            for coordinator in self._group_layout(deadline).values()
+        }
+        if not state:
+            return tuple(coordinators.values())
+        return tuple(
+            device
+            for device, current in self._fan_out(
+                coordinators.values(), self._current_transport_state, deadline
             )
-            uid = str(getattr(coordinator, "uid", coordinator.player_name))
-            if state and self.transport_state(coordinator) != state:
-                continue
-            coordinators[uid] = coordinator
-        return tuple(coordinators.values())
+            if current == state
+        )
+
+    def now_playing(
+        self, speaker: str | None = None, deadline: Deadline | None = None
+    ) -> tuple[NowPlaying, ...]:
+        """Return the track of a named room, or of every playing group.
+
+        Each coordinator needs at most one transport query and one track
+        query, both skipped for rooms whose events are cached, and all
+        coordinators are read concurrently. Groups that do not answer before
+        the deadline are left out.
+        """
+        deadline = deadline or Deadline(None)
+        if speaker:
+            targets: tuple[Any, ...] = (
+                self.resolve_speaker(speaker, deadline=deadline),
+            )
+        else:
+            targets = self.coordinators(deadline=deadline)
+
+        def read(device: Any) -> NowPlaying | None:
+            if self._current_transport_state(device) != "PLAYING":
+                return None
+            uid = self._uid(device)
+            if uid in self._subscriptions and (
+                self.state.get(uid, "title") or self.state.get(uid, "artist")
+            ):
+                values = self.state.room(uid)
+                return NowPlaying(
+                    device.player_name,
+                    values.get("title"),
+                    values.get("artist"),
+                    values.get("album"),
+                    _absolute_art(device, values.get("album_art")),
+                )
+            info = device.get_current_track_info()
+            return NowPlaying(
+                device.player_name,
+                info.get("title") or None,
+                info.get("artist") or None,
+                info.get("album") or None,
+                info.get("album_art") or None,
+                info.get("position") or None,
+            )
+
+        return tuple(
+            track
+            for _device, track in self._fan_out(targets, read, deadline)
+            if track is not None and (track.title or track.artist)
+        )
 
     @staticmethod
     def transport_state(device: Any) -> str:
@@ -282,211 +813,1114 @@ class SonosController:
         speaker: str | None = None,
         required_state: str | None = "PLAYING",
         mode: str | None = None,
+        deadline: Deadline | None = None,
     ) -> int:
-        """Run a validated transport command and return the target count."""
+        """Run a validated transport command and return the target count.
+
+        With a bounded deadline the count only includes rooms that completed
+        in time.
+        """
         allowed = {"next", "pause", "play", "previous", "stop"}
         if command != "mode" and command not in allowed:
             raise ValueError(f"Unsupported Sonos command: {command}")
 
+        deadline = deadline or Deadline(None)
         if speaker:
-            targets = (self.resolve_speaker(speaker),)
+            targets = (self.resolve_speaker(speaker, deadline=deadline),)
         else:
-            targets = self.coordinators(required_state)
+            targets = self.coordinators(required_state, deadline)
 
-        count = 0
-        for device in targets:
+        def apply(device: Any) -> bool:
             if (
                 required_state
-                and self.transport_state(device) != required_state.upper()
+                and self._current_transport_state(device) != required_state.upper()
             ):
-                continue
+                return False
             if command == "mode":
                 if not mode:
                     raise ValueError("A play mode is required")
                 device.play_mode = mode.upper()
             elif command in {"pause", "stop"} and not self._valid_music_source(device):
-                continue
+                return False
             else:
                 getattr(device, command)()
-            count += 1
-        return count
+            return True
+
+        return sum(
+            bool(applied)
+            for _device, applied in self._fan_out(targets, apply, deadline)
+        )
 
     def set_playback_option(
-        self, option: str, enabled: bool, speaker: str | None = None
+        self,
+        option: str,
+        enabled: bool,
+        speaker: str | None = None,
+        deadline: Deadline | None = None,
     ) -> int:
         """Toggle shuffle or repeat without changing the other option."""
         if option not in {"repeat", "shuffle"}:
             raise ValueError(f"Unsupported Sonos playback option: {option}")
+        deadline = deadline or Deadline(None)
         targets = (
-            (self.resolve_speaker(speaker),)
+            (self.resolve_speaker(speaker, deadline=deadline),)
             if speaker
-            else self.coordinators("PLAYING")
+            else self.coordinators("PLAYING", deadline)
         )
-        count = 0
-        for device in targets:
+
+        def apply(device: Any) -> bool:
             if self.transport_state(device) != "PLAYING":
-                continue
+                return False
             setattr(device, option, bool(enabled))
-            count += 1
-        return count
+            return True
+
+        return sum(
+            bool(applied)
+            for _device, applied in self._fan_out(targets, apply, deadline)
+        )
 
     @staticmethod
     def _valid_music_source(device: Any) -> bool:
         return not (device.is_playing_tv or device.is_playing_line_in)
 
     def change_volume(
-        self, delta: int, speaker: str | None = None, active_only: bool = True
+        self,
+        delta: int,
+        speaker: str | None = None,
+        active_only: bool = True,
+        deadline: Deadline | None = None,
     ) -> int:
-        """Change volume using SoCo's single-request relative adjustment."""
-        if speaker:
-            targets = (self.resolve_speaker(speaker, coordinator=False),)
-        elif active_only:
-            targets = self.active_speakers()
-        else:
-            self._require_speakers()
-            targets = self.speakers
-        for device in targets:
-            device.set_relative_volume(int(delta))
-        return len(targets)
+        """Change volume using SoCo's single-request relative adjustment.
+
+        Changes for a room that arrive while its previous adjustment is still
+        in flight are merged into one follow-up request.
+        """
+        deadline = deadline or Deadline(None)
+        targets, groups = self._volume_targets(
+            self._individual_targets(speaker, active_only, deadline)
+        )
+
+        def apply(device: Any) -> None:
+            self._cancel_ramps(device)
+            uid = self._uid(device)
+            if uid in groups:
+                self._volume_deltas.submit(
+                    f"group:{uid}", int(delta), device.group.set_relative_volume
+                )
+                self._forget_member_volumes(device)
+                return
+            volume = self._volume_deltas.submit(
+                uid, int(delta), device.set_relative_volume
+            )
+            if isinstance(volume, int):
+                self.state.update(uid, volume=volume)
+
+        return self._rooms_changed(self._fan_out(targets, apply, deadline), groups)
 
     def set_volume(
-        self, level: int, speaker: str | None = None, active_only: bool = True
+        self,
+        level: int,
+        speaker: str | None = None,
+        active_only: bool = True,
+        deadline: Deadline | None = None,
     ) -> int:
         """Set an exact, validated volume on a room or active household."""
         level = int(level)
         if not 0 <= level <= 100:
             raise ValueError("Sonos volume must be between 0 and 100")
-        targets = self._individual_targets(speaker, active_only)
-        for device in targets:
+        deadline = deadline or Deadline(None)
+        targets, groups = self._volume_targets(
+            self._individual_targets(speaker, active_only, deadline)
+        )
+
+        def apply(device: Any) -> None:
+            self._cancel_ramps(device)
+            if self._uid(device) in groups:
+                device.group.volume = level
+                self._forget_member_volumes(device)
+                return
             device.volume = level
-        return len(targets)
+            self.state.update(self._uid(device), volume=level)
+
+        return self._rooms_changed(self._fan_out(targets, apply, deadline), groups)
+
+    def ramp_volume(
+        self,
+        level: int,
+        speaker: str | None = None,
+        duration: float | None = None,
+        active_only: bool = True,
+        deadline: Deadline | None = None,
+    ) -> int:
+        """Move rooms gradually to an exact volume without blocking the caller.
+
+        Without a duration, players use the firmware RampToVolume action at
+        their own pace. With one, or where the action is unavailable, the
+        shared scheduler steps each room so that it arrives after ``duration``
+        seconds.
+        """
+        level = int(level)
+        if not 0 <= level <= 100:
+            raise ValueError("Sonos volume must be between 0 and 100")
+        deadline = deadline or Deadline(None)
+        targets = self._individual_targets(speaker, active_only, deadline)
+
+        def start(device: Any) -> None:
+            self._cancel_ramps(device)
+            if duration is None and hasattr(device, "ramp_to_volume"):
+                with suppress(SoCoUPnPException):
+                    device.ramp_to_volume(level)
+                    self.state.discard(self._uid(device), "volume")
+                    return
+            self._start_ramp(
+                self._uid(device),
+                ((device, self._current_volume(device), level),),
+                DEFAULT_RAMP_DURATION if duration is None else duration,
+            )
+
+        return len(self._fan_out(targets, start, deadline))
+
+    def fade_out(
+        self,
+        speaker: str | None = None,
+        duration: float = DEFAULT_FADE_DURATION,
+        deadline: Deadline | None = None,
+    ) -> int:
+        """Fade playing groups to silence, pause them, and restore volumes.
+
+        Every group is faded by the shared scheduler, so the whole house fades
+        together without a thread per room. A volume command sent during the
+        fade cancels it, and the group then keeps playing.
+        """
+        deadline = deadline or Deadline(None)
+        if speaker:
+            groups = (self.resolve_speaker(speaker, deadline=deadline),)
+        else:
+            groups = self.coordinators("PLAYING", deadline)
+        for coordinator in groups:
+            volumes = tuple(
+                self._fan_out(
+                    self._known_members(coordinator), self._current_volume, deadline
+                )
+            )
+            future = self._start_ramp(
+                self._uid(coordinator),
+                tuple((device, volume, 0) for device, volume in volumes),
+                duration,
+            )
+            future.add_done_callback(partial(self._finish_fade, coordinator, volumes))
+        return len(groups)
+
+    def _finish_fade(
+        self,
+        coordinator: Any,
+        volumes: Sequence[tuple[Any, int]],
+        future: Future[bool],
+    ) -> None:
+        if future.exception() is not None or not future.result():
+            return
+        with suppress(OSError, SoCoException):
+            coordinator.pause()
+            for device, volume in volumes:
+                device.volume = volume
+                self.state.update(self._uid(device), volume=volume)
+
+    def _start_ramp(
+        self,
+        key: str,
+        moves: Sequence[tuple[Any, int, int]],
+        duration: float,
+    ) -> Future[bool]:
+        """Schedule linear volume moves that the scheduler applies together.
+
+        ``moves`` holds ``(device, start, end)`` triples. A step only sends a
+        request to players whose rounded volume actually changed.
+        """
+        applied = {self._uid(device): start for device, start, _end in moves}
+
+        def apply(progress: float) -> None:
+            for device, start, end in moves:
+                uid = self._uid(device)
+                volume = round(start + (end - start) * progress)
+                if volume != applied[uid]:
+                    device.volume = volume
+                    applied[uid] = volume
+                    self.state.update(uid, volume=volume)
+
+        return self.ramps.start(key, apply, duration)
+
+    def _cancel_ramps(self, device: Any) -> None:
+        """Let an explicit volume command win over a running ramp or fade."""
+        self.ramps.cancel(self._uid(device), self._uid(self._group_coordinator(device)))
+
+    def _current_volume(self, device: Any) -> int:
+        cached = self._cached(device, "volume")
+        return int(device.volume) if cached is None else int(cached)
 
     def set_mute(
-        self, muted: bool, speaker: str | None = None, active_only: bool = True
+        self,
+        muted: bool,
+        speaker: str | None = None,
+        active_only: bool = True,
+        deadline: Deadline | None = None,
     ) -> int:
         """Set mute on a room or every member of an active group."""
-        targets = self._individual_targets(speaker, active_only)
-        for device in targets:
-            device.mute = bool(muted)
-        return len(targets)
+        deadline = deadline or Deadline(None)
+        targets, groups = self._volume_targets(
+            self._individual_targets(speaker, active_only, deadline)
+        )
+
+        def apply(device: Any) -> None:
+            if self._uid(device) in groups:
+                device.group.mute = bool(muted)
+                members = self._known_members(device)
+            else:
+                device.mute = bool(muted)
+                members = (device,)
+            for member in members:
+                self.state.update(self._uid(member), mute=bool(muted))
+
+        return self._rooms_changed(self._fan_out(targets, apply, deadline), groups)
 
     def _individual_targets(
-        self, speaker: str | None, active_only: bool
+        self, speaker: str | None, active_only: bool, deadline: Deadline
     ) -> tuple[Any, ...]:
         """Resolve individual speakers for volume-like controls."""
         if speaker:
-            return (self.resolve_speaker(speaker, coordinator=False),)
+            return (
+                self.resolve_speaker(speaker, coordinator=False, deadline=deadline),
+            )
         if active_only:
-            return self.active_speakers()
-        self._require_speakers()
+            return self.active_speakers(deadline)
+        self._require_speakers(deadline)
         return self.speakers
 
-    def group_speakers(self, coordinator_name: str, member_names: Iterable[str]) -> int:
+    def _volume_targets(
+        self, targets: Iterable[Any]
+    ) -> tuple[tuple[Any, ...], frozenset[str]]:
+        """Collapse complete groups to their coordinator in group-volume mode.
+
+        Returns the players to address and the UIDs of coordinators that stand
+        for a whole group. A group is only collapsed when every discovered
+        member was targeted, so naming one grouped room still adjusts that room
+        alone.
+        """
+        targets = tuple(targets)
+        if not self.group_volume:
+            return targets, frozenset()
+        wanted = {self._uid(device) for device in targets}
+        addressed: dict[str, Any] = {}
+        groups: set[str] = set()
+        for device in targets:
+            members = {self._uid(member) for member in self._known_members(device)}
+            if len(members) > 1 and members <= wanted:
+                coordinator = self._group_coordinator(device)
+                addressed.setdefault(self._uid(coordinator), coordinator)
+                groups.add(self._uid(coordinator))
+            else:
+                addressed.setdefault(self._uid(device), device)
+        return tuple(addressed.values()), frozenset(groups)
+
+    def room_uids(
+        self,
+        speaker_name: str,
+        group: bool = False,
+        deadline: Deadline | None = None,
+    ) -> frozenset[str]:
+        """Return the UID of a room, or of every discovered room in its group."""
+        device = self.resolve_speaker(
+            speaker_name, coordinator=False, deadline=deadline
+        )
+        members = self._known_members(device) if group else (device,)
+        return frozenset(self._uid(member) for member in members)
+
+    def _known_members(self, device: Any) -> tuple[Any, ...]:
+        """Return the discovered rooms that share a player's group."""
+        known = {self._uid(speaker) for speaker in self.speakers}
+        return tuple(
+            member
+            for member in device.group.members
+            if self._uid(member) in known or member is device
+        )
+
+    def _forget_member_volumes(self, coordinator: Any) -> None:
+        """Drop cached member volumes that a group adjustment rescaled."""
+        for member in self._known_members(coordinator):
+            self.state.discard(self._uid(member), "volume")
+
+    def _rooms_changed(
+        self, results: Iterable[tuple[Any, Any]], groups: frozenset[str]
+    ) -> int:
+        return sum(
+            len(self._known_members(device)) if self._uid(device) in groups else 1
+            for device, _result in results
+        )
+
+    def group_speakers(
+        self,
+        coordinator_name: str,
+        member_names: Iterable[str],
+        deadline: Deadline | None = None,
+    ) -> int:
         """Join resolved rooms to a coordinator after validating every name."""
-        coordinator = self.resolve_speaker(coordinator_name, coordinator=False)
+        deadline = deadline or Deadline(None)
+        coordinator = self.resolve_speaker(
+            coordinator_name, coordinator=False, deadline=deadline
+        )
         members = tuple(
-            self.resolve_speaker(name, coordinator=False) for name in member_names
+            self.resolve_speaker(name, coordinator=False, deadline=deadline)
+            for name in member_names
+        )
+        return self._join(coordinator, members, deadline)
+
+    def group_all(self, coordinator_name: str, deadline: Deadline | None = None) -> int:
+        """Group the complete discovered household around one room."""
+        deadline = deadline or Deadline(None)
+        coordinator = self.resolve_speaker(
+            coordinator_name, coordinator=False, deadline=deadline
         )
-        coordinator_uid = str(getattr(coordinator, "uid", coordinator.player_name))
-        changed = 0
+        return self._join(coordinator, self.speakers, deadline)
+
+    def _join(
+        self, coordinator: Any, members: Iterable[Any], deadline: Deadline
+    ) -> int:
+        """Apply one grouping plan with concurrent joins.
+
+        The plan is computed from a single topology snapshot taken before any
+        join, because every join invalidates SoCo's topology cache. Joins are
+        then sent together, and the call waits once for the ZoneGroupTopology
+        event that shows the household converged.
+        """
+        plan = self._grouping_plan(coordinator, members)
+        if not plan:
+            return 0
+        waiter = self._topology_waiter(coordinator)
+        try:
+            joined = self._fan_out(
+                plan, lambda member: member.join(coordinator), deadline
+            )
+            if waiter is not None:
+                self._await_grouping(coordinator, plan, waiter[0], deadline)
+        finally:
+            if waiter is not None:
+                with suppress(OSError, SoCoException):
+                    waiter[1].unsubscribe()
+        return len(joined)
+
+    def _grouping_plan(
+        self, coordinator: Any, members: Iterable[Any]
+    ) -> tuple[Any, ...]:
+        """Return the rooms that still have to join ``coordinator``."""
+        coordinator_uid = self._uid(coordinator)
+        plan: dict[str, Any] = {}
         for member in members:
-            member_uid = str(getattr(member, "uid", member.player_name))
-            if member_uid == coordinator_uid:
+            member_uid = self._uid(member)
+            if member_uid == coordinator_uid or member_uid in plan:
                 continue
-            if (
-                len(member.group.members) > 1
-                and member.group.coordinator.uid == coordinator.uid
-            ):
+            if self._uid(self._group_coordinator(member)) == coordinator_uid:
                 continue
-            member.join(coordinator)
-            changed += 1
-        return changed
+            plan[member_uid] = member
+        return tuple(plan.values())
 
-    def group_all(self, coordinator_name: str) -> int:
-        """Group the complete discovered household around one room."""
-        self._require_speakers()
-        return self.group_speakers(
-            coordinator_name,
-            (speaker.player_name for speaker in self.speakers),
-        )
+    def _topology_waiter(self, device: Any) -> tuple[Event, Any] | None:
+        """Subscribe to topology changes before the joins that cause them."""
+        if not self.events_enabled or not hasattr(device, "zoneGroupTopology"):
+            return None
+        changed = Event()
+        try:
+            subscription = device.zoneGroupTopology.subscribe()
+        except (OSError, SoCoException):
+            return None
+        subscription.callback = lambda _event: changed.set()
+        return changed, subscription
 
-    def ungroup_speaker(self, speaker_name: str) -> int:
+    def _await_grouping(
+        self,
+        coordinator: Any,
+        members: Iterable[Any],
+        changed: Event,
+        deadline: Deadline,
+    ) -> bool:
+        """Wait for topology events until every member follows ``coordinator``.
+
+        The subscription's initial event and intermediate topologies are
+        checked and skipped. Joins were already accepted by the players, so
+        running out of time only means the result is not yet confirmed.
+        """
+        remaining = deadline.remaining()
+        settle_by = monotonic() + (
+            _TOPOLOGY_SETTLE_TIMEOUT
+            if remaining is None
+            else min(_TOPOLOGY_SETTLE_TIMEOUT, remaining)
+        )
+        coordinator_uid = self._uid(coordinator)
+        while changed.wait(max(0.0, settle_by - monotonic())):
+            changed.clear()
+            with suppress(OSError, SoCoException):
+                coordinator.zone_group_state.clear_cache()
+                if all(
+                    self._uid(self._group_coordinator(member)) == coordinator_uid
+                    for member in members
+                ):
+                    return True
+        return False
+
+    def ungroup_speaker(
+        self, speaker_name: str, deadline: Deadline | None = None
+    ) -> int:
         """Isolate a room predictably, including when it is the coordinator."""
-        device = self.resolve_speaker(speaker_name, coordinator=False)
+        deadline = deadline or Deadline(None)
+        device = self.resolve_speaker(
+            speaker_name, coordinator=False, deadline=deadline
+        )
         members = tuple(device.group.members)
         if len(members) <= 1:
             return 0
         if device.group.coordinator.uid != device.uid:
-            device.unjoin()
+            self._fan_out((device,), lambda player: player.unjoin(), deadline)
             return 1
 
-        changed = 0
-        for member in members:
-            if member.uid == device.uid:
+        others = tuple(member for member in members if member.uid != device.uid)
+        return len(self._fan_out(others, lambda member: member.unjoin(), deadline))
+
+    def capture_scene(
+        self,
+        name: str,
+        speaker_names: Iterable[str] | None = None,
+        deadline: Deadline | None = None,
+    ) -> Scene:
+        """Record group layout, levels, play mode, and source of rooms.
+
+        Rooms are read concurrently. Volume and mute come from the event
+        cache when it is current.
+        """
+        deadline = deadline or Deadline(None)
+        devices = self._rooms_named(speaker_names, deadline)
+        rooms = self._fan_out(devices, self._room_state, deadline)
+        return Scene(name, tuple(room for _device, room in rooms))
+
+    def _rooms_named(
+        self, speaker_names: Iterable[str] | None, deadline: Deadline
+    ) -> tuple[Any, ...]:
+        """Resolve individual rooms, or the whole household without names."""
+        if speaker_names is None:
+            self._require_speakers(deadline)
+            return self.speakers
+        return tuple(
+            self.resolve_speaker(room, coordinator=False, deadline=deadline)
+            for room in speaker_names
+        )
+
+    def _room_state(self, device: Any) -> RoomState:
+        uid = self._uid(device)
+        coordinator = self._uid(self._group_coordinator(device))
+        mute = self._cached(device, "mute")
+        play_mode = uri = metadata = None
+        if coordinator == uid:
+            play_mode = device.play_mode
+            uri, metadata = self._source(device)
+        return RoomState(
+            uid=uid,
+            name=device.player_name,
+            coordinator=coordinator,
+            volume=self._current_volume(device),
+            mute=bool(device.mute if mute is None else mute),
+            play_mode=play_mode,
+            uri=uri or None,
+            metadata=metadata or None,
+        )
+
+    def _source(self, device: Any) -> tuple[str, str]:
+        """Return the current source URI and its DIDL metadata.
+
+        The queue carries no source metadata, so an event-cached queue URI
+        avoids the GetMediaInfo request.
+        """
+        cached = self._cached(device, "uri")
+        if isinstance(cached, str) and cached.startswith(_QUEUE_URI_PREFIX):
+            return cached, ""
+        info = device.avTransport.GetMediaInfo([("InstanceID", 0)])
+        return info.get("CurrentURI", ""), info.get("CurrentURIMetaData", "")
+
+    def capture_playback(
+        self,
+        speaker_names: Iterable[str] | None = None,
+        deadline: Deadline | None = None,
+    ) -> tuple[PlaybackState, ...]:
+        """Snapshot rooms before an interruption such as an announcement.
+
+        Rooms are read concurrently. Transport state, volume, mute, and queue
+        URIs come from the event cache when it is current, so only queue
+        playback costs an extra position request.
+        """
+        deadline = deadline or Deadline(None)
+        return self._capture_playback(
+            self._rooms_named(speaker_names, deadline), deadline
+        )
+
+    def _capture_playback(
+        self, devices: Iterable[Any], deadline: Deadline
+    ) -> tuple[PlaybackState, ...]:
+        captured = self._fan_out(devices, self._room_state, deadline)
+        coordinators = tuple(device for device, room in captured if room.is_coordinator)
+        playing = dict(self._fan_out(coordinators, self._queue_position, deadline))
+        return tuple(
+            PlaybackState(room, *playing.get(device, ("STOPPED", None, None)))
+            if room.is_coordinator
+            else PlaybackState(room)
+            for device, room in captured
+        )
+
+    def _queue_position(self, device: Any) -> tuple[str, int | None, str | None]:
+        state = self._current_transport_state(device)
+        uri = self._cached(device, "uri")
+        if uri is None:
+            uri = self._source(device)[0]
+        if state not in ("PLAYING", "PAUSED_PLAYBACK") or not str(uri).startswith(
+            _QUEUE_URI_PREFIX
+        ):
+            return state, None, None
+        info = device.get_current_track_info()
+        track = int(info.get("playlist_position") or 0) or None
+        return state, track, info.get("position") or None
+
+    def announce(
+        self,
+        uri: str,
+        speaker_names: Iterable[str] | None = None,
+        volume: int | None = None,
+        deadline: Deadline | None = None,
+        timeout: float = _ANNOUNCEMENT_TIMEOUT,
+    ) -> int:
+        """Play a clip on rooms, wait for it to end, and restore playback.
+
+        Named rooms play the clip with their whole group; without names every
+        group does. Snapshot, playback, and restore each run concurrently
+        across groups. Restoring happens even when playback fails and is not
+        bound by ``deadline``, so rooms are never left on the clip.
+        """
+        if volume is not None and not 0 <= int(volume) <= 100:
+            raise ValueError("Sonos volume must be between 0 and 100")
+        deadline = deadline or Deadline(None)
+        if speaker_names is None:
+            coordinators = self.coordinators(deadline=deadline)
+        else:
+            coordinators = tuple(
+                {
+                    self._uid(device): device
+                    for device in (
+                        self.resolve_speaker(name, deadline=deadline)
+                        for name in speaker_names
+                    )
+                }.values()
+            )
+        members = tuple(
+            member
+            for coordinator in coordinators
+            for member in self._known_members(coordinator)
+        )
+        snapshot = self._capture_playback(members, deadline)
+
+        def play(coordinator: Any) -> None:
+            if volume is not None:
+                for member in self._known_members(coordinator):
+                    self._cancel_ramps(member)
+                    member.volume = int(volume)
+            coordinator.play_uri(uri, title="Announcement")
+
+        try:
+            played = tuple(
+                device for device, _ in self._fan_out(coordinators, play, deadline)
+            )
+            self._await_clip(played, timeout)
+        finally:
+            self.restore_playback(snapshot)
+        return len(played)
+
+    def _await_clip(self, devices: Iterable[Any], timeout: float) -> None:
+        """Wait until every room has finished playing a short clip.
+
+        A room that is stopped before it was ever seen playing is only
+        considered done after a grace period, because players report the
+        previous state until the clip has buffered.
+        """
+        started_at = monotonic()
+        pending = {self._uid(device): device for device in devices}
+        started: set[str] = set()
+        while pending and monotonic() - started_at < timeout:
+            sleep(_CLIP_POLL_INTERVAL)
+            budget = Deadline(max(0.0, timeout - (monotonic() - started_at)))
+            try:
+                states = self._fan_out(
+                    pending.values(), self._current_transport_state, budget
+                )
+            except (OSError, SoCoException):
                 continue
-            member.unjoin()
-            changed += 1
-        return changed
-
-    def switch_to_tv(self, speaker_name: str) -> int:
-        """Select the HDMI/optical TV input on a home-theater room."""
-        device = self.resolve_speaker(speaker_name, coordinator=False)
-        device.switch_to_tv()
+            for device, state in states:
+                uid = self._uid(device)
+                if state in ("PLAYING", "TRANSITIONING"):
+                    started.add(uid)
+                elif uid in started or monotonic() - started_at > _CLIP_START_GRACE:
+                    pending.pop(uid, None)
+
+    def restore_playback(
+        self, states: Iterable[PlaybackState], deadline: Deadline | None = None
+    ) -> int:
+        """Put rooms back as captured by :meth:`capture_playback`.
+
+        Grouping, levels, and sources are restored like a scene. Queue
+        playback resumes at the captured track and offset, and rooms that
+        were playing start again. Rooms are restored concurrently.
+        """
+        states = tuple(states)
+        return self._restore_rooms(
+            tuple(state.room for state in states),
+            {state.room.uid: state for state in states},
+            deadline or Deadline(None),
+        )
+
+    def apply_scene(self, scene: Scene, deadline: Deadline | None = None) -> int:
+        """Restore a scene by changing only what differs from the household.
+
+        Grouping changes come first: future coordinators leave their groups,
+        then members join them, each wave concurrently. Room levels and
+        coordinator sources follow. Rooms that are no longer discovered are skipped.
+        Returns the number of rooms that needed a change.
+        """
+        return self._restore_rooms(scene.rooms, {}, deadline or Deadline(None))
+
+    def _restore_rooms(
+        self,
+        rooms: Iterable[RoomState],
+        playback: dict[str, PlaybackState],
+        deadline: Deadline,
+    ) -> int:
+        self._require_speakers(deadline)
+        devices = {self._uid(device): device for device in self.speakers}
+        wanted = {room.uid: room for room in rooms if room.uid in devices}
+        if not wanted:
+            raise SpeakerNotFoundError(", ".join(room.name for room in rooms))
+
+        def isolate(device: Any) -> bool:
+            room = wanted[self._uid(device)]
+            if self._uid(self._group_coordinator(device)) == room.coordinator:
+                return False
+            device.unjoin()
+            return True
+
+        def join(device: Any) -> bool:
+            room = wanted[self._uid(device)]
+            if self._uid(self._group_coordinator(device)) == room.coordinator:
+                return False
+            if room.coordinator not in devices:
+                return False
+            device.join(devices[room.coordinator])
+            return True
+
+        def restore(device: Any) -> bool:
+            uid = self._uid(device)
+            room = wanted[uid]
+            changed = False
+            if self._current_volume(device) != room.volume:
+                device.volume = room.volume
+                self.state.update(uid, volume=room.volume)
+                changed = True
+            mute = self._cached(device, "mute")
+            if bool(device.mute if mute is None else mute) != room.mute:
+                device.mute = room.mute
+                self.state.update(uid, mute=room.mute)
+                changed = True
+            if not room.is_coordinator:
+                return changed
+            if room.play_mode and device.play_mode != room.play_mode:
+                device.play_mode = room.play_mode
+                changed = True
+            state = playback.get(uid)
+            if room.uri and self._source(device)[0] != room.uri:
+                self._load_source(device, room, state)
+                changed = True
+            if (
+                state is not None
+                and state.transport_state == "PLAYING"
+                and self._current_transport_state(device) != "PLAYING"
+            ):
+                device.play()
+                changed = True
+            return changed
+
+        targets = tuple(devices[uid] for uid in wanted)
+        coordinators = tuple(
+            device for device in targets if wanted[self._uid(device)].is_coordinator
+        )
+        members = tuple(device for device in targets if device not in coordinators)
+        # Future coordinators leave their current groups before any member
+        # joins them, so no join targets a group that is about to split.
+        regrouped: set[str] = set()
+        for wave, change in ((coordinators, isolate), (members, join)):
+            changed_uids = {
+                self._uid(device)
+                for device, changed in self._fan_out(wave, change, deadline)
+                if changed
+            }
+            if changed_uids:
+                self._invalidate_topology(targets[0])
+            regrouped |= changed_uids
+        restored = {
+            self._uid(device)
+            for device, changed in self._fan_out(targets, restore, deadline)
+            if changed
+        }
+        return len(regrouped | restored)
+
+    @staticmethod
+    def _load_source(device: Any, room: RoomState, state: PlaybackState | None) -> None:
+        """Select a captured source without starting it."""
+        if state is not None and state.track and room.uri.startswith(_QUEUE_URI_PREFIX):
+            device.play_from_queue(state.track - 1, start=False)
+            if state.position and state.position != "0:00:00":
+                device.seek(state.position)
+            return
+        device.play_uri(room.uri, room.metadata or "", start=False)
+
+    @staticmethod
+    def _invalidate_topology(device: Any) -> None:
+        """Make the next group lookup read the topology a change produced."""
+        zone_group_state = getattr(device, "zone_group_state", None)
+        if zone_group_state is not None:
+            zone_group_state.clear_cache()
+
+    def run_batch(
+        self,
+        operations: Iterable[Mapping[str, Any]],
+        deadline: Deadline | None = None,
+    ) -> list[dict[str, Any]]:
+        """Run several operations planned against one topology snapshot.
+
+        Operations on disjoint rooms run concurrently; operations sharing a
+        room keep their requested order. One failing operation does not stop
+        the others, and every request gets its own result entry.
+        """
+        deadline = deadline or Deadline(None)
+        self._require_speakers(deadline)
+        return batch.run(self, operations, deadline, self._batch_executor)
+
+    def speaker_info(
+        self, speaker_name: str | None, deadline: Deadline | None = None
+    ) -> SpeakerInfo:
+        """Return a room's hardware details, reading them at most per boot."""
+        deadline = deadline or Deadline(None)
+        device = self.resolve_speaker(
+            speaker_name, coordinator=False, deadline=deadline
+        )
+        return self._speaker_info(device, deadline)
+
+    def _speaker_info(self, device: Any, deadline: Deadline) -> SpeakerInfo:
+        return self._speaker_details((device,), deadline)[self._uid(device)]
+
+    def _speaker_details(
+        self, devices: Iterable[Any], deadline: Deadline
+    ) -> dict[str, SpeakerInfo]:
+        """Return details by UID, reading only players that rebooted.
+
+        SoCo polls the zone group topology for the boot sequence number once
+        its household cache is a few seconds old, so the number is checked
+        per player, concurrently and within the budget, and players with an
+        open breaker are skipped. A player without a known number keeps its
+        stored details.
+        """
+
+        def read_details(device: Any) -> SpeakerInfo:
+            uid = self._uid(device)
+            try:
+                boot_seq: str | None = str(device.boot_seqnum)
+            except (AttributeError, TypeError, ValueError):
+                # SoCo only knows the number once a topology read listed it.
+                boot_seq = None
+            stored = self.hardware.get(uid)
+            if stored is not None and boot_seq in (None, stored.boot_seq):
+                return stored
+            info = self._read_speaker_info(device, deadline)
+            details = SpeakerInfo.from_soco(uid, info or {}, boot_seq)
+            self.hardware.put(details)
+            return details
+
+        return {
+            self._uid(device): details
+            for device, details in self._fan_out(devices, read_details, deadline)
+        }
+
+    @staticmethod
+    def _read_speaker_info(device: Any, deadline: Deadline) -> dict[str, Any]:
+        """Return ``get_speaker_info`` plus the services of the description.
+
+        Services decide capabilities such as the TV input. When the
+        description cannot be read, the details keep no services and the
+        capabilities fall back to the model name.
+        """
+        info = dict(device.get_speaker_info(refresh=True) or {})
+        base_url = getattr(device, "base_url", None)
+        if base_url:
+            remaining = deadline.remaining()
+            timeout = (
+                _DESCRIPTION_TIMEOUT
+                if remaining is None
+                else min(_DESCRIPTION_TIMEOUT, remaining)
+            )
+            with suppress(requests.RequestException, ElementTree.ParseError):
+                response = requests.get(
+                    f"{base_url}/xml/device_description.xml", timeout=timeout
+                )
+                response.raise_for_status()
+                info["services"] = description_services(response.content)
+        return info
+
+    def _home_theater_room(self, speaker_name: str | None, deadline: Deadline) -> Any:
+        """Return the home-theater player a TV command for a room means.
+
+        A named room that is not a home-theater product is served by the
+        one in its group, preferring the coordinator. Without a name, the
+        household's only home-theater room is used.
+        """
+        if speaker_name:
+            device = self.resolve_speaker(
+                speaker_name, coordinator=False, deadline=deadline
+            )
+            leader = self._group_coordinator(device)
+            candidates = tuple(
+                dict.fromkeys((device, leader, *self._known_members(device)))
+            )
+        else:
+            self._require_speakers(deadline)
+            device = None
+            candidates = self.speakers
+        details = self._speaker_details(candidates, deadline)
+        capable = [
+            candidate
+            for candidate in candidates
+            if self._uid(candidate) in details
+            and details[self._uid(candidate)].home_theater
+        ]
+        if device is not None and not capable:
+            raise FeatureNotSupportedError(device.player_name)
+        if device is None and len(capable) != 1:
+            raise SpeakerNotFoundError("No speaker was provided")
+        return capable[0]
+
+    def switch_to_tv(
+        self, speaker_name: str | None, deadline: Deadline | None = None
+    ) -> int:
+        """Select the TV input of a room's home-theater player."""
+        deadline = deadline or Deadline(None)
+        device = self._home_theater_room(speaker_name, deadline)
+        self._fan_out((device,), lambda player: player.switch_to_tv(), deadline)
         return 1
 
     def set_home_theater_option(
-        self, option: str, enabled: bool, speaker_name: str
+        self,
+        option: str,
+        enabled: bool,
+        speaker_name: str | None,
+        deadline: Deadline | None = None,
     ) -> int:
-        """Toggle a current SoCo home-theater enhancement."""
+        """Toggle night mode or speech enhancement on a room's home theater."""
         properties = {"night": "night_mode", "speech": "dialog_mode"}
         try:
             property_name = properties[option]
         except KeyError as error:
             raise ValueError(f"Unsupported home-theater option: {option}") from error
-        device = self.resolve_speaker(speaker_name, coordinator=False)
-        setattr(device, property_name, bool(enabled))
+        deadline = deadline or Deadline(None)
+        device = self._home_theater_room(speaker_name, deadline)
+
+        def apply(player: Any) -> None:
+            setattr(player, property_name, bool(enabled))
+
+        self._fan_out((device,), apply, deadline)
         return 1
 
-    def active_speakers(self) -> tuple[Any, ...]:
+    def active_speakers(self, deadline: Deadline | None = None) -> tuple[Any, ...]:
         """Return every individual speaker in a currently playing group."""
-        self._require_speakers()
+        deadline = deadline or Deadline(None)
+        layout = self._group_layout(deadline)
+        playing = {
+            self._uid(device) for device in self.coordinators("PLAYING", deadline)
+        }
         return tuple(
             speaker
             for speaker in self.speakers
-            if self.transport_state(
-                speaker.group.coordinator if len(speaker.group.members) > 1 else speaker
-            )
-            == "PLAYING"
+            if self._uid(speaker) in layout
+            and self._uid(layout[self._uid(speaker)]) in playing
         )
 
-    def duck(self, amount: int) -> int:
-        """Snapshot and reduce the volume of currently playing speakers."""
-        targets = self.active_speakers()
-        self._volume_snapshot = {
-            str(getattr(device, "uid", device.player_name)): int(device.volume)
-            for device in targets
-        }
-        for device in targets:
-            device.set_relative_volume(-int(amount))
-        return len(targets)
+    def _group_layout(self, deadline: Deadline) -> dict[str, Any]:
+        """Return the coordinator of every reachable room, keyed by room UID.
+
+        Rooms with an open breaker are dropped before any lookup. The rest
+        are read in one budgeted call, led by the first of them, whose
+        topology poll also fills SoCo's household cache for the others. The
+        read mostly hits that cache, so only its failures count as health.
+        """
+        self._require_speakers(deadline)
+        speakers = tuple(device for device in self.speakers if self._available(device))
+        if not speakers:
+            raise SpeakerUnavailableError(
+                ", ".join(device.player_name for device in self.speakers)
+            )
 
-    def unduck(self) -> int:
+        def read_layout(_source: Any) -> dict[str, Any]:
+            return {
+                self._uid(speaker): self._group_coordinator(speaker)
+                for speaker in speakers
+            }
+
+        try:
+            return self._call(deadline, read_layout, speakers[0])
+        except (DeadlineExceededError, OSError):
+            self.health.record_failure(self._uid(speakers[0]))
+            raise
+
+    @staticmethod
+    def _uid(device: Any) -> str:
+        """Return a stable key for a player, falling back to its room name."""
+        return str(getattr(device, "uid", device.player_name))
+
+    @staticmethod
+    def _group_coordinator(device: Any) -> Any:
+        """Return the coordinator of a grouped player, or the player itself."""
+        return device.group.coordinator if len(device.group.members) > 1 else device
+
+    def duck(
+        self,
+        amount: int,
+        deadline: Deadline | None = None,
+        duration: float | None = None,
+    ) -> int:
+        """Snapshot and reduce the volume of currently playing speakers.
+
+        Pre-duck volumes come from the event cache when available, and every
+        room is lowered concurrently. A room that is already ducked keeps its
+        original snapshot. With a duration, standalone rooms are lowered
+        gradually by the ramp scheduler instead of in one step.
+        """
+        deadline = deadline or Deadline(None)
+        with self._duck_guard:
+            generation = self._duck_generation
+        targets, groups = self._volume_targets(self.active_speakers(deadline))
+
+        def lower(device: Any) -> bool:
+            uid = self._uid(device)
+            with self._duck_lock(uid):
+                with self._duck_guard:
+                    if generation != self._duck_generation:
+                        return False
+                    if uid in self._volume_snapshot:
+                        return False
+                    # A restore that starts during the reads below finds the
+                    # room in flight and waits on its lock for the snapshot.
+                    self._ducking.add(uid)
+                try:
+                    return lower_room(device, uid)
+                finally:
+                    with self._duck_guard:
+                        self._ducking.discard(uid)
+
+        def lower_room(device: Any, uid: str) -> bool:
+            if uid in groups:
+                # One SetRelativeGroupVolume keeps the group balance.
+                volume = int(device.group.volume)
+                with self._duck_guard:
+                    self._volume_snapshot[uid] = volume
+                self._ducked_groups.add(uid)
+                device.group.set_relative_volume(-int(amount))
+                self._forget_member_volumes(device)
+                return True
+            volume = self._current_volume(device)
+            with self._duck_guard:
+                self._volume_snapshot[uid] = volume
+            if duration:
+                self._start_ramp(
+                    uid, ((device, volume, max(0, volume - int(amount))),), duration
+                )
+                return True
+            new_volume = device.set_relative_volume(-int(amount))
+            if isinstance(new_volume, int):
+                self.state.update(uid, volume=new_volume)
+            return True
+
+        lowered = self._fan_out(targets, lower, deadline)
+        return self._rooms_changed(
+            ((device, result) for device, result in lowered if result), groups
+        )
+
+    def unduck(self, deadline: Deadline | None = None) -> int:
         """Restore only speakers captured by the most recent duck operation."""
-        restored = 0
-        self._require_speakers()
-        for device in self.speakers:
-            uid = str(getattr(device, "uid", device.player_name))
-            if uid in self._volume_snapshot:
-                device.volume = self._volume_snapshot[uid]
-                restored += 1
-        self._volume_snapshot.clear()
-        return restored
+        deadline = deadline or Deadline(None)
+        with self._duck_guard:
+            self._duck_generation += 1
+            pending = self._ducking | self._volume_snapshot.keys()
+        self._require_speakers(deadline)
+        targets = tuple(
+            device for device in self.speakers if self._uid(device) in pending
+        )
+
+        def restore(device: Any) -> bool:
+            uid = self._uid(device)
+            with self._duck_lock(uid):
+                with self._duck_guard:
+                    volume = self._volume_snapshot.pop(uid, None)
+                if volume is None:
+                    return False
+                self._cancel_ramps(device)
+                if uid in self._ducked_groups:
+                    self._ducked_groups.discard(uid)
+                    if len(self._known_members(device)) > 1:
+                        device.group.volume = volume
+                        self._forget_member_volumes(device)
+                        return True
+                device.volume = volume
+                self.state.update(uid, volume=volume)
+                return True
+
+        return sum(
+            bool(restored)
+            for _device, restored in self._fan_out(targets, restore, deadline)
+        )
+
+    def _duck_lock(self, uid: str) -> Lock:
+        with self._duck_guard:
+            return self._duck_locks.setdefault(uid, Lock())
 
     def provider(self, service: ServiceInfo, device: Any) -> Any:
-        """Create a provider bound to the target household device."""
+        """Return a provider bound to the household of ``device``.
+
+        The Music Library is read from the target device itself. SMAPI
+        providers only use it for household credentials, so one provider per
+        service is kept until the next discovery.
+        """
         if service.name == MUSIC_LIBRARY:
             return self._music_library_cls(device)
-        return self._music_service_cls(service.name, device=device)
+        with self._provider_lock:
+            provider = self._providers.get(service.name)
+            if provider is None:
+                provider = self._music_service_cls(service.name, device=device)
+                self._providers[service.name] = provider
+        return provider
+
+    def prepare_service(
+        self, service_name: str, deadline: Deadline | None = None
+    ) -> tuple[str, ...]:
+        """Build a service's provider ahead of use and return its categories."""
+        deadline = deadline or Deadline(None)
+        self._require_speakers(deadline)
+        service = self.registry.resolve(service_name)
+        provider = self._call(deadline, self.provider, service, self.speakers[0])
+        if service.name == MUSIC_LIBRARY:
+            return tuple(sorted(MUSIC_LIBRARY_CATEGORIES))
+
+        def search_categories() -> tuple[str, ...]:
+            # SoCo fetches the presentation map once per provider.
+            return tuple(provider.available_search_categories)
+
+        return self._call(deadline, search_categories)
 
     @staticmethod
     def is_authenticated(provider: Any, device: Any) -> bool:
@@ -528,11 +1962,17 @@ class SonosController:
         category: str,
         query: str,
         artist: str | None = None,
+        deadline: Deadline | None = None,
     ) -> PlaybackResult:
-        """Search a service, queue the best match, and start playback."""
+        """Search a service, queue the best match, and start playback.
+
+        When the deadline ends while SMAPI containers are still being browsed,
+        the best playable match found so far is used.
+        """
         if not query or not query.strip():
             raise NoResultsError(query)
-        device = self.resolve_speaker(speaker_name)
+        deadline = deadline or Deadline(None)
+        device = self.resolve_speaker(speaker_name, deadline=deadline)
         service = self.registry.resolve(service_name)
         provider = self.provider(service, device)
 
@@ -544,16 +1984,33 @@ class SonosController:
             raise AuthenticationNotSupportedError(service.name)
 
         search_category = self._resolve_category(provider, service, category)
+        soap_client = getattr(provider, "soap_client", None)
+        if soap_client is not None:
+            # SMAPI requests honour a per-client socket timeout.
+            soap_client.timeout = deadline.timeout(_SMAPI_TIMEOUT, "search")
 
         try:
-            results = self._search(provider, service, search_category, query, artist)
+            results = self._search(
+                provider, service, search_category, query, artist, deadline
+            )
         except MusicServiceAuthException as error:
             raise AuthenticationRequiredError(service.name) from error
         picked = self._pick_best(results, query, artist)
+        if picked is None and service.name == MUSIC_LIBRARY:
+            local = self._play_local(device, search_category, query, artist, deadline)
+            if local is not None:
+                return PlaybackResult(
+                    title=local.title,
+                    service=service.name,
+                    speaker=device.player_name,
+                    category=category,
+                    artist=artist,
+                )
         if picked is None:
+            deadline.check("search")
             raise NoResultsError(query)
 
-        self._start_playback(device, provider, service, picked)
+        self._start_playback(device, provider, service, picked, deadline)
         return PlaybackResult(
             title=str(getattr(picked, "title", query)),
             service=service.name,
@@ -562,13 +2019,73 @@ class SonosController:
             artist=artist,
         )
 
+    def _play_local(
+        self,
+        device: Any,
+        category: str,
+        query: str,
+        artist: str | None,
+        deadline: Deadline,
+    ) -> LocalTrack | None:
+        """Stream unindexed local files through the media server.
+
+        A track plays directly. An album or artist match queues every
+        matching file in folder order. Returns the first file started.
+        """
+        if self.local_library is None:
+            return None
+        tracks = self._pick_local(self.local_library.tracks(), category, query, artist)
+        if not tracks:
+            return None
+        remote = getattr(device, "ip_address", "127.0.0.1")
+        urls = [self.media_server.url_for(track.path, remote) for track in tracks]
+        if len(urls) == 1:
+            self._call(deadline, device.play_uri, urls[0], title=tracks[0].title)
+            return tracks[0]
+        self._call(deadline, device.clear_queue)
+        for url in urls:
+            self._call(deadline, device.add_uri_to_queue, url)
+        self._call(deadline, device.play_from_queue, 0)
+        return tracks[0]
+
     @classmethod
-    def _start_playback(
+    def _pick_local(
         cls,
+        tracks: Iterable[LocalTrack],
+        category: str,
+        query: str,
+        artist: str | None,
+    ) -> tuple[LocalTrack, ...]:
+        field = {
+            "albums": "album",
+            "album_artists": "artist",
+            "artists": "artist",
+        }.get(category, "title")
+        candidates = [
+            track
+            for track in tracks
+            if getattr(track, field)
+            and (not artist or cls._artist_match_score(track, artist))
+        ]
+        scored = [
+            (cls._text_score(str(getattr(track, field)), query), track)
+            for track in candidates
+        ]
+        best = max((score for score, _track in scored), default=None)
+        if best is None or (best[0] == 0 and best[1] < _LOCAL_MATCH_RATIO):
+            return ()
+        matches = tuple(track for score, track in scored if score == best)
+        if field == "title":
+            return matches[:1]
+        return matches[:_MAX_LOCAL_QUEUE]
+
+    def _start_playback(
+        self,
         device: Any,
         provider: Any,
         service: ServiceInfo,
         item: Any,
+        deadline: Deadline,
     ) -> None:
         """Queue an item, with a direct-stream fallback for SMAPI streams.
 
@@ -579,9 +2096,9 @@ class SonosController:
         instead of being masked.
         """
         title = str(getattr(item, "title", ""))
-        device.clear_queue()
+        self._call(deadline, device.clear_queue)
         try:
-            device.add_to_queue(item)
+            self._call(deadline, device.add_to_queue, item)
         except SoCoUPnPException as error:
             item_id = getattr(item, "id", None)
             can_fallback = (
@@ -592,15 +2109,18 @@ class SonosController:
             )
             if not can_fallback:
                 raise
-            media_uri = str(provider.get_media_uri(item_id) or "")
+            media_uri = str(self._call(deadline, provider.get_media_uri, item_id) or "")
             if not media_uri:
                 raise
-            device.play_uri(cls._resolve_media_uri(media_uri), title=title)
+            resolved = self._resolve_media_uri(
+                media_uri, timeout=deadline.timeout(_MEDIA_URI_TIMEOUT, "media URI")
+            )
+            self._call(deadline, device.play_uri, resolved, title=title)
         else:
-            device.play_from_queue(0)
+            self._call(deadline, device.play_from_queue, 0)
 
     @staticmethod
-    def _resolve_media_uri(media_uri: str) -> str:
+    def _resolve_media_uri(media_uri: str, timeout: float = _MEDIA_URI_TIMEOUT) -> str:
         """Resolve a small single-entry HTTP M3U without flattening HLS.
 
         TuneIn's ``getMediaURI`` can return an M3U redirect document. Sonos may
@@ -612,9 +2132,7 @@ class SonosController:
         if parsed.scheme not in {"http", "https"}:
             return media_uri
 
-        with requests.get(
-            media_uri, timeout=_MEDIA_URI_TIMEOUT, stream=True
-        ) as response:
+        with requests.get(media_uri, timeout=timeout, stream=True) as response:
             response.raise_for_status()
             content_type = response.headers.get("Content-Type", "")
             mime_type = content_type.partition(";")[0].strip().casefold()
@@ -659,28 +2177,33 @@ class SonosController:
                 return resolved
         raise CategoryNotSupportedError(f"{service.name}:{category}")
 
-    @classmethod
     def _search(
-        cls,
+        self,
         provider: Any,
         service: ServiceInfo,
         category: str,
         query: str,
         artist: str | None,
+        deadline: Deadline,
     ) -> list[Any]:
         if service.name != MUSIC_LIBRARY:
-            results = list(provider.search(category, query) or [])
+            results = list(self._call(deadline, provider.search, category, query) or [])
             artist_categories = {
                 normalize_name(value) for value in CATEGORY_ALIASES["artists"]
             }
             if normalize_name(category) in artist_categories:
-                return cls._expand_artist_results(provider, results, query)
-            return cls._expand_provider_results(provider, results, query)
+                return self._expand_artist_results(provider, results, query, deadline)
+            return self._expand_provider_results(provider, results, query, deadline)
         if category == "tracks" and artist:
-            return list(provider.search_track(artist=artist, track=query) or [])
+            return list(
+                self._call(deadline, provider.search_track, artist=artist, track=query)
+                or []
+            )
         if category == "albums" and artist:
             return list(
-                provider.get_album_artists(
+                self._call(
+                    deadline,
+                    provider.get_album_artists,
                     search_term=query,
                     subcategories=[artist],
                     complete_result=True,
@@ -688,26 +2211,35 @@ class SonosController:
                 or []
             )
         method = getattr(provider, f"get_{category}")
-        return list(method(search_term=query, complete_result=True) or [])
+        return list(
+            self._call(deadline, method, search_term=query, complete_result=True) or []
+        )
 
-    @classmethod
     def _expand_artist_results(
-        cls, provider: Any, results: list[Any], query: str
+        self, provider: Any, results: list[Any], query: str, deadline: Deadline
     ) -> list[Any]:
         """Prefer an artist's own top tracks over a related-artist radio seed."""
-        if any(cls._is_queueable(item) for item in results):
+        if any(self._is_queueable(item) for item in results):
             return results
 
-        containers = [item for item in results if cls._item_flag(item, "can_enumerate")]
-        containers.sort(key=lambda item: cls._match_score(item, query), reverse=True)
+        containers = [
+            item for item in results if self._item_flag(item, "can_enumerate")
+        ]
+        containers.sort(key=lambda item: self._match_score(item, query), reverse=True)
         fallback: list[Any] = []
         for container in containers:
+            if deadline.expired:
+                # Keep the best partial result instead of browsing further.
+                break
             try:
-                children = list(provider.get_metadata(container, count=100) or [])
+                children = list(
+                    self._call(deadline, provider.get_metadata, container, count=100)
+                    or []
+                )
             except (OSError, ValueError, requests.RequestException, SoCoException):
                 continue
 
-            queueable = [item for item in children if cls._is_queueable(item)]
+            queueable = [item for item in children if self._is_queueable(item)]
             track_lists = [
                 item
                 for item in queueable
@@ -719,21 +2251,23 @@ class SonosController:
             exact_artist_items = [
                 item
                 for item in queueable
-                if normalize_name(cls._item_artist(item)) == normalize_name(query)
+                if normalize_name(self._item_artist(item)) == normalize_name(query)
             ]
             if exact_artist_items:
                 return exact_artist_items
 
             if not fallback:
-                fallback = cls._expand_provider_results(provider, children, query)
+                fallback = self._expand_provider_results(
+                    provider, children, query, deadline
+                )
         return fallback or results
 
-    @classmethod
     def _expand_provider_results(
-        cls,
+        self,
         provider: Any,
         results: list[Any],
         query: str,
+        deadline: Deadline,
         remaining_depth: int = 3,
     ) -> list[Any]:
         """Browse SMAPI containers until a genuinely playable item is found.
@@ -743,7 +2277,7 @@ class SonosController:
         search. A container marked ``canEnumerate`` must not be passed to the
         Sonos queue when ``canPlay`` is false.
         """
-        if any(cls._is_queueable(item) for item in results):
+        if any(self._is_queueable(item) for item in results):
             return results
         if remaining_depth <= 0:
             return results
@@ -751,25 +2285,32 @@ class SonosController:
         containers = [
             item
             for item in results
-            if cls._item_flag(item, "can_enumerate") is True
+            if self._item_flag(item, "can_enumerate") is True
             or (
-                cls._item_flag(item, "can_enumerate") is None
-                and cls._is_container(item)
+                self._item_flag(item, "can_enumerate") is None
+                and self._is_container(item)
             )
         ]
-        containers.sort(key=lambda item: cls._match_score(item, query), reverse=True)
+        containers.sort(key=lambda item: self._match_score(item, query), reverse=True)
         for container in containers:
+            if deadline.expired:
+                # Keep the best partial result instead of browsing further.
+                break
             try:
-                children = list(provider.get_metadata(container, count=100) or [])
+                children = list(
+                    self._call(deadline, provider.get_metadata, container, count=100)
+                    or []
+                )
             except (OSError, ValueError, requests.RequestException, SoCoException):
                 continue
-            expanded = cls._expand_provider_results(
+            expanded = self._expand_provider_results(
                 provider,
                 children,
                 query,
+                deadline,
                 remaining_depth=remaining_depth - 1,
             )
-            if any(cls._is_queueable(item) for item in expanded):
+            if any(self._is_queueable(item) for item in expanded):
                 return expanded
         return results
 
@@ -797,7 +2338,10 @@ class SonosController:
 
     @staticmethod
     def _match_score(item: Any, query: str) -> tuple[int, float]:
-        title = str(getattr(item, "title", ""))
+        return SonosController._text_score(str(getattr(item, "title", "")), query)
+
+    @staticmethod
+    def _text_score(title: str, query: str) -> tuple[int, float]:
         title_key = normalize_name(title)
         query_key = normalize_name(query)
         exact = title_key == query_key
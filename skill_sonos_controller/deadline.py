@@ -0,0 +1,50 @@
+"""End-to-end time budgets shared by the network calls of one command."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from time import monotonic
+
+from .exceptions import DeadlineExceededError
+
+
+class Deadline:
+    """A monotonic budget propagated to every Sonos and SMAPI request.
+
+    A ``None`` budget is unbounded. Direct API users and unit tests then keep
+    the former synchronous behaviour without worker threads.
+    """
+
+    def __init__(
+        self, budget: float | None, clock: Callable[[], float] = monotonic
+    ) -> None:
+        self._clock = clock
+        self.expires_at = None if budget is None else clock() + max(0.0, budget)
+
+    @property
+    def bounded(self) -> bool:
+        """Return whether this budget can run out."""
+        return self.expires_at is not None
+
+    @property
+    def expired(self) -> bool:
+        """Return whether no time is left for another network call."""
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    def remaining(self) -> float | None:
+        """Return the seconds left, or ``None`` for an unbounded budget."""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - self._clock())
+
+    def check(self, operation: str = "Sonos command") -> None:
+        """Raise before starting work that could no longer finish in time."""
+        if self.expired:
+            raise DeadlineExceededError(operation)
+
+    def timeout(self, default: float, operation: str = "Sonos command") -> float:
+        """Cap a per-request socket timeout by the remaining budget."""
+        self.check(operation)
+        remaining = self.remaining()
+        return default if remaining is None else min(default, remaining)
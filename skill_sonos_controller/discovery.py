@@ -0,0 +1,315 @@
+"""SSDP search that reports Sonos players as each one answers."""
+
+from __future__ import annotations
+
+import ipaddress
+import json
+import os
+import select
+import socket
+import struct
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from contextlib import suppress
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from threading import Lock
+from time import monotonic
+from typing import Any
+
+from ovos_utils.log import LOG
+
+from .storage import atomic_write_json
+
+_GROUP = ("239.255.255.250", 1900)
+_SEARCH = (
+    "M-SEARCH * HTTP/1.1\r\n"
+    "HOST: 239.255.255.250:1900\r\n"
+    'MAN: "ssdp:discover"\r\n'
+    "MX: 1\r\n"
+    "ST: urn:schemas-upnp-org:device:ZonePlayer:1\r\n"
+    "\r\n"
+).encode("ascii")
+# UDP is unreliable, so the search is sent a few times, as SoCo does.
+_SENDS = 3
+# Upper bound for one wait on the socket, so the quiet period is honoured.
+_POLL_INTERVAL = 0.1
+# Discoveries kept to judge how long the household takes to answer.
+_MAX_RUNS = 10
+# Players answer within the search's one-second MX, so even a fast household
+# gets twice that before a missing room is given up on.
+_MIN_TIMEOUT = 2.0
+# A room missing from this many discoveries in a row was most likely removed.
+_MAX_MISSES = 3
+
+
+@dataclass(frozen=True)
+class Responder:
+    """One player's answer to the search, before any UPnP call is made."""
+
+    ip_address: str
+    uid: str | None = None
+    household_id: str | None = None
+    boot_seq: str | None = None
+
+    @classmethod
+    def parse(cls, data: bytes, ip_address: str) -> Responder | None:
+        """Return the player behind an SSDP response, or ``None`` for others."""
+        headers = {}
+        for line in data.decode("utf-8", "replace").splitlines()[1:]:
+            name, separator, value = line.partition(":")
+            if separator:
+                headers[name.strip().upper()] = value.strip()
+        if "sonos" not in headers.get("SERVER", "").casefold():
+            return None
+        usn = headers.get("USN", "").removeprefix("uuid:")
+        return cls(
+            ip_address,
+            usn.split("::", maxsplit=1)[0] or None,
+            headers.get("X-RINCON-HOUSEHOLD"),
+            headers.get("X-RINCON-BOOTSEQ"),
+        )
+
+
+def interface_addresses() -> tuple[str, ...]:
+    """Return this host's IPv4 addresses that can reach a Sonos household.
+
+    Loopback and link-local addresses are skipped, as SoCo's discovery
+    skips them.
+    """
+    import ifaddr
+
+    addresses = set()
+    for adapter in ifaddr.get_adapters():
+        for network in adapter.ips:
+            if not isinstance(network.ip, str):
+                continue
+            address = ipaddress.ip_address(network.ip)
+            if not address.is_loopback and not address.is_link_local:
+                addresses.add(network.ip)
+    return tuple(sorted(addresses))
+
+
+def _multicast_socket(interface_addr: str | None) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+    # UPnP 1.0 requires a TTL of 4.
+    sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, struct.pack("B", 4))
+    if interface_addr is not None:
+        sock.setsockopt(
+            socket.IPPROTO_IP, socket.IP_MULTICAST_IF, socket.inet_aton(interface_addr)
+        )
+    return sock
+
+
+def _multicast_sockets(interface_addr: str | None) -> list[socket.socket]:
+    """Return one socket per interface, or one for ``interface_addr``.
+
+    Multi-homed hosts, such as Docker hosts or machines on a VPN, often route
+    multicast through the wrong interface by default, so SoCo sends on
+    every interface too. The default route is used when none is found.
+    """
+    if interface_addr is not None:
+        return [_multicast_socket(interface_addr)]
+    sockets = []
+    for address in interface_addresses() or (None,):
+        with suppress(OSError):
+            sockets.append(_multicast_socket(address))
+    return sockets
+
+
+def search(
+    timeout: float,
+    quiet_period: float | None = None,
+    interface_addr: str | None = None,
+    sockets: Sequence[socket.socket] | None = None,
+    clock: Callable[[], float] = monotonic,
+    wait: Callable[..., tuple[list[Any], list[Any], list[Any]]] = select.select,
+) -> Iterator[Responder]:
+    """Yield every Sonos player that answers, once, as soon as it answers.
+
+    The search is sent on every IPv4 interface, or only on
+    ``interface_addr``. It ends after ``timeout`` seconds. With
+    ``quiet_period``, it also ends once a player answered and no new one
+    followed for that long. Closing the iterator early ends the search as
+    well.
+    """
+    own_sockets = sockets is None
+    if sockets is None:
+        sockets = _multicast_sockets(interface_addr)
+    try:
+        active = []
+        for sock in sockets:
+            sent = 0
+            for _attempt in range(_SENDS):
+                try:
+                    sock.sendto(_SEARCH, _GROUP)
+                except OSError:
+                    continue
+                sent += 1
+            if sent:
+                active.append(sock)
+        if not active:
+            return
+        started_at = last_found = clock()
+        found = False
+        seen: set[str] = set()
+        while True:
+            now = clock()
+            remaining = timeout - (now - started_at)
+            if found and quiet_period is not None:
+                remaining = min(remaining, quiet_period - (now - last_found))
+            if remaining <= 0:
+                return
+            readable, _writable, _failed = wait(
+                active, [], [], min(remaining, _POLL_INTERVAL)
+            )
+            for sock in readable:
+                try:
+                    data, (ip_address, _port) = sock.recvfrom(1024)
+                except OSError:
+                    continue
+                responder = Responder.parse(data, ip_address)
+                if responder is None:
+                    continue
+                key = responder.uid or responder.ip_address
+                if key in seen:
+                    continue
+                seen.add(key)
+                found = True
+                last_found = clock()
+                yield responder
+    finally:
+        if own_sockets:
+            for sock in sockets:
+                sock.close()
+
+
+@dataclass(frozen=True)
+class DiscoveryRun:
+    """Timings of one discovery.
+
+    ``complete_after`` is the number of seconds until the last room was
+    found. ``ended`` is ``complete`` when every known room was found,
+    ``quiet`` after a quiet period, and ``timeout`` otherwise.
+    """
+
+    seconds: float
+    complete_after: float | None
+    found: int
+    missing: tuple[str, ...] = ()
+    ended: str = "quiet"
+
+
+class DiscoveryHistory:
+    """Rooms recent discoveries found and the timings of those discoveries.
+
+    A room stays expected until ``max_misses`` discoveries in a row missed
+    it. Pass ``path`` to keep the history across restarts.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str] | None = None,
+        max_runs: int = _MAX_RUNS,
+        max_misses: int = _MAX_MISSES,
+    ) -> None:
+        self.path = Path(path) if path is not None else None
+        self.max_runs = max_runs
+        self.max_misses = max_misses
+        self._lock = Lock()
+        self._loaded = False
+        self._expected: frozenset[str] = frozenset()
+        self._misses: dict[str, int] = {}
+        self._runs: list[DiscoveryRun] = []
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            expected = frozenset(str(uid) for uid in data.get("expected", ()))
+            misses = {
+                str(uid): int(count)
+                for uid, count in data.get("misses", {}).items()
+                if uid in expected
+            }
+            runs = [
+                DiscoveryRun(**{**run, "missing": tuple(run.get("missing", ()))})
+                for run in data.get("runs", ())
+            ]
+        except (OSError, ValueError, TypeError, AttributeError) as error:
+            # The history only tunes timeouts, so discovery starts afresh.
+            LOG.warning(
+                "Ignoring unreadable discovery history %s: %s", self.path, error
+            )
+            return
+        self._expected = expected
+        self._misses = misses
+        self._runs = runs[-self.max_runs :]
+
+    def _write(self) -> None:
+        if self.path is not None:
+            atomic_write_json(self.path, self._payload())
+
+    def _payload(self) -> dict[str, Any]:
+        return {
+            "expected": sorted(self._expected),
+            "misses": dict(sorted(self._misses.items())),
+            "runs": [asdict(run) for run in self._runs],
+        }
+
+    def expected(self) -> frozenset[str]:
+        """Return the UIDs of the rooms the next discovery should find."""
+        with self._lock:
+            self._load()
+            return self._expected
+
+    def timeout(self, default: float) -> float:
+        """Return how long to wait while known rooms are still missing.
+
+        Without history this is ``default``. Otherwise it is twice the
+        slowest recent time to find the last room, so quick households stop
+        waiting sooner and slow ones wait longer. It stays between two
+        seconds and twice the default.
+        """
+        with self._lock:
+            self._load()
+            samples = [
+                run.complete_after
+                for run in self._runs
+                if run.complete_after is not None
+            ]
+        if not samples:
+            return default
+        return min(2 * default, max(_MIN_TIMEOUT, 2 * max(samples)))
+
+    def record(self, run: DiscoveryRun, uids: Iterable[str]) -> None:
+        """Add a discovery and update the rooms expected next time.
+
+        Rooms it found are expected. A room it missed stays expected until
+        it was missed ``max_misses`` times in a row. A discovery that found
+        nothing keeps the rooms expected before it.
+        """
+        found = frozenset(uids)
+        with self._lock:
+            self._load()
+            if found:
+                misses = {
+                    uid: self._misses.get(uid, 0) + 1 for uid in self._expected - found
+                }
+                self._misses = {
+                    uid: count
+                    for uid, count in misses.items()
+                    if count < self.max_misses
+                }
+                self._expected = found | self._misses.keys()
+            self._runs = [*self._runs, run][-self.max_runs :]
+            self._write()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the known rooms and recent timings as JSON-compatible data."""
+        with self._lock:
+            self._load()
+            return self._payload()
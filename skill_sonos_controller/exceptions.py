@@ -35,3 +35,19 @@ class AuthenticationRequiredError(SonosControllerError):
 
 class AuthenticationNotSupportedError(SonosControllerError):
     """SoCo cannot authenticate the selected service's auth scheme."""
+
+
+class FeatureNotSupportedError(SonosControllerError):
+    """The targeted player's hardware lacks the requested feature."""
+
+
+class SpeechSynthesisError(SonosControllerError):
+    """The configured OVOS TTS engine could not render an announcement."""
+
+
+class DeadlineExceededError(SonosControllerError, TimeoutError):
+    """A command's end-to-end time budget ran out before it completed."""
+
+
+class SpeakerUnavailableError(SonosControllerError, ConnectionError):
+    """Every targeted player is skipped after repeated network failures."""
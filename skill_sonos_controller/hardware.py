@@ -0,0 +1,179 @@
+"""Persisted speaker hardware details and the features they imply."""
+
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Mapping
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from threading import Lock
+from typing import Any
+from xml.etree import ElementTree
+
+from ovos_utils.log import LOG
+
+from .storage import atomic_write_json
+
+# Model names as reported in the device description, without the brand.
+_LINE_IN_MODELS = frozenset(
+    {"amp", "connect", "connect:amp", "era 100", "era 300", "five", "play:5", "port"}
+)
+_BATTERY_MODELS = frozenset({"move", "move 2", "roam", "roam 2", "roam sl"})
+# Trueplay tunes a speaker's own drivers, so pure streamers cannot use it.
+_NO_TRUEPLAY_MODELS = frozenset({"boost", "bridge", "connect", "port"})
+# Players with a TV input list this service in their device description.
+_HOME_THEATER_SERVICE = "HTControl"
+_SERVICE_ID = "{urn:schemas-upnp-org:device-1-0}serviceId"
+
+
+def description_services(description: bytes) -> tuple[str, ...]:
+    """Return the UPnP service names listed in a device description.
+
+    Service IDs such as ``urn:upnp-org:serviceId:HTControl`` are reduced to
+    their last part. Embedded media renderer and server devices are included.
+    """
+    root = ElementTree.fromstring(description)
+    return tuple(
+        sorted(
+            {
+                element.text.strip().rsplit(":", maxsplit=1)[-1]
+                for element in root.iter(_SERVICE_ID)
+                if element.text and element.text.strip()
+            }
+        )
+    )
+
+
+def _model(model_name: str) -> str:
+    """Return a model name such as ``play:5`` without the brand prefix."""
+    name = " ".join(model_name.casefold().split())
+    for prefix in ("sonos:", "sonos "):
+        name = name.removeprefix(prefix)
+    return name.strip()
+
+
+@dataclass(frozen=True)
+class SpeakerInfo:
+    """Static details of one player from its device description.
+
+    ``boot_seq`` is the boot sequence number the topology reported when the
+    details were read. A firmware update reboots the player, so a different
+    number means the details must be read again. ``services`` lists the UPnP
+    services of the device description; it is empty when the description
+    could not be read.
+    """
+
+    uid: str
+    model_name: str = "Sonos"
+    model_number: str = ""
+    display_version: str = ""
+    serial_number: str = ""
+    software_version: str = ""
+    hardware_version: str = ""
+    mac_address: str = ""
+    boot_seq: str | None = None
+    services: tuple[str, ...] = ()
+
+    def __post_init__(self) -> None:
+        # JSON stores the services as a list.
+        object.__setattr__(self, "services", tuple(self.services))
+
+    @classmethod
+    def from_soco(
+        cls, uid: str, info: Mapping[str, Any], boot_seq: str | None = None
+    ) -> SpeakerInfo:
+        """Build details from the mapping returned by ``get_speaker_info``.
+
+        A ``services`` entry, read from the device description, is kept too.
+        """
+        names = {item.name for item in fields(cls)} - {"uid", "boot_seq", "services"}
+        values = {name: str(info[name]) for name in names if info.get(name)}
+        services = tuple(str(service) for service in info.get("services") or ())
+        return cls(uid, boot_seq=boot_seq, services=services, **values)
+
+    @property
+    def home_theater(self) -> bool:
+        """Return whether the player has a TV input and home-theater modes.
+
+        The device description decides when it was read. The model-name
+        table is only a fallback for players whose description was not.
+        """
+        if self.services:
+            return _HOME_THEATER_SERVICE in self.services
+        from soco.core import SOUNDBARS
+
+        # SoCo matches the branded name, e.g. ``sonos amp``.
+        return f"sonos {_model(self.model_name)}".endswith(SOUNDBARS)
+
+    @property
+    def line_in(self) -> bool:
+        return _model(self.model_name) in _LINE_IN_MODELS
+
+    @property
+    def battery(self) -> bool:
+        return _model(self.model_name) in _BATTERY_MODELS
+
+    @property
+    def trueplay(self) -> bool:
+        return _model(self.model_name) not in _NO_TRUEPLAY_MODELS
+
+    def capabilities(self) -> dict[str, bool]:
+        """Return every capability flag by name."""
+        return {
+            "home_theater": self.home_theater,
+            "line_in": self.line_in,
+            "battery": self.battery,
+            "trueplay": self.trueplay,
+        }
+
+
+class SpeakerInfoStore:
+    """Keep speaker details by UID in one JSON document.
+
+    The store is memory-only when ``path`` is ``None``.
+    """
+
+    def __init__(self, path: str | os.PathLike[str] | None = None) -> None:
+        self.path = Path(path) if path is not None else None
+        self._lock = Lock()
+        self._speakers: dict[str, SpeakerInfo] | None = None
+
+    def _load(self) -> dict[str, SpeakerInfo]:
+        if self._speakers is None:
+            self._speakers = {}
+            if self.path is not None and self.path.exists():
+                try:
+                    data = json.loads(self.path.read_text(encoding="utf-8"))
+                    speakers = [
+                        SpeakerInfo(**item) for item in data.get("speakers", ())
+                    ]
+                except (OSError, ValueError, TypeError, AttributeError) as error:
+                    # Details are read again from the players when missing.
+                    LOG.warning(
+                        "Ignoring unreadable speaker details %s: %s", self.path, error
+                    )
+                    speakers = []
+                self._speakers = {info.uid: info for info in speakers}
+        return self._speakers
+
+    def _write(self) -> None:
+        if self.path is None or self._speakers is None:
+            return
+        atomic_write_json(
+            self.path,
+            {"speakers": [asdict(info) for info in self._speakers.values()]},
+        )
+
+    def get(self, uid: str) -> SpeakerInfo | None:
+        """Return stored details for a player."""
+        with self._lock:
+            return self._load().get(uid)
+
+    def put(self, info: SpeakerInfo) -> None:
+        """Store details for a player, writing the file only on changes."""
+        with self._lock:
+            speakers = self._load()
+            if speakers.get(info.uid) != info:
+                speakers[info.uid] = info
+                self._write()
@@ -0,0 +1,108 @@
+"""Per-speaker health tracking and circuit breaking for household commands."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from threading import Lock
+from time import monotonic
+
+_FAILURE_THRESHOLD = 3
+_RESET_TIMEOUT = 30.0
+# Weight of the newest sample in the smoothed round-trip latency.
+_LATENCY_WEIGHT = 0.3
+
+
+@dataclass
+class SpeakerHealth:
+    """Failure and latency statistics for one player."""
+
+    calls: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    latency: float | None = None
+    opened_at: float | None = None
+    probing: bool = False
+
+    @property
+    def state(self) -> str:
+        """Return ``open`` while the player is skipped, otherwise ``closed``."""
+        return "closed" if self.opened_at is None else "open"
+
+
+class HealthTracker:
+    """Open a breaker after repeated network failures from the same player.
+
+    An open breaker makes household-wide commands skip the player at once
+    instead of waiting for a socket timeout. After ``reset_timeout`` one
+    background probe is allowed; its success closes the breaker again.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = _FAILURE_THRESHOLD,
+        reset_timeout: float = _RESET_TIMEOUT,
+        clock: Callable[[], float] = monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = Lock()
+        self._speakers: dict[str, SpeakerHealth] = {}
+
+    def _get(self, uid: str) -> SpeakerHealth:
+        return self._speakers.setdefault(uid, SpeakerHealth())
+
+    def allow(self, uid: str) -> bool:
+        """Return whether commands may currently be sent to a player."""
+        with self._lock:
+            return self._get(uid).opened_at is None
+
+    def begin_probe(self, uid: str) -> bool:
+        """Reserve the single recovery probe once the cool-down has passed."""
+        with self._lock:
+            health = self._get(uid)
+            if (
+                health.opened_at is None
+                or health.probing
+                or self._clock() - health.opened_at < self.reset_timeout
+            ):
+                return False
+            health.probing = True
+            return True
+
+    def record_success(self, uid: str, latency: float) -> None:
+        """Record a completed round trip and close the player's breaker."""
+        with self._lock:
+            health = self._get(uid)
+            health.calls += 1
+            health.consecutive_failures = 0
+            health.opened_at = None
+            health.probing = False
+            health.latency = (
+                latency
+                if health.latency is None
+                else _LATENCY_WEIGHT * latency + (1 - _LATENCY_WEIGHT) * health.latency
+            )
+
+    def record_failure(self, uid: str) -> None:
+        """Record a network failure and open the breaker past the threshold."""
+        with self._lock:
+            health = self._get(uid)
+            health.calls += 1
+            health.failures += 1
+            health.consecutive_failures += 1
+            health.probing = False
+            if (
+                health.opened_at is not None
+                or health.consecutive_failures >= self.failure_threshold
+            ):
+                health.opened_at = self._clock()
+
+    def snapshot(self) -> dict[str, dict[str, object]]:
+        """Return JSON-compatible statistics keyed by player UID."""
+        with self._lock:
+            return {
+                uid: {**asdict(health), "state": health.state}
+                for uid, health in self._speakers.items()
+            }
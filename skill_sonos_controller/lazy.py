@@ -0,0 +1,28 @@
+"""Deferred imports for modules only needed once the skill does work."""
+
+from __future__ import annotations
+
+from importlib import import_module
+from types import ModuleType
+from typing import Any
+
+
+class LazyModule:
+    """Stand in for a module and import it on first attribute access.
+
+    Exception classes named in ``except`` clauses are only looked up when an
+    exception reaches the clause, so importing the package to read its
+    metadata does not load the module.
+    """
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+        self._module: ModuleType | None = None
+
+    def __getattr__(self, attribute: str) -> Any:
+        if self._module is None:
+            self._module = import_module(self._name)
+        return getattr(self._module, attribute)
+
+    def __repr__(self) -> str:
+        return f"<lazy module {self._name!r}>"
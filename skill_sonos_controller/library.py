@@ -0,0 +1,91 @@
+"""Index of local audio files that Sonos has not indexed itself."""
+
+from __future__ import annotations
+
+import os
+import re
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+from time import monotonic
+
+AUDIO_SUFFIXES = frozenset(
+    {".aac", ".aif", ".aiff", ".flac", ".m4a", ".mp3", ".ogg", ".opus", ".wav"}
+)
+# Rescanning a music folder is cheap compared with a Sonos library update, but
+# not free. Searches reuse the index for a few minutes.
+_INDEX_TTL = 300.0
+_TRACK_NUMBER = re.compile(r"^\d{1,3}(?:\s*[-._]\s*|\s+)")
+
+
+@dataclass(frozen=True)
+class LocalTrack:
+    """One audio file with names inferred from its path.
+
+    Folders follow the common ``Artist/Album/NN Title.ext`` layout. A file
+    name such as ``Artist - Title.ext`` also provides the artist.
+    """
+
+    path: Path
+    title: str
+    artist: str | None = None
+    album: str | None = None
+
+    @classmethod
+    def from_path(cls, path: Path, root: Path) -> LocalTrack:
+        """Infer title, album, and artist from a file below ``root``."""
+        folders = path.relative_to(root).parent.parts
+        title = _TRACK_NUMBER.sub("", path.stem).strip() or path.stem
+        artist = folders[-2] if len(folders) >= 2 else None
+        album = folders[-1] if folders else None
+        if " - " in title:
+            named_artist, _, named_title = title.partition(" - ")
+            artist = artist or named_artist.strip()
+            title = named_title.strip()
+        return cls(path, title, artist, album)
+
+
+class LocalLibrary:
+    """Lazily rebuilt index of audio files below local folders."""
+
+    def __init__(
+        self,
+        directories: Iterable[str | os.PathLike[str]],
+        ttl: float = _INDEX_TTL,
+        clock: Callable[[], float] = monotonic,
+    ) -> None:
+        self.directories = tuple(
+            Path(directory).expanduser() for directory in directories
+        )
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = Lock()
+        self._tracks: tuple[LocalTrack, ...] = ()
+        self._indexed_at: float | None = None
+
+    def refresh(self) -> int:
+        """Rescan every folder and return the number of indexed files."""
+        tracks = []
+        for root in self.directories:
+            for folder, _subfolders, files in os.walk(root):
+                for name in files:
+                    path = Path(folder, name)
+                    if path.suffix.lower() in AUDIO_SUFFIXES:
+                        tracks.append(LocalTrack.from_path(path, root))
+        tracks.sort(key=lambda track: str(track.path).casefold())
+        with self._lock:
+            self._tracks = tuple(tracks)
+            self._indexed_at = self._clock()
+        return len(tracks)
+
+    def tracks(self) -> tuple[LocalTrack, ...]:
+        """Return indexed files in path order, rescanning a stale index."""
+        with self._lock:
+            stale = (
+                self._indexed_at is None or self._clock() - self._indexed_at >= self.ttl
+            )
+        if stale:
+            self.refresh()
+        with self._lock:
+            return self._tracks
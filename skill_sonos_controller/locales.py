@@ -0,0 +1,162 @@
+"""Per-language tables the skill builds from its locale resources."""
+
+from __future__ import annotations
+
+import sys
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from threading import Lock
+from time import monotonic
+from types import MappingProxyType
+from typing import Any
+
+from .templates import SlotEngine, TemplateIndex, locale_digest
+
+# Languages other than the configured one are dropped after an idle hour.
+_MAX_IDLE = 3600.0
+
+
+def spelling_alphabet(values: Mapping[str, str]) -> dict[str, str]:
+    """Index standard OVOS display/system values by the code character."""
+    return {
+        str(system_value).upper(): str(spoken_value)
+        for spoken_value, system_value in values.items()
+        if str(system_value).strip()
+    }
+
+
+@dataclass
+class _Language:
+    used_at: float
+    spelling: Mapping[str, str] | None = None
+    parser: SlotEngine | None = None
+    templates: int = 0
+    characters: int = 0
+    hits: dict[str, int] = field(default_factory=dict)
+
+
+class LocaleResources:
+    """Load spelling codes and intent templates lazily, once per language.
+
+    ``loader`` returns the OVOS resources of a language. Strings shared by
+    every language, such as intent and slot names, are interned, and loaded
+    tables are read-only so callers can share them. Languages idle for
+    longer than ``max_idle`` seconds are evicted on the next access, unless
+    they are pinned.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[str], Any],
+        intents: Iterable[str],
+        locale_dir: Path,
+        index: TemplateIndex | None = None,
+        max_idle: float = _MAX_IDLE,
+        clock: Callable[[], float] = monotonic,
+    ) -> None:
+        self._loader = loader
+        self._intents = tuple(sys.intern(name) for name in intents)
+        self._locale_dir = locale_dir
+        self.index = index or TemplateIndex()
+        self.max_idle = max_idle
+        self._pinned: frozenset[str] = frozenset()
+        self._clock = clock
+        self._lock = Lock()
+        self._languages: dict[str, _Language] = {}
+
+    def _language(self, lang: str) -> _Language:
+        """Return a language's entry and evict idle ones. Needs the lock."""
+        now = self._clock()
+        key = lang.casefold()
+        for other, entry in tuple(self._languages.items()):
+            if (
+                other != key
+                and other not in self._pinned
+                and now - entry.used_at > self.max_idle
+            ):
+                del self._languages[other]
+        entry = self._languages.setdefault(key, _Language(now))
+        entry.used_at = now
+        return entry
+
+    def spelling(self, lang: str) -> Mapping[str, str]:
+        """Return the spoken name of each link-code character."""
+        with self._lock:
+            entry = self._language(lang)
+            if entry.spelling is None:
+                values = self._loader(lang).load_named_value_file("codes") or {}
+                entry.spelling = MappingProxyType(
+                    {
+                        sys.intern(code): sys.intern(spoken)
+                        for code, spoken in spelling_alphabet(values).items()
+                    }
+                )
+            entry.hits["spelling"] = entry.hits.get("spelling", 0) + 1
+            return entry.spelling
+
+    def parser(self, lang: str) -> SlotEngine:
+        """Return the compiled slot engine for a language.
+
+        The engine is built without holding the lock, so an intent never
+        waits behind the low-priority warm-up thread. Callers that race on a
+        cold language each build one, and the first to finish is kept.
+        """
+        with self._lock:
+            entry = self._language(lang)
+            if entry.parser is not None:
+                entry.hits["parser"] = entry.hits.get("parser", 0) + 1
+                return entry.parser
+        templates = self.templates(lang)
+        parser = SlotEngine(templates)
+        with self._lock:
+            entry = self._language(lang)
+            if entry.parser is None:
+                entry.parser = parser
+                entry.templates = parser.size
+                entry.characters = sum(
+                    len(line) for lines in templates.values() for line in lines
+                )
+            entry.hits["parser"] = entry.hits.get("parser", 0) + 1
+            return entry.parser
+
+    def templates(self, lang: str) -> dict[str, tuple[str, ...]]:
+        """Return expanded intent templates, reusing them across restarts."""
+        digest = locale_digest(self._locale_dir / lang.casefold())
+        stored = self.index.load(lang, digest) if digest else None
+        if stored is None or set(stored) != set(self._intents):
+            resources = self._loader(lang)
+            stored = {
+                intent: resources.load_intent_file(intent) for intent in self._intents
+            }
+            if digest:
+                self.index.save(lang, digest, stored)
+        return {
+            sys.intern(intent): tuple(sys.intern(line) for line in lines)
+            for intent, lines in stored.items()
+        }
+
+    def pin(self, lang: str) -> None:
+        """Keep ``lang`` loaded however long it is idle, replacing earlier pins."""
+        with self._lock:
+            self._pinned = frozenset({lang.casefold()})
+
+    def evict(self, lang: str) -> bool:
+        """Drop a language's tables and return whether any were loaded."""
+        with self._lock:
+            return self._languages.pop(lang.casefold(), None) is not None
+
+    def stats(self) -> dict[str, Any]:
+        """Return JSON-compatible statistics of every loaded language."""
+        now = self._clock()
+        with self._lock:
+            return {
+                lang: {
+                    "idle": round(now - entry.used_at, 3),
+                    "spelling": len(entry.spelling or {}),
+                    "templates": entry.templates,
+                    "template_characters": entry.characters,
+                    "hits": dict(entry.hits),
+                }
+                for lang, entry in self._languages.items()
+            }
@@ -0,0 +1,230 @@
+"""A small LAN HTTP server that lets Sonos players fetch local audio files."""
+
+from __future__ import annotations
+
+import mimetypes
+import os
+import re
+import secrets
+import socket
+from functools import partial
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from threading import BoundedSemaphore, Lock, Thread
+from typing import Any
+from urllib.parse import urlsplit
+
+# Sonos players open a few range requests per clip. The caps keep a whole
+# household fetching at once from exhausting the skill's threads.
+_MAX_TRANSFERS = 8
+_MAX_CONNECTIONS = 16
+_TRANSFER_WAIT = 5.0
+# Idle keep-alive connections and stalled clients are closed after this.
+_CONNECTION_TIMEOUT = 30.0
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class MediaServer:
+    """Serve published files with range support and zero-copy transfer.
+
+    Only files passed to :meth:`url_for` are reachable, each under a random
+    name that is only known to the players it was sent to. Without a
+    ``host``, the server binds on first use to the address that routes to
+    the first player, not to every interface. It runs in one daemon thread
+    that spawns a thread per connection, up to ``max_connections``; further
+    connections are closed at once. File bodies are sent with
+    :func:`socket.sendfile`, so the kernel copies audio straight from the
+    page cache to the player.
+    """
+
+    def __init__(
+        self,
+        host: str | None = None,
+        port: int = 0,
+        max_transfers: int = _MAX_TRANSFERS,
+        max_connections: int = _MAX_CONNECTIONS,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self._transfers = BoundedSemaphore(max_transfers)
+        self._connections = BoundedSemaphore(max_connections)
+        self._server: _MediaHTTPServer | None = None
+        self._lock = Lock()
+        self._files: dict[str, Path] = {}
+        self._names: dict[Path, str] = {}
+
+    @property
+    def running(self) -> bool:
+        """Return whether the server is accepting requests."""
+        return self._server is not None
+
+    def start(self, remote: str = "127.0.0.1") -> None:
+        """Bind the listening socket and serve from a daemon thread.
+
+        Without a configured host, the socket binds to the local address on
+        the interface that routes to ``remote``.
+        """
+        with self._lock:
+            if self._server is not None:
+                return
+            if self.host is None:
+                self.host = local_address(remote)
+            handler = partial(_MediaRequestHandler, self)
+            server = _MediaHTTPServer((self.host, self.port), handler)
+            server.connections = self._connections
+            self.port = server.server_address[1]
+            self._server = server
+        Thread(target=server.serve_forever, name="sonos-media", daemon=True).start()
+
+    def stop(self) -> None:
+        """Stop serving and release the port."""
+        server, self._server = self._server, None
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+    def url_for(self, path: str | os.PathLike[str], remote: str) -> str:
+        """Publish ``path`` and return the URL a player at ``remote`` fetches.
+
+        A file keeps its name while the skill runs, so players can cache it.
+        """
+        path = Path(path).resolve()
+        with self._lock:
+            name = self._names.get(path)
+            if name is None:
+                name = f"{secrets.token_urlsafe(16)}{path.suffix.lower()}"
+                self._names[path] = name
+                self._files[name] = path
+        self.start(remote)
+        return f"http://{self.host}:{self.port}/{name}"
+
+    def resolve(self, url_path: str) -> Path | None:
+        """Return the published file for a request path, if it still exists."""
+        with self._lock:
+            path = self._files.get(urlsplit(url_path).path.lstrip("/"))
+        return path if path is not None and path.is_file() else None
+
+    def begin_transfer(self) -> bool:
+        """Reserve a transfer slot, waiting briefly for one to free up."""
+        return self._transfers.acquire(timeout=_TRANSFER_WAIT)
+
+    def end_transfer(self) -> None:
+        """Release a slot reserved by :meth:`begin_transfer`."""
+        self._transfers.release()
+
+
+def local_address(remote: str) -> str:
+    """Return this host's address on the interface that routes to ``remote``.
+
+    Connecting a UDP socket sends no packet; it only selects the route.
+    """
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as probe:
+        probe.connect((remote, 1400))
+        return str(probe.getsockname()[0])
+
+
+def parse_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """Return the inclusive byte range requested by a single-range header.
+
+    ``None`` means the whole file. An unsatisfiable range raises
+    :class:`ValueError`.
+    """
+    if not header:
+        return None
+    match = _RANGE.match(header.strip())
+    if match is None or match.group(0) == "bytes=-":
+        raise ValueError(header)
+    first, last = match.groups()
+    if not first:
+        start, end = max(0, size - int(last)), size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    if start > end or start >= size:
+        raise ValueError(header)
+    return start, end
+
+
+class _MediaHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    connections: BoundedSemaphore
+
+    def process_request(self, request: Any, client_address: Any) -> None:
+        if not self.connections.acquire(blocking=False):
+            self.shutdown_request(request)
+            return
+        try:
+            super().process_request(request, client_address)
+        except Exception:
+            self.connections.release()
+            raise
+
+    def process_request_thread(self, request: Any, client_address: Any) -> None:
+        # The slot is freed before the socket closes, so a client that sees
+        # the close can reconnect at once.
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.connections.release()
+            self.shutdown_request(request)
+
+
+class _MediaRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "SonosMedia/1.0"
+    timeout = _CONNECTION_TIMEOUT
+
+    def __init__(self, media: MediaServer, *args: Any) -> None:
+        self.media = media
+        super().__init__(*args)
+
+    def do_HEAD(self) -> None:
+        self._serve(body=False)
+
+    def do_GET(self) -> None:
+        self._serve(body=True)
+
+    def _serve(self, body: bool) -> None:
+        path = self.media.resolve(self.path)
+        if path is None:
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+        size = path.stat().st_size
+        try:
+            requested = parse_range(self.headers.get("Range"), size)
+        except ValueError:
+            self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+            self.send_header("Content-Range", f"bytes */{size}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if not self.media.begin_transfer():
+            self.send_error(HTTPStatus.SERVICE_UNAVAILABLE)
+            return
+        try:
+            start, end = requested or (0, size - 1)
+            length = max(0, end - start + 1)
+            self.send_response(
+                HTTPStatus.OK if requested is None else HTTPStatus.PARTIAL_CONTENT
+            )
+            content_type = mimetypes.guess_type(path.name)[0]
+            self.send_header("Content-Type", content_type or "application/octet-stream")
+            self.send_header("Content-Length", str(length))
+            self.send_header("Accept-Ranges", "bytes")
+            if requested is not None:
+                self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+            self.end_headers()
+            if body and length:
+                with path.open("rb") as handle:
+                    self.connection.sendfile(handle, start, length)
+        except (BrokenPipeError, ConnectionResetError):
+            # Players routinely drop a connection once they have buffered.
+            self.close_connection = True
+        finally:
+            self.media.end_transfer()
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Keep per-request access logs out of the OVOS log."""
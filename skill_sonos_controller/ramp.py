@@ -0,0 +1,143 @@
+"""Client-side volume ramps driven by one shared scheduler thread."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from concurrent.futures import Future, InvalidStateError
+from contextlib import suppress
+from dataclasses import dataclass, field
+from threading import Condition, Thread
+from time import monotonic
+from typing import Any
+
+# Sonos players accept roughly four volume changes per second without
+# queueing UPnP requests, which is also smooth enough for the ear.
+_STEP_INTERVAL = 0.25
+
+
+@dataclass
+class _Ramp:
+    apply: Callable[[float], Any]
+    started_at: float
+    duration: float
+    future: Future[bool] = field(default_factory=Future)
+    running: Future[Any] | None = None
+
+
+class RampScheduler:
+    """Advance every active ramp from a single daemon thread.
+
+    A ramp calls ``apply`` with its progress between 0 and 1 on each tick and
+    always ends with 1. Each ramp is keyed, usually by player UID; starting a
+    new ramp for a key replaces the previous one. When ``submit`` is given,
+    steps run on that executor and a ramp skips ticks while its previous step
+    is still in flight, so one slow player never delays the others.
+    """
+
+    def __init__(
+        self,
+        submit: Callable[..., Future[Any]] | None = None,
+        interval: float = _STEP_INTERVAL,
+        clock: Callable[[], float] = monotonic,
+    ) -> None:
+        self.interval = interval
+        self._submit = submit
+        self._clock = clock
+        self._condition = Condition()
+        self._ramps: dict[str, _Ramp] = {}
+        self._thread: Thread | None = None
+
+    def start(
+        self, key: str, apply: Callable[[float], Any], duration: float
+    ) -> Future[bool]:
+        """Schedule a ramp and return a future resolved when it finishes.
+
+        The future's result is ``True`` once the final step was applied and
+        ``False`` when the ramp was cancelled or replaced.
+        """
+        ramp = _Ramp(apply, self._clock(), max(0.0, float(duration)))
+        with self._condition:
+            previous = self._ramps.pop(key, None)
+            self._ramps[key] = ramp
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = Thread(target=self._run, name="sonos-ramps", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+        if previous is not None:
+            _resolve(previous.future, False)
+        return ramp.future
+
+    def cancel(self, *keys: str) -> None:
+        """Stop ramps without applying their remaining steps."""
+        with self._condition:
+            cancelled = [self._ramps.pop(key) for key in keys if key in self._ramps]
+        for ramp in cancelled:
+            _resolve(ramp.future, False)
+
+    def cancel_all(self) -> None:
+        """Stop every ramp, for example while the skill shuts down."""
+        with self._condition:
+            keys = tuple(self._ramps)
+        self.cancel(*keys)
+
+    def active(self) -> tuple[str, ...]:
+        """Return the keys of ramps that are still running."""
+        with self._condition:
+            return tuple(self._ramps)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                if not self._ramps:
+                    self._thread = None
+                    return
+                now = self._clock()
+                due = [
+                    (key, ramp)
+                    for key, ramp in self._ramps.items()
+                    if ramp.running is None or ramp.running.done()
+                ]
+            for key, ramp in due:
+                progress = (
+                    1.0
+                    if ramp.duration <= 0
+                    else min(1.0, (now - ramp.started_at) / ramp.duration)
+                )
+                self._step(key, ramp, progress)
+            with self._condition:
+                if self._ramps:
+                    self._condition.wait(self.interval)
+
+    def _step(self, key: str, ramp: _Ramp, progress: float) -> None:
+        final = progress >= 1.0
+        if final:
+            with self._condition:
+                if self._ramps.get(key) is not ramp:
+                    return
+                del self._ramps[key]
+        if self._submit is None:
+            self._apply(key, ramp, progress, final)
+        else:
+            ramp.running = self._submit(self._apply, key, ramp, progress, final)
+
+    def _apply(self, key: str, ramp: _Ramp, progress: float, final: bool) -> None:
+        if ramp.future.done():
+            return
+        try:
+            ramp.apply(progress)
+        except Exception as error:
+            # A failed step ends the ramp; the caller sees it on the future.
+            with self._condition:
+                if self._ramps.get(key) is ramp:
+                    del self._ramps[key]
+            with suppress(InvalidStateError):
+                ramp.future.set_exception(error)
+            return
+        if final:
+            _resolve(ramp.future, True)
+
+
+def _resolve(future: Future[bool], completed: bool) -> None:
+    """Settle a ramp future unless a concurrent step already did."""
+    with suppress(InvalidStateError):
+        future.set_result(completed)
@@ -0,0 +1,144 @@
+"""Named household presets of group layout, room levels, and sources."""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from threading import Lock
+from typing import Any
+
+from ovos_utils.log import LOG
+
+from .storage import atomic_write_json
+
+
+@dataclass(frozen=True)
+class RoomState:
+    """Restorable settings of one player.
+
+    ``coordinator`` is the UID of the group the room belongs to, and equals
+    ``uid`` for a standalone room or a group coordinator. Play mode and
+    source are only recorded for coordinators, which own them.
+    """
+
+    uid: str
+    name: str
+    coordinator: str
+    volume: int
+    mute: bool
+    play_mode: str | None = None
+    uri: str | None = None
+    metadata: str | None = None
+
+    @property
+    def is_coordinator(self) -> bool:
+        """Return whether the room leads its group or plays alone."""
+        return self.coordinator == self.uid
+
+
+@dataclass(frozen=True)
+class PlaybackState:
+    """A room's settings plus where its playback stood.
+
+    ``track`` is the 1-based queue position and ``position`` the elapsed time
+    as ``H:MM:SS``. Both are only recorded for queue playback, because radio
+    and line-in streams cannot be resumed at an offset.
+    """
+
+    room: RoomState
+    transport_state: str = "STOPPED"
+    track: int | None = None
+    position: str | None = None
+
+
+@dataclass(frozen=True)
+class Scene:
+    """A named snapshot of several rooms."""
+
+    name: str
+    rooms: tuple[RoomState, ...]
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-compatible representation."""
+        return {"name": self.name, "rooms": [asdict(room) for room in self.rooms]}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Scene:
+        """Rebuild a scene stored by :meth:`to_dict`."""
+        return cls(
+            str(data["name"]),
+            tuple(RoomState(**room) for room in data.get("rooms", ())),
+        )
+
+
+def _key(name: str) -> str:
+    return " ".join(name.casefold().split())
+
+
+class SceneStore:
+    """Persist scenes as one JSON document keyed by normalized name.
+
+    Without a path, scenes only live for the current process.
+    """
+
+    def __init__(self, path: str | os.PathLike[str] | None = None) -> None:
+        self.path = Path(path) if path is not None else None
+        self._lock = Lock()
+        self._scenes: dict[str, Scene] | None = None
+
+    def _load(self) -> dict[str, Scene]:
+        if self._scenes is None:
+            self._scenes = {}
+            if self.path is not None and self.path.exists():
+                try:
+                    data = json.loads(self.path.read_text(encoding="utf-8"))
+                    scenes = [Scene.from_dict(item) for item in data.get("scenes", ())]
+                except (
+                    OSError,
+                    ValueError,
+                    TypeError,
+                    AttributeError,
+                    KeyError,
+                ) as error:
+                    LOG.warning("Ignoring unreadable scenes %s: %s", self.path, error)
+                    scenes = []
+                self._scenes = {_key(scene.name): scene for scene in scenes}
+        return self._scenes
+
+    def _write(self) -> None:
+        if self.path is None or self._scenes is None:
+            return
+        atomic_write_json(
+            self.path,
+            {"scenes": [scene.to_dict() for scene in self._scenes.values()]},
+        )
+
+    def save(self, scene: Scene) -> None:
+        """Store or overwrite a scene."""
+        with self._lock:
+            self._load()[_key(scene.name)] = scene
+            self._write()
+
+    def get(self, name: str) -> Scene | None:
+        """Return a scene by spoken or stored name."""
+        with self._lock:
+            return self._load().get(_key(name))
+
+    def delete(self, name: str) -> bool:
+        """Remove a scene and return whether it existed."""
+        with self._lock:
+            removed = self._load().pop(_key(name), None)
+            if removed is not None:
+                self._write()
+            return removed is not None
+
+    def names(self) -> tuple[str, ...]:
+        """Return stored scene names in display order."""
+        with self._lock:
+            return tuple(
+                sorted(
+                    (scene.name for scene in self._load().values()), key=str.casefold
+                )
+            )
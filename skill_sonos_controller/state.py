@@ -0,0 +1,118 @@
+"""Last-known player state fed by UPnP events and the controller's writes."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping
+from threading import Lock
+from typing import Any
+
+# A grouped member plays its coordinator's stream through this URI scheme.
+_GROUP_URI_PREFIX = "x-rincon:"
+# Track fields copied from the DIDL metadata SoCo parses out of AVTransport.
+_TRACK_FIELDS = {
+    "title": "title",
+    "creator": "artist",
+    "album": "album",
+    "album_art_uri": "album_art",
+}
+
+StateListener = Callable[[str, dict[str, Any]], None]
+
+
+def values_from_event(variables: Mapping[str, Any]) -> dict[str, Any]:
+    """Extract cacheable values from a parsed RenderingControl/AVTransport event.
+
+    SoCo reports per-channel volume and mute maps. Only the ``Master`` channel
+    describes what a listener hears.
+    """
+    values: dict[str, Any] = {}
+    volume = variables.get("volume")
+    if isinstance(volume, Mapping) and "Master" in volume:
+        values["volume"] = int(volume["Master"])
+    mute = variables.get("mute")
+    if isinstance(mute, Mapping) and "Master" in mute:
+        values["mute"] = str(mute["Master"]) == "1"
+    if isinstance(variables.get("av_transport_uri"), str):
+        values["uri"] = variables["av_transport_uri"]
+    if variables.get("transport_state"):
+        values["transport_state"] = str(variables["transport_state"]).upper()
+    if variables.get("current_play_mode"):
+        values["play_mode"] = str(variables["current_play_mode"]).upper()
+    metadata = variables.get("current_track_meta_data")
+    if metadata is not None and not isinstance(metadata, str):
+        for attribute, key in _TRACK_FIELDS.items():
+            values[key] = getattr(metadata, attribute, None) or None
+    return values
+
+
+def coordinator_uid(uid: str, values: Mapping[str, Any]) -> str:
+    """Return the group coordinator implied by a player's cached source."""
+    uri = values.get("uri")
+    if isinstance(uri, str) and uri.startswith(_GROUP_URI_PREFIX):
+        return uri[len(_GROUP_URI_PREFIX) :] or uid
+    return uid
+
+
+class StateCache:
+    """Thread-safe per-player values confirmed by events or successful writes.
+
+    Listeners are called with a player's UID and the values that actually
+    changed, on the thread that stored them and outside the cache lock.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._rooms: dict[str, dict[str, Any]] = {}
+        self._listeners: list[StateListener] = []
+
+    def add_listener(self, listener: StateListener) -> None:
+        """Call ``listener`` whenever a stored value changes."""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: StateListener) -> None:
+        """Stop notifying a listener added by :meth:`add_listener`."""
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def update(self, uid: str, **values: Any) -> None:
+        """Store confirmed values for one player."""
+        if not values:
+            return
+        with self._lock:
+            room = self._rooms.setdefault(uid, {})
+            changed = {
+                key: value
+                for key, value in values.items()
+                if key not in room or room[key] != value
+            }
+            room.update(values)
+            listeners = tuple(self._listeners) if changed else ()
+        for listener in listeners:
+            listener(uid, changed)
+
+    def get(self, uid: str, key: str, default: Any = None) -> Any:
+        """Return one cached value, or ``default`` when it is unknown."""
+        with self._lock:
+            return self._rooms.get(uid, {}).get(key, default)
+
+    def discard(self, uid: str, key: str) -> None:
+        """Drop one value that a write made stale until the next event."""
+        with self._lock:
+            self._rooms.get(uid, {}).pop(key, None)
+
+    def forget(self, uid: str) -> None:
+        """Drop a player whose event subscription can no longer be trusted."""
+        with self._lock:
+            self._rooms.pop(uid, None)
+
+    def room(self, uid: str) -> dict[str, Any]:
+        """Return a copy of one player's cached values."""
+        with self._lock:
+            return dict(self._rooms.get(uid, {}))
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Return a copy of every cached player, keyed by UID."""
+        with self._lock:
+            return {uid: dict(values) for uid, values in self._rooms.items()}
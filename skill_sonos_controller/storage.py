@@ -0,0 +1,31 @@
+"""JSON documents that the skill keeps between restarts."""
+
+from __future__ import annotations
+
+import json
+import os
+from contextlib import suppress
+from pathlib import Path
+from tempfile import mkstemp
+from typing import Any
+
+
+def atomic_write_json(path: Path, payload: Any, indent: int | None = 2) -> None:
+    """Replace ``path`` with ``payload`` so readers never see partial JSON.
+
+    The document is written to a temporary file next to ``path`` and moved
+    into place. If serializing or moving fails, the temporary file is
+    removed and the previous document is left untouched.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    descriptor, temporary = mkstemp(
+        prefix=f".{path.name}.", suffix=".tmp", dir=path.parent
+    )
+    try:
+        with open(descriptor, "w", encoding="utf-8") as handle:
+            json.dump(payload, handle, indent=indent)
+        os.replace(temporary, path)
+    except BaseException:
+        with suppress(FileNotFoundError):
+            os.unlink(temporary)
+        raise
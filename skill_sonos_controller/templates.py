@@ -0,0 +1,176 @@
+"""Expanded intent templates reused across restarts while locales are unchanged."""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from hashlib import sha256
+from pathlib import Path
+from threading import Lock
+
+from .storage import atomic_write_json
+
+# Bump when the stored layout or the expansion it records changes.
+_INDEX_VERSION = "1"
+_SLOT = re.compile(r"\{(\w+)\}|\*")
+
+
+def compile_template(template: str) -> re.Pattern[str]:
+    """Return an anchored, case-insensitive pattern for one expanded template.
+
+    ``{slot}`` captures at least one character and ``*`` anything. Runs of
+    spaces, which optional template parts leave behind, match any
+    whitespace.
+    """
+    tokens = []
+    for word in template.split():
+        parts: list[str] = []
+        position = 0
+        for match in _SLOT.finditer(word):
+            parts.append(re.escape(word[position : match.start()]))
+            name = match.group(1)
+            parts.append(f"(?P<{name}>.+?)" if name else ".*")
+            position = match.end()
+        parts.append(re.escape(word[position:]))
+        tokens.append("".join(parts))
+    return re.compile(r"\s+".join(tokens), re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class _Template:
+    intent: str
+    pattern: re.Pattern[str]
+    # Literal characters outside slots; more means a more specific template.
+    weight: int
+
+
+@dataclass
+class _Node:
+    children: dict[str, _Node] = field(default_factory=dict)
+    templates: list[_Template] = field(default_factory=list)
+
+
+class SlotEngine:
+    """Classify and extract slots for one language's expanded templates.
+
+    Templates are compiled once into anchored patterns and indexed in a trie
+    of their leading literal words. Matching walks the trie along the
+    utterance, so only templates whose literal prefix is present are tried,
+    most specific first. Templates that start with a slot hang off the root
+    and are always tried.
+    """
+
+    def __init__(self, templates: Mapping[str, Iterable[str]]) -> None:
+        self._root = _Node()
+        self.size = 0
+        for intent, lines in templates.items():
+            for line in sorted(set(lines)):
+                try:
+                    pattern = compile_template(line)
+                except re.error:
+                    # A template repeating a slot name cannot be captured.
+                    continue
+                node = self._root
+                for word in line.casefold().split():
+                    if _SLOT.search(word):
+                        break
+                    node = node.children.setdefault(word, _Node())
+                weight = len(_SLOT.sub("", line).replace(" ", ""))
+                node.templates.append(_Template(intent, pattern, weight))
+                self.size += 1
+
+    def match(
+        self, utterance: str, intent: str | None = None
+    ) -> tuple[str, dict[str, str]] | None:
+        """Return the best matching intent and its slots.
+
+        With ``intent``, only that intent's templates are considered.
+        """
+        text = " ".join(utterance.split())
+        candidates = list(self._root.templates)
+        node = self._root
+        for word in text.casefold().split():
+            next_node = node.children.get(word)
+            if next_node is None:
+                break
+            node = next_node
+            candidates.extend(node.templates)
+        candidates.sort(key=lambda template: template.weight, reverse=True)
+        for template in candidates:
+            if intent is not None and template.intent != intent:
+                continue
+            found = template.pattern.fullmatch(text)
+            if found is not None:
+                slots = {
+                    name: value.strip() for name, value in found.groupdict().items()
+                }
+                return template.intent, slots
+        return None
+
+
+def locale_digest(locale_dir: Path) -> str | None:
+    """Return a digest of a language's intent files, or ``None`` without any."""
+    files = sorted(locale_dir.rglob("*.intent")) if locale_dir.is_dir() else []
+    if not files:
+        return None
+    digest = sha256(_INDEX_VERSION.encode("ascii"))
+    for path in files:
+        digest.update(path.relative_to(locale_dir).as_posix().encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(path.read_bytes())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class TemplateIndex:
+    """Store expanded intent templates as one JSON document per language.
+
+    An entry is only returned for the digest it was saved with, so edited or
+    updated locale files are expanded again. Without a directory, nothing is
+    stored.
+    """
+
+    def __init__(self, directory: str | os.PathLike[str] | None = None) -> None:
+        self.directory = Path(directory) if directory is not None else None
+        self._lock = Lock()
+
+    def _path(self, lang: str) -> Path | None:
+        if self.directory is None:
+            return None
+        return self.directory / f"{lang.casefold()}.json"
+
+    def load(self, lang: str, digest: str) -> dict[str, list[str]] | None:
+        """Return the templates stored for ``lang`` if they match ``digest``.
+
+        An unreadable or malformed entry is treated as a miss, so the
+        templates are expanded again and the entry is replaced.
+        """
+        path = self._path(lang)
+        if path is None or not path.exists():
+            return None
+        with self._lock:
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                return None
+        if not isinstance(data, dict) or data.get("digest") != digest:
+            return None
+        intents = data.get("intents")
+        if not isinstance(intents, dict) or not all(
+            isinstance(lines, list) for lines in intents.values()
+        ):
+            return None
+        return {
+            str(name): [str(line) for line in lines] for name, lines in intents.items()
+        }
+
+    def save(self, lang: str, digest: str, intents: dict[str, list[str]]) -> None:
+        """Replace the stored templates for ``lang``."""
+        path = self._path(lang)
+        if path is None:
+            return
+        with self._lock:
+            atomic_write_json(path, {"digest": digest, "intents": intents}, indent=None)
@@ -0,0 +1,90 @@
+"""Background preparation of caches that the first commands would build."""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Callable, Iterable
+from contextlib import suppress
+from threading import Event, Lock, Thread, get_native_id
+from time import monotonic
+from typing import Any
+
+# Added to the worker thread's nice value so warm-up never competes with
+# intent handling for the CPU.
+_NICENESS = 10
+
+
+class WarmUp:
+    """Run named stages once, in order, on a low-priority daemon thread.
+
+    Stages take no arguments and handle their own expected failures.
+    ``cancel`` stops the pipeline before its next stage; a stage that is
+    already running finishes, but its caches stay valid.
+    """
+
+    def __init__(
+        self,
+        stages: Iterable[tuple[str, Callable[[], Any]]],
+        niceness: int = _NICENESS,
+        clock: Callable[[], float] = monotonic,
+    ) -> None:
+        self.stages = tuple(stages)
+        self.niceness = niceness
+        self._clock = clock
+        self._cancelled = Event()
+        self._lock = Lock()
+        self._timings: dict[str, float] = {}
+        self._state = "pending"
+        self._thread: Thread | None = None
+
+    def start(self) -> None:
+        """Start the pipeline unless it was started or cancelled already."""
+        with self._lock:
+            if self._thread is not None or self._cancelled.is_set():
+                return
+            self._thread = Thread(target=self._work, name="sonos-warm-up", daemon=True)
+        self._thread.start()
+
+    def _work(self) -> None:
+        if self.niceness:
+            # Linux applies nice values per thread; elsewhere the call is
+            # missing or denied and the pipeline runs at normal priority.
+            with suppress(AttributeError, OSError):
+                priority = os.getpriority(os.PRIO_PROCESS, get_native_id())
+                os.setpriority(
+                    os.PRIO_PROCESS, get_native_id(), priority + self.niceness
+                )
+        self.run()
+
+    def run(self) -> None:
+        """Run every remaining stage in the calling thread."""
+        with self._lock:
+            self._state = "running"
+        for name, stage in self.stages:
+            if self._cancelled.is_set():
+                break
+            started_at = self._clock()
+            stage()
+            with self._lock:
+                self._timings[name] = round(self._clock() - started_at, 3)
+        with self._lock:
+            self._state = "cancelled" if self._cancelled.is_set() else "done"
+
+    def cancel(self, timeout: float | None = None) -> None:
+        """Skip the remaining stages and wait up to ``timeout`` for the worker."""
+        self._cancelled.set()
+        with self._lock:
+            thread = self._thread
+            if thread is None:
+                self._state = "cancelled"
+        if thread is not None and timeout is not None:
+            thread.join(timeout)
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def stats(self) -> dict[str, Any]:
+        """Return the pipeline state and the seconds each finished stage took."""
+        with self._lock:
+            return {"state": self._state, "stages": dict(self._timings)}
@@ -109,7 +109,7 @@ class OfflineSonosController:
 
     calls: ClassVar[list[tuple[str, tuple[Any, ...], dict[str, Any]]]] = []
 
-    def __init__(self) -> None:
+    def __init__(self, **_kwargs: Any) -> None:
         self.speakers = (OfflineSpeaker(),)
         self.registry = SimpleNamespace(
             household_services=(SimpleNamespace(name="Music Library"),)
@@ -141,36 +141,40 @@ class OfflineSonosController:
     ) -> None:
         self.record("complete_authentication", service, code, device_id)
 
-    def change_volume(self, delta: int, speaker: str | None = None) -> int:
+    def change_volume(
+        self, delta: int, speaker: str | None = None, deadline: Any = None
+    ) -> int:
         self.record("change_volume", delta, speaker)
         return 1
 
-    def coordinators(self, state: str | None = None) -> tuple[OfflineSpeaker, ...]:
+    def coordinators(
+        self, state: str | None = None, deadline: Any = None
+    ) -> tuple[OfflineSpeaker, ...]:
         self.record("coordinators", state)
         return self.speakers
 
-    def duck(self, amount: int) -> None:
+    def duck(self, amount: int, deadline: Any = None) -> None:
         self.record("duck", amount)
 
-    def group_all(self, coordinator: str) -> int:
+    def group_all(self, coordinator: str, deadline: Any = None) -> int:
         self.record("group_all", coordinator)
         return 1
 
-    def group_speakers(self, coordinator: str, members) -> int:
+    def group_speakers(self, coordinator: str, members, deadline: Any = None) -> int:
         self.record("group_speakers", coordinator, tuple(members))
         return 1
 
     def resolve_speaker(
-        self, speaker: str | None, coordinator: bool = True
+        self, speaker: str | None, coordinator: bool = True, deadline: Any = None
     ) -> OfflineSpeaker:
         self.record("resolve_speaker", speaker, coordinator)
         return self.speakers[0]
 
-    def run_command(self, **kwargs: Any) -> int:
+    def run_command(self, deadline: Any = None, **kwargs: Any) -> int:
         self.record("run_command", **kwargs)
         return 1
 
-    def search_and_play(self, **kwargs: Any) -> PlaybackResult:
+    def search_and_play(self, deadline: Any = None, **kwargs: Any) -> PlaybackResult:
         self.record("search_and_play", **kwargs)
         return PlaybackResult(
             title=str(kwargs["query"]),
@@ -180,25 +184,35 @@ class OfflineSonosController:
             artist=kwargs.get("artist"),
         )
 
-    def set_home_theater_option(self, option: str, enabled: bool, speaker: str) -> int:
+    def set_home_theater_option(
+        self, option: str, enabled: bool, speaker: str, deadline: Any = None
+    ) -> int:
         self.record("set_home_theater_option", option, enabled, speaker)
         return 1
 
-    def set_mute(self, muted: bool, speaker: str | None = None) -> int:
+    def set_mute(
+        self, muted: bool, speaker: str | None = None, deadline: Any = None
+    ) -> int:
         self.record("set_mute", muted, speaker)
         return 1
 
     def set_playback_option(
-        self, option: str, enabled: bool, speaker: str | None = None
+        self,
+        option: str,
+        enabled: bool,
+        speaker: str | None = None,
+        deadline: Any = None,
     ) -> int:
         self.record("set_playback_option", option, enabled, speaker)
         return 1
 
-    def set_volume(self, level: int, speaker: str | None = None) -> int:
+    def set_volume(
+        self, level: int, speaker: str | None = None, deadline: Any = None
+    ) -> int:
         self.record("set_volume", level, speaker)
         return 1
 
-    def switch_to_tv(self, speaker: str) -> int:
+    def switch_to_tv(self, speaker: str, deadline: Any = None) -> int:
         self.record("switch_to_tv", speaker)
         return 1
 
@@ -206,13 +220,16 @@ class OfflineSonosController:
         self.record("transport_state")
         return "PLAYING"
 
-    def ungroup_speaker(self, speaker: str) -> int:
+    def ungroup_speaker(self, speaker: str, deadline: Any = None) -> int:
         self.record("ungroup_speaker", speaker)
         return 1
 
-    def unduck(self) -> None:
+    def unduck(self, deadline: Any = None) -> None:
         self.record("unduck")
 
+    def close(self) -> None:
+        pass
+
 
 EXPECTED_CONTROLLER_CALL = {
     "sonos.album.intent": "search_and_play",
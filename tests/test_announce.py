@@ -0,0 +1,53 @@
+"""Unit tests for cached announcement rendering."""
+
+import pytest
+
+from skill_sonos_controller.announce import AnnouncementCache, clip_path
+
+
+def test_each_phrase_is_rendered_once_per_voice(tmp_path):
+    rendered = []
+
+    def synthesize(text, lang, target):
+        rendered.append((text, lang))
+        path = target.with_suffix(".wav")
+        path.write_bytes(b"RIFF")
+        return path
+
+    cache = AnnouncementCache(tmp_path, synthesize, max_entries=2)
+    first = cache.path_for("Dinner is ready", "en-US", "piper")
+
+    assert cache.path_for("Dinner  is ready", "en-us", "piper") == first
+    assert cache.path_for("Dinner is ready", "en-US", "other") != first
+    assert rendered == [("Dinner is ready", "en-US"), ("Dinner is ready", "en-US")]
+
+    cache.path_for("Doorbell", "en-US", "piper")
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+def test_only_audio_files_below_the_clip_folders_are_published(tmp_path):
+    clips = tmp_path / "clips"
+    announcements = tmp_path / "announcements"
+    clips.mkdir()
+    announcements.mkdir()
+    (clips / "doorbell.mp3").write_bytes(b"ID3")
+    (announcements / "rendered.wav").write_bytes(b"RIFF")
+    (tmp_path / "secret.mp3").write_bytes(b"ID3")
+    (clips / "notes.txt").write_text("not audio")
+    (clips / "escape.mp3").symlink_to(tmp_path / "secret.mp3")
+    roots = (clips, announcements)
+
+    assert clip_path("doorbell.mp3", roots) == (clips / "doorbell.mp3").resolve()
+    assert clip_path(str(announcements / "rendered.wav"), roots).name == "rendered.wav"
+    for rejected in (
+        "../secret.mp3",
+        str(tmp_path / "secret.mp3"),
+        "escape.mp3",
+        "notes.txt",
+        "missing.mp3",
+        "~/.ssh/id_rsa",
+    ):
+        with pytest.raises(ValueError):
+            clip_path(rejected, roots)
+    with pytest.raises(ValueError):
+        clip_path("doorbell.mp3", ())
@@ -0,0 +1,46 @@
+"""Unit tests for relative-volume coalescing."""
+
+import threading
+
+from skill_sonos_controller.coalesce import DeltaCoalescer
+
+
+def test_changes_sent_while_one_is_in_flight_share_a_request():
+    coalescer = DeltaCoalescer()
+    started = threading.Event()
+    release = threading.Event()
+    sent = []
+
+    def send(delta):
+        sent.append(delta)
+        if len(sent) == 1:
+            started.set()
+            release.wait(2)
+        return sum(sent)
+
+    results = []
+    leader = threading.Thread(
+        target=lambda: results.append(coalescer.submit("kitchen", 5, send))
+    )
+    leader.start()
+    assert started.wait(2)
+    followers = [
+        threading.Thread(
+            target=lambda: results.append(coalescer.submit("kitchen", 5, send))
+        )
+        for _ in range(2)
+    ]
+    for follower in followers:
+        follower.start()
+    for _ in range(200):
+        pending = coalescer._queues["kitchen"].pending
+        if pending is not None and pending.delta == 10:
+            break
+        threading.Event().wait(0.01)
+    release.set()
+    for thread in (leader, *followers):
+        thread.join(2)
+
+    assert sent == [5, 10]
+    assert sorted(results) == [5, 15, 15]
+    assert coalescer._queues == {}
@@ -1,24 +1,37 @@
 """Unit tests for the hardware-independent Sonos integration layer."""
 
+import threading
+import time
 from types import SimpleNamespace
 from typing import ClassVar
 
 import pytest
 from soco.exceptions import MusicServiceAuthException, SoCoUPnPException
 
+from skill_sonos_controller import batch
 from skill_sonos_controller.constants import MUSIC_LIBRARY
 from skill_sonos_controller.controller import (
+    NowPlaying,
     ServiceRegistry,
     SonosController,
     normalize_name,
 )
+from skill_sonos_controller.deadline import Deadline
+from skill_sonos_controller.discovery import DiscoveryHistory, DiscoveryRun, Responder
 from skill_sonos_controller.exceptions import (
     AmbiguousSpeakerError,
     AuthenticationNotSupportedError,
     CategoryNotSupportedError,
+    DeadlineExceededError,
+    FeatureNotSupportedError,
     NoResultsError,
     ServiceNotFoundError,
+    SpeakerNotFoundError,
+    SpeakerUnavailableError,
 )
+from skill_sonos_controller.hardware import SpeakerInfoStore
+from skill_sonos_controller.health import HealthTracker
+from skill_sonos_controller.library import LocalLibrary
 
 SERVICES = {
     "Amazon Music": {"ServiceType": "1", "Auth": "DeviceLink"},
@@ -149,6 +162,16 @@ class FakeDevice:
         self.queue_error = None
         self.state = state
         self.group = SimpleNamespace(members=[self], coordinator=self)
+        self.model_name = "Sonos Arc"
+        self._boot_seqnum = "7"
+
+    @property
+    def boot_seqnum(self):
+        return int(self._boot_seqnum)
+
+    def get_speaker_info(self, refresh=False):
+        self.calls.append("get_speaker_info")
+        return {"model_name": self.model_name, "software_version": "81.1"}
 
     def get_current_transport_info(self):
         return {"current_transport_state": self.state}
@@ -311,6 +334,143 @@ def test_speaker_resolution_supports_non_latin_room_names(room_name):
     assert controller.resolve_speaker(room_name, coordinator=False) is device
 
 
+def streaming_controller(responders, players, history=None, searches=None):
+    def searcher(timeout, quiet_period):
+        if searches is not None:
+            searches.append((timeout, quiet_period))
+        for responder in responders:
+            if searches is not None:
+                searches.append(responder.uid)
+            yield responder
+
+    return SonosController(
+        searcher=searcher,
+        player_factory=players.__getitem__,
+        music_service_cls=FakeMusicService,
+        music_library_cls=FakeLibrary,
+        account_cls=FakeAccount,
+        discovery_history=history,
+    )
+
+
+def test_discovery_reports_rooms_as_players_answer():
+    kitchen = FakeDevice("Kitchen", uid="RINCON_K")
+    office = FakeDevice("Office", uid="RINCON_O")
+    satellite = FakeDevice("Kitchen Sub", uid="RINCON_S")
+    garage = FakeDevice("Garage", uid="RINCON_G")
+    kitchen.visible_zones = (office, kitchen)
+    kitchen.all_zones = (office, kitchen, satellite)
+    # A player that just joined is missing from the first topology read.
+    garage.visible_zones = (garage, kitchen, office)
+    garage.all_zones = garage.visible_zones
+    controller = streaming_controller(
+        [
+            Responder("10.0.0.2", "RINCON_K"),
+            Responder("10.0.0.3", "RINCON_O"),
+            Responder("10.0.0.4", "RINCON_S"),
+            Responder("10.0.0.5", "RINCON_G"),
+        ],
+        {"10.0.0.2": kitchen, "10.0.0.5": garage},
+    )
+    found = []
+
+    def on_found(room):
+        found.append((room.player_name, len(controller.speakers)))
+
+    speakers = controller.refresh(on_found=on_found)
+
+    assert found == [("Kitchen", 2), ("Office", 2), ("Garage", 3)]
+    assert [room.player_name for room in speakers] == ["Garage", "Kitchen", "Office"]
+
+
+def test_discovery_skips_players_that_cannot_be_read():
+    class Unreachable(FakeDevice):
+        @property
+        def visible_zones(self):
+            raise OSError("no route to host")
+
+    kitchen = FakeDevice("Kitchen", uid="RINCON_K")
+    kitchen.visible_zones = kitchen.all_zones = (kitchen,)
+    controller = streaming_controller(
+        [Responder("10.0.0.9", "RINCON_X"), Responder("10.0.0.2", "RINCON_K")],
+        {"10.0.0.9": Unreachable("Lost", uid="RINCON_X"), "10.0.0.2": kitchen},
+    )
+
+    assert controller.refresh() == (kitchen,)
+
+
+def test_rooms_missing_from_a_new_discovery_are_dropped_at_its_end():
+    kitchen = FakeDevice("Kitchen", uid="RINCON_K")
+    kitchen.visible_zones = kitchen.all_zones = (kitchen,)
+    controller = streaming_controller(
+        [Responder("10.0.0.2", "RINCON_K")], {"10.0.0.2": kitchen}
+    )
+    controller.speakers = (FakeDevice("Attic", uid="RINCON_A"),)
+    during = []
+
+    controller.refresh(
+        on_found=lambda _room: during.append(
+            [room.player_name for room in controller.speakers]
+        )
+    )
+
+    assert during == [["Attic", "Kitchen"]]
+    assert controller.speakers == (kitchen,)
+
+
+def test_discovery_stops_once_every_known_room_is_found():
+    kitchen = FakeDevice("Kitchen", uid="RINCON_K")
+    office = FakeDevice("Office", uid="RINCON_O")
+    kitchen.visible_zones = kitchen.all_zones = (kitchen, office)
+    history = DiscoveryHistory()
+    history.record(DiscoveryRun(1.0, 0.5, 2), {"RINCON_K", "RINCON_O"})
+    searches = []
+    controller = streaming_controller(
+        [Responder("10.0.0.2", "RINCON_K"), Responder("10.0.0.3", "RINCON_O")],
+        {"10.0.0.2": kitchen},
+        history,
+        searches,
+    )
+
+    controller.refresh()
+
+    assert searches == [(2, None), "RINCON_K"]
+    [_first, run] = controller.diagnostics()["discovery"]["runs"]
+    assert run["ended"] == "complete"
+    assert run["found"] == 2
+    assert run["missing"] == ()
+
+
+def test_discovery_keeps_listening_while_a_known_room_is_missing():
+    kitchen = FakeDevice("Kitchen", uid="RINCON_K")
+    kitchen.visible_zones = kitchen.all_zones = (kitchen,)
+    history = DiscoveryHistory()
+    history.record(DiscoveryRun(4.0, 3.5, 2), {"RINCON_K", "RINCON_O"})
+    searches = []
+    controller = streaming_controller(
+        [Responder("10.0.0.2", "RINCON_K")], {"10.0.0.2": kitchen}, history, searches
+    )
+
+    assert controller.refresh() == (kitchen,)
+
+    assert searches[0] == (7, None)
+    discovery = controller.diagnostics()["discovery"]
+    assert discovery["timeout"] == 5
+    assert discovery["expected"] == ["RINCON_K", "RINCON_O"]
+    assert discovery["misses"] == {"RINCON_O": 1}
+    assert discovery["runs"][-1]["missing"] == ("RINCON_O",)
+
+
+def test_first_discovery_ends_after_a_quiet_period():
+    searches = []
+    controller = streaming_controller([], {}, searches=searches)
+
+    assert controller.refresh() == ()
+
+    assert searches == [(5, 1.0)]
+    assert controller.diagnostics()["discovery"]["runs"][0]["found"] == 0
+
+
 def test_registry_lists_only_household_and_anonymous_services(device):
     class SpotifyAccount(FakeAccount):
         @classmethod
@@ -368,6 +528,47 @@ def test_household_proxy_search_can_work_without_a_local_soco_token(controller,
     assert device.queued == [result_item]
 
 
+def test_prepared_service_provider_is_reused_until_the_next_discovery(
+    controller, device
+):
+    FakeMusicService.categories["Spotify"] = ["albums", "tracks"]
+    FakeMusicService.results[("Spotify", "tracks", "Exact Song")] = [item("Exact Song")]
+
+    assert controller.prepare_service("spotify") == ("albums", "tracks")
+    controller.search_and_play("Spotify", "Living Room", "tracks", "Exact Song")
+
+    assert len(FakeMusicService.instances) == 1
+
+    controller.refresh()
+    controller.search_and_play("Spotify", "Living Room", "tracks", "Exact Song")
+
+    assert len(FakeMusicService.instances) == 2
+
+
+def test_preparing_the_music_library_reports_its_fixed_categories(controller):
+    categories = controller.prepare_service("Music Library")
+
+    assert "tracks" in categories
+    assert categories == tuple(sorted(categories))
+    assert FakeMusicService.instances == []
+
+
+def test_shared_provider_gets_a_fresh_smapi_timeout_per_search(controller):
+    FakeMusicService.results[("Spotify", "tracks", "Exact Song")] = [item("Exact Song")]
+    controller.prepare_service("Spotify")
+    [provider] = FakeMusicService.instances
+    provider.soap_client = SimpleNamespace(timeout=9)
+
+    controller.search_and_play(
+        "Spotify", "Living Room", "tracks", "Exact Song", deadline=Deadline(2)
+    )
+    narrowed = provider.soap_client.timeout
+    controller.search_and_play("Spotify", "Living Room", "tracks", "Exact Song")
+
+    assert narrowed <= 2
+    assert provider.soap_client.timeout == 9
+
+
 def test_real_smapi_auth_failure_is_translated_without_clearing_queue(
     controller, device
 ):
@@ -781,6 +982,114 @@ def test_home_theater_source_night_and_speech_controls(controller, device):
         controller.set_home_theater_option("unknown", True, "Living Room")
 
 
+def test_speaker_details_are_read_once_per_boot_and_gate_tv_features(tmp_path):
+    kitchen = FakeDevice("Kitchen")
+    kitchen.model_name = "Sonos:Era 100"
+    path = tmp_path / "speakers.json"
+    controller = SonosController(
+        discoverer=lambda **_kwargs: {kitchen}, hardware=SpeakerInfoStore(path)
+    )
+    controller.speakers = (kitchen,)
+
+    info = controller.speaker_info("Kitchen")
+    assert info.capabilities() == {
+        "home_theater": False,
+        "line_in": True,
+        "battery": False,
+        "trueplay": True,
+    }
+    with pytest.raises(FeatureNotSupportedError):
+        controller.switch_to_tv("Kitchen")
+    with pytest.raises(FeatureNotSupportedError):
+        controller.set_home_theater_option("night", True, "Kitchen")
+    assert kitchen.calls == ["get_speaker_info"]
+
+    restarted = SonosController(
+        discoverer=lambda **_kwargs: {kitchen}, hardware=SpeakerInfoStore(path)
+    )
+    restarted.speakers = (kitchen,)
+    assert restarted.speaker_info("Kitchen") == info
+    kitchen._boot_seqnum = "8"
+    assert restarted.speaker_info("Kitchen").boot_seq == "8"
+    assert kitchen.calls == ["get_speaker_info", "get_speaker_info"]
+
+
+def test_boot_sequence_checks_run_within_the_budget_and_skip_open_breakers():
+    class StalledTopologyDevice(FakeDevice):
+        @property
+        def boot_seqnum(self):
+            # SoCo polls the zone group topology once its cache expires.
+            time.sleep(1.0)
+            return int(self._boot_seqnum)
+
+    den = FakeDevice("Den")
+    den.model_name = "Sonos Arc"
+    bedroom = StalledTopologyDevice("Bedroom")
+    health = HealthTracker(failure_threshold=1, reset_timeout=3600)
+    controller = SonosController(health=health)
+    controller.speakers = (bedroom, den)
+    health.record_failure("Bedroom")
+
+    started = time.monotonic()
+    assert controller.switch_to_tv(None, deadline=Deadline(0.3)) == 1
+    assert time.monotonic() - started < 0.3
+
+    health.record_success("Bedroom", 0.0)
+    started = time.monotonic()
+    with pytest.raises(DeadlineExceededError):
+        controller.speaker_info("Bedroom", deadline=Deadline(0.3))
+    assert time.monotonic() - started < 0.8
+    controller.close()
+
+
+def test_tv_support_is_read_from_the_device_description(monkeypatch):
+    requested = []
+
+    def get(url, timeout):
+        requested.append(url)
+        return SimpleNamespace(
+            raise_for_status=lambda: None,
+            content=b"""<root xmlns="urn:schemas-upnp-org:device-1-0"><device>
+            <serviceList><service>
+            <serviceId>urn:upnp-org:serviceId:HTControl</serviceId>
+            </service></serviceList></device></root>""",
+        )
+
+    monkeypatch.setattr("skill_sonos_controller.controller.requests.get", get)
+    den = FakeDevice("Den")
+    den.model_name = "Sonos Unreleased Bar"
+    den.base_url = "http://10.0.0.5:1400"
+    controller = SonosController(discoverer=lambda **_kwargs: {den})
+    controller.speakers = (den,)
+
+    assert controller.switch_to_tv("Den") == 1
+    assert controller.speaker_info("Den").services == ("HTControl",)
+    assert requested == ["http://10.0.0.5:1400/xml/device_description.xml"]
+
+
+def test_tv_commands_route_to_the_home_theater_in_the_group():
+    living = FakeDevice("Living Room")
+    kitchen = FakeDevice("Kitchen")
+    kitchen.model_name = "Sonos Era 100"
+    office = FakeDevice("Office")
+    office.model_name = "Sonos Five"
+    group = SimpleNamespace(members=[living, kitchen], coordinator=living)
+    living.group = group
+    kitchen.group = group
+    controller = SonosController(discoverer=lambda **_kwargs: {living, kitchen, office})
+    controller.speakers = (kitchen, living, office)
+
+    assert controller.switch_to_tv("Kitchen") == 1
+    assert controller.set_home_theater_option("night", True, None) == 1
+
+    assert "switch_to_tv" in living.calls
+    assert living.night_mode is True
+    assert "switch_to_tv" not in kitchen.calls
+    with pytest.raises(FeatureNotSupportedError, match="Office"):
+        controller.switch_to_tv("Office")
+    assert office.calls == ["get_speaker_info"]
+
+
 def test_volume_is_clamped_and_duck_restores_exact_snapshot(device):
     device.volume = 95
     controller = SonosController(discoverer=lambda **_kwargs: {device})
@@ -792,3 +1101,769 @@ def test_volume_is_clamped_and_duck_restores_exact_snapshot(device):
     assert device.volume == 90
     controller.unduck()
     assert device.volume == 100
+
+
+class Subscription:
+    def __init__(self):
+        self.callback = None
+        self.auto_renew_fail = None
+        self.unsubscribed = False
+
+    def unsubscribe(self):
+        self.unsubscribed = True
+
+
+class EventDevice(FakeDevice):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.subscriptions = []
+        self.renderingControl = SimpleNamespace(subscribe=self.subscribe)
+        self.avTransport = SimpleNamespace(subscribe=self.subscribe)
+
+    def subscribe(self, auto_renew=False):
+        subscription = Subscription()
+        self.subscriptions.append(subscription)
+        return subscription
+
+    def emit(self, **variables):
+        for subscription in self.subscriptions:
+            subscription.callback(SimpleNamespace(variables=variables))
+
+
+def test_duck_uses_event_cached_volume_and_state():
+    class CountingDevice(EventDevice):
+        reads = 0
+
+        def get_current_transport_info(self):
+            CountingDevice.reads += 1
+            return super().get_current_transport_info()
+
+    device = CountingDevice(volume=40)
+    controller = SonosController(
+        discoverer=lambda **_kwargs: {device},
+        music_service_cls=FakeMusicService,
+        music_library_cls=FakeLibrary,
+        account_cls=FakeAccount,
+        events=True,
+    )
+    controller.refresh()
+    device.emit(volume={"Master": "35"}, transport_state="PLAYING")
+
+    assert controller.duck(10) == 1
+    assert CountingDevice.reads == 0
+    controller.unduck()
+    assert device.volume == 35
+
+    device.subscriptions[0].auto_renew_fail(OSError("renewal failed"))
+    assert controller.state.get(device.uid, "volume") is None
+    assert all(subscription.unsubscribed for subscription in device.subscriptions)
+    controller.close()
+
+
+def test_cached_rooms_report_event_state_without_querying_players():
+    leader = EventDevice("Kitchen", uid="RINCON_K")
+    member = EventDevice("Den", uid="RINCON_D")
+    plain = FakeDevice("Garage")
+    controller = SonosController(
+        discoverer=lambda **_kwargs: {leader, member, plain},
+        music_service_cls=FakeMusicService,
+        music_library_cls=FakeLibrary,
+        account_cls=FakeAccount,
+        events=True,
+    )
+    controller.refresh()
+    leader.emit(transport_state="PLAYING", volume={"Master": "30"})
+    member.emit(av_transport_uri="x-rincon:RINCON_K")
+
+    rooms = {room["name"]: room for room in controller.cached_rooms()}
+
+    assert rooms["Kitchen"] == {
+        "uid": "RINCON_K",
+        "name": "Kitchen",
+        "subscribed": True,
+        "coordinator": "RINCON_K",
+        "transport_state": "PLAYING",
+        "volume": 30,
+    }
+    assert rooms["Den"]["coordinator"] == "RINCON_K"
+    assert rooms["Garage"] == {"uid": "Garage", "name": "Garage", "subscribed": False}
+    assert controller.cached_room("missing") is None
+    controller.close()
+
+
+def test_now_playing_reads_coordinators_once_and_prefers_cached_tracks():
+    class TrackDevice(EventDevice):
+        ip_address = "10.0.0.2"
+        reads: ClassVar[list] = []
+
+        def get_current_transport_info(self):
+            TrackDevice.reads.append(("transport", self.player_name))
+            return super().get_current_transport_info()
+
+        def get_current_track_info(self):
+            TrackDevice.reads.append(("track", self.player_name))
+            return {"title": "Song", "artist": "", "position": "0:01:02"}
+
+    kitchen = TrackDevice("Kitchen")
+    den = TrackDevice("Den", state="STOPPED")
+    office = TrackDevice("Office")
+    del office.renderingControl
+    controller = SonosController(
+        discoverer=lambda **_kwargs: {kitchen, den, office},
+        music_service_cls=FakeMusicService,
+        music_library_cls=FakeLibrary,
+        account_cls=FakeAccount,
+        events=True,
+    )
+    controller.refresh()
+    kitchen.emit(
+        transport_state="PLAYING",
+        current_track_meta_data=SimpleNamespace(
+            title="Imagine", creator="John Lennon", album_art_uri="/getaa?u=1"
+        ),
+    )
+    TrackDevice.reads.clear()
+
+    assert controller.now_playing() == (
+        NowPlaying(
+            "Kitchen",
+            "Imagine",
+            "John Lennon",
+            album_art="http://10.0.0.2:1400/getaa?u=1",
+        ),
+        NowPlaying("Office", "Song", position="0:01:02"),
+    )
+    assert sorted(TrackDevice.reads) == [
+        ("track", "Office"),
+        ("transport", "Den"),
+        ("transport", "Office"),
+    ]
+    controller.close()
+
+
+def test_overlapping_duck_keeps_the_original_snapshot(device):
+    controller = SonosController(discoverer=lambda **_kwargs: {device})
+    controller.speakers = (device,)
+
+    controller.duck(10)
+    controller.duck(10)
+    assert device.volume == 30
+    assert controller.unduck() == 1
+    assert device.volume == 40
+    assert controller.unduck() == 0
+
+
+class GroupVolume:
+    def __init__(self, members, volume=40):
+        self.members = members
+        self.coordinator = members[0]
+        self.volume = volume
+        self.mute = False
+        self.calls = []
+
+    def set_relative_volume(self, delta):
+        self.calls.append(delta)
+        self.volume = max(0, min(100, self.volume + delta))
+        return self.volume
+
+
+def test_group_volume_mode_sends_one_command_per_playing_group():
+    coordinator = FakeDevice("Kitchen")
+    member = FakeDevice("Dining Room", state="STOPPED")
+    standalone = FakeDevice("Office")
+    group = GroupVolume([coordinator, member])
+    coordinator.group = member.group = group
+    controller = SonosController(group_volume=True)
+    controller.speakers = (coordinator, member, standalone)
+
+    assert controller.change_volume(-5) == 3
+    assert group.calls == [-5]
+    assert (coordinator.volume, member.volume, standalone.volume) == (40, 40, 35)
+
+    assert controller.duck(10) == 3
+    assert group.volume == 25
+    controller.unduck()
+    assert (group.volume, standalone.volume) == (35, 35)
+
+    controller.set_volume(20, "Dining Room")
+    assert (member.volume, group.volume) == (20, 35)
+
+
+def test_group_restore_during_a_duck_waits_for_its_snapshot():
+    coordinator = FakeDevice("Kitchen")
+    member = FakeDevice("Dining Room")
+    controller = SonosController(group_volume=True)
+    controller.speakers = (coordinator, member)
+    restores = []
+
+    class SlowGroup(GroupVolume):
+        def set_relative_volume(self, delta):
+            restore = threading.Thread(
+                target=lambda: restores.append(controller.unduck())
+            )
+            restore.start()
+            # The restore blocks on the room until the duck has finished.
+            restore.join(0.2)
+            self.thread = restore
+            return super().set_relative_volume(delta)
+
+    group = SlowGroup([coordinator, member])
+    coordinator.group = member.group = group
+
+    assert controller.duck(10) == 2
+    group.thread.join(2)
+
+    assert restores == [1]
+    assert group.volume == 40
+    controller.close()
+
+
+def test_restore_during_a_volume_read_waits_for_the_duck():
+    controller = SonosController()
+    restores = []
+
+    class SlowVolume(FakeDevice):
+        @property
+        def volume(self):
+            thread = getattr(self, "thread", None)
+            if thread is None:
+                self.thread = threading.Thread(
+                    target=lambda: restores.append(controller.unduck())
+                )
+                self.thread.start()
+                # The restore blocks on the room until the duck has finished.
+                self.thread.join(0.2)
+            return self._volume
+
+        @volume.setter
+        def volume(self, value):
+            self._volume = value
+
+    kitchen = SlowVolume("Kitchen")
+    controller.speakers = (kitchen,)
+
+    assert controller.duck(10) == 1
+    kitchen.thread.join(2)
+
+    assert restores == [1]
+    assert kitchen._volume == 40
+    assert controller._volume_snapshot == {}
+    controller.close()
+
+
+def test_ramp_volume_prefers_firmware_and_steps_on_a_schedule():
+    class RampingDevice(FakeDevice):
+        def ramp_to_volume(self, volume, ramp_type="SLEEP_TIMER_RAMP_TYPE"):
+            self.calls.append(("ramp_to_volume", volume))
+            return 1
+
+    firmware = RampingDevice("Kitchen")
+    stepped = FakeDevice("Office", volume=10)
+    controller = SonosController()
+    controller.speakers = (firmware, stepped)
+
+    assert controller.ramp_volume(30, "Kitchen") == 1
+    assert firmware.calls == [("ramp_to_volume", 30)]
+
+    controller.ramp_volume(30, "Office", duration=0.05)
+    deadline = time.monotonic() + 2
+    while stepped.volume != 30 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert stepped.volume == 30
+    assert not controller.ramps.active()
+    controller.close()
+
+
+def test_fade_out_pauses_the_group_and_restores_its_volume():
+    coordinator = FakeDevice("Kitchen", volume=30)
+    member = FakeDevice("Dining Room", volume=20)
+    group = SimpleNamespace(members=[coordinator, member], coordinator=coordinator)
+    coordinator.group = member.group = group
+    controller = SonosController()
+    controller.speakers = (coordinator, member)
+    paused = threading.Event()
+    coordinator.pause = paused.set
+
+    assert controller.fade_out(duration=0.05) == 1
+    assert paused.wait(2)
+    deadline = time.monotonic() + 2
+    while member.volume != 20 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert (coordinator.volume, member.volume) == (30, 20)
+    controller.close()
+
+
+def test_grouping_joins_concurrently_and_waits_for_one_topology_event():
+    subscription = Subscription()
+    barrier = threading.Barrier(3, timeout=2)
+
+    class JoiningDevice(FakeDevice):
+        def join(self, coordinator):
+            # Every join must be in flight at the same time to pass the barrier.
+            barrier.wait()
+            super().join(coordinator)
+            if len(coordinator.group.members) == 4:
+                subscription.callback(SimpleNamespace(variables={}))
+
+    rooms = [JoiningDevice(name) for name in ("Office", "Kitchen", "Den", "Library")]
+    rooms[0].zoneGroupTopology = SimpleNamespace(subscribe=lambda: subscription)
+    rooms[0].zone_group_state = SimpleNamespace(clear_cache=lambda: None)
+    controller = SonosController(events=True)
+    controller.speakers = tuple(rooms)
+
+    assert controller.group_all("Office", Deadline(2)) == 3
+    assert subscription.unsubscribed is True
+    assert controller.group_all("Office") == 0
+
+
+class SceneDevice(FakeDevice):
+    def __init__(self, *args, uri="", **kwargs):
+        super().__init__(*args, **kwargs)
+        self.uri = uri
+        self.avTransport = SimpleNamespace(
+            GetMediaInfo=lambda _args: {
+                "CurrentURI": self.uri,
+                "CurrentURIMetaData": "<DIDL-Lite/>",
+            }
+        )
+
+    def play_uri(self, uri="", meta="", title="", start=True):
+        self.calls.append(("play_uri", uri, start))
+        self.uri = uri
+
+
+def test_scene_restores_only_what_changed():
+    kitchen = SceneDevice("Kitchen", volume=30, uri="x-rincon-queue:kitchen#0")
+    den = SceneDevice("Den", volume=25)
+    office = SceneDevice("Office", volume=10, uri="x-rincon-mp3radio://radio")
+    den.join(kitchen)
+    controller = SonosController()
+    controller.speakers = (den, kitchen, office)
+
+    scene = controller.capture_scene("Party", ("Kitchen", "Den"))
+    assert [room.coordinator for room in scene.rooms] == ["Kitchen", "Kitchen"]
+    assert scene.rooms[0].uri == "x-rincon-queue:kitchen#0"
+
+    den.unjoin()
+    den.volume = 50
+    kitchen.uri = "x-rincon-mp3radio://other"
+    kitchen.calls.clear()
+    den.calls.clear()
+
+    assert controller.apply_scene(scene) == 2
+    assert den.group is kitchen.group
+    assert den.volume == 25
+    assert kitchen.calls == [("play_uri", "x-rincon-queue:kitchen#0", False)]
+    assert controller.apply_scene(scene) == 0
+    assert office.calls == []
+
+
+def test_scene_coordinator_leaves_its_group_before_members_join_it():
+    order = []
+
+    class OrderedDevice(SceneDevice):
+        def join(self, coordinator):
+            # Record whose group the join actually lands in.
+            leader = coordinator.group.coordinator.player_name
+            order.append((self.player_name, "join", leader))
+            super().join(coordinator)
+
+        def unjoin(self):
+            time.sleep(0.05)
+            order.append((self.player_name, "unjoin"))
+            super().unjoin()
+
+    kitchen = OrderedDevice("Kitchen")
+    den = OrderedDevice("Den")
+    office = OrderedDevice("Office")
+    den.join(kitchen)
+    office.join(kitchen)
+    controller = SonosController()
+    controller.speakers = (den, kitchen, office)
+    scene = controller.capture_scene("Party", ("Kitchen", "Den", "Office"))
+
+    kitchen.unjoin()
+    den.unjoin()
+    office.unjoin()
+    office.join(den)
+    kitchen.join(den)
+    order.clear()
+
+    assert controller.apply_scene(scene) == 3
+    assert order[0] == ("Kitchen", "unjoin")
+    assert sorted(order[1:]) == [
+        ("Den", "join", "Kitchen"),
+        ("Office", "join", "Kitchen"),
+    ]
+    assert den.group is kitchen.group is office.group
+    assert kitchen.group.coordinator is kitchen
+
+
+def test_playback_snapshot_resumes_the_queue_after_an_interruption():
+    class QueueDevice(SceneDevice):
+        def get_current_track_info(self):
+            return {"playlist_position": "3", "position": "0:01:15"}
+
+        def play_from_queue(self, index, start=True):
+            self.calls.append(("play_from_queue", index, start))
+            self.uri = "x-rincon-queue:kitchen#0"
+
+        def seek(self, position):
+            self.calls.append(("seek", position))
+
+        def play(self):
+            self.calls.append("play")
+            self.state = "PLAYING"
+
+    kitchen = QueueDevice("Kitchen", volume=30, uri="x-rincon-queue:kitchen#0")
+    controller = SonosController()
+    controller.speakers = (kitchen,)
+
+    [snapshot] = controller.capture_playback()
+    assert (snapshot.transport_state, snapshot.track) == ("PLAYING", 3)
+
+    kitchen.play_uri("http://announce/doorbell.mp3")
+    kitchen.volume = 60
+    kitchen.state = "STOPPED"
+    kitchen.calls.clear()
+
+    assert controller.restore_playback((snapshot,)) == 1
+    assert kitchen.volume == 30
+    assert kitchen.calls == [
+        ("play_from_queue", 2, False),
+        ("seek", "0:01:15"),
+        "play",
+    ]
+
+
+def test_announcement_plays_on_every_group_and_restores_playback():
+    class ClipDevice(SceneDevice):
+        def play_uri(self, uri="", meta="", title="", start=True):
+            super().play_uri(uri, meta, title, start)
+            self.state = "PLAYING" if start else "STOPPED"
+
+        def get_current_transport_info(self):
+            state = self.state
+            if self.uri.startswith("http://"):
+                # The clip ends right after it has been seen playing.
+                self.state = "STOPPED"
+            return {"current_transport_state": state}
+
+    kitchen = ClipDevice("Kitchen", volume=30, uri="x-rincon-mp3radio://radio")
+    kitchen.state = "STOPPED"
+    controller = SonosController()
+    controller.speakers = (kitchen,)
+
+    assert controller.announce("http://host/clip.wav", volume=50) == 1
+
+    assert kitchen.calls[0] == ("play_uri", "http://host/clip.wav", True)
+    assert kitchen.calls[-1] == ("play_uri", "x-rincon-mp3radio://radio", False)
+    assert kitchen.volume == 30
+    with pytest.raises(ValueError):
+        controller.announce("http://host/clip.wav", volume=101)
+
+
+def test_music_library_falls_back_to_unindexed_local_files(
+    controller, device, tmp_path
+):
+    album = tmp_path / "Miles Davis" / "Kind of Blue"
+    album.mkdir(parents=True)
+    for name in ("01 So What.flac", "02 Freddie Freeloader.flac"):
+        (album / name).write_bytes(b"fLaC")
+    controller.local_library = LocalLibrary((tmp_path,))
+    device.add_uri_to_queue = lambda uri: device.queued.append(uri)
+
+    try:
+        result = controller.search_and_play(
+            MUSIC_LIBRARY, "Living Room", "tracks", "freddie freeloader"
+        )
+        assert result.title == "Freddie Freeloader"
+        assert device.calls[-1][0] == "play_uri"
+        assert device.calls[-1][1].endswith(".flac")
+
+        controller.search_and_play(
+            MUSIC_LIBRARY, "Living Room", "albums", "kind of blue"
+        )
+        assert len(device.queued) == 2
+        assert device.calls[-1] == ("play_from_queue", 0)
+
+        with pytest.raises(NoResultsError):
+            controller.search_and_play(MUSIC_LIBRARY, "Living Room", "tracks", "giant")
+    finally:
+        controller.close()
+
+
+def test_deadline_returns_partial_household_result_without_waiting_for_stalls():
+    stalled = threading.Event()
+
+    class StalledDevice(FakeDevice):
+        def pause(self):
+            stalled.wait(5)
+
+    kitchen = FakeDevice("Kitchen")
+    office = StalledDevice("Office")
+    controller = SonosController(discoverer=lambda **_kwargs: {kitchen, office})
+    controller.speakers = (kitchen, office)
+    started = time.monotonic()
+
+    try:
+        assert controller.run_command("pause", deadline=Deadline(0.2)) == 1
+    finally:
+        stalled.set()
+
+    assert time.monotonic() - started < 2
+    assert kitchen.calls == ["pause"]
+
+
+def test_deadline_interrupts_a_stalled_search_with_a_timeout(
+    controller, device, monkeypatch
+):
+    stalled = threading.Event()
+    device.queued = ["currently playing"]
+
+    def search(_category, _query):
+        stalled.wait(5)
+        return [item("Exact Song")]
+
+    monkeypatch.setattr(FakeMusicService, "search", staticmethod(search))
+    try:
+        with pytest.raises(DeadlineExceededError):
+            controller.search_and_play(
+                "Spotify",
+                "Living Room",
+                "tracks",
+                "Exact Song",
+                deadline=Deadline(0.2),
+            )
+    finally:
+        stalled.set()
+
+    assert device.queued == ["currently playing"]
+
+
+def test_deadline_stops_container_browsing_without_a_false_no_results(
+    controller, device, monkeypatch
+):
+    now = [0.0]
+    bucket = item("Recent Episodes", can_play=False)
+    FakeMusicService.categories["TuneIn"] = ["shows"]
+    FakeMusicService.metadata[("TuneIn", bucket.id)] = [item("A New Episode")]
+
+    def search(_category, _query):
+        now[0] += 10
+        return [bucket]
+
+    monkeypatch.setattr(FakeMusicService, "search", staticmethod(search))
+    with pytest.raises(DeadlineExceededError):
+        controller.search_and_play(
+            "TuneIn",
+            "living room",
+            "podcasts",
+            "The Daily",
+            deadline=Deadline(5, clock=lambda: now[0]),
+        )
+
+    assert "clear_queue" not in device.calls
+
+
+def test_unplugged_speaker_is_skipped_once_its_breaker_opens():
+    class UnpluggedDevice(FakeDevice):
+        attempts = 0
+
+        def get_current_transport_info(self):
+            self.attempts += 1
+            raise OSError("host unreachable")
+
+    kitchen = FakeDevice("Kitchen")
+    bedroom = UnpluggedDevice("Bedroom")
+    health = HealthTracker(failure_threshold=2, reset_timeout=3600)
+    controller = SonosController(
+        discoverer=lambda **_kwargs: {kitchen, bedroom}, health=health
+    )
+    controller.speakers = (bedroom, kitchen)
+
+    for _attempt in range(2):
+        with pytest.raises(OSError):
+            controller.run_command("pause")
+    assert controller.run_command("pause") == 1
+
+    assert bedroom.attempts == 2
+    assert controller.diagnostics()["speakers"]["Bedroom"]["state"] == "open"
+    with pytest.raises(SpeakerUnavailableError):
+        controller.run_command("pause", speaker="Bedroom")
+
+
+class StalledGroupDevice(FakeDevice):
+    """A player whose topology read hangs like an unreachable host."""
+
+    stall = 1.0
+
+    @property
+    def group(self):
+        time.sleep(self.stall)
+        return self._group
+
+    @group.setter
+    def group(self, value):
+        self._group = value
+
+
+def test_topology_is_not_read_from_players_with_an_open_breaker():
+    kitchen = FakeDevice("Kitchen")
+    bedroom = StalledGroupDevice("Bedroom")
+    health = HealthTracker(failure_threshold=1, reset_timeout=3600)
+    controller = SonosController(health=health)
+    controller.speakers = (bedroom, kitchen)
+    health.record_failure("Bedroom")
+
+    started = time.monotonic()
+    assert controller.run_command("pause", deadline=Deadline(0.3)) == 1
+
+    assert time.monotonic() - started < 0.3
+    assert kitchen.calls == ["pause"]
+
+
+def test_a_stalled_topology_read_ends_with_the_command_budget():
+    kitchen = StalledGroupDevice("Kitchen")
+    controller = SonosController()
+    controller.speakers = (kitchen,)
+
+    started = time.monotonic()
+    with pytest.raises(DeadlineExceededError):
+        controller.run_command("pause", deadline=Deadline(0.3))
+
+    assert time.monotonic() - started < 0.8
+    assert controller.diagnostics()["speakers"]["Kitchen"]["consecutive_failures"] == 1
+    controller.close()
+
+
+def test_background_probe_closes_the_breaker_when_the_speaker_returns():
+    now = [0.0]
+    device = FakeDevice("Bedroom")
+    health = HealthTracker(failure_threshold=1, reset_timeout=30, clock=lambda: now[0])
+    controller = SonosController(discoverer=lambda **_kwargs: {device}, health=health)
+    controller.speakers = (device,)
+    health.record_failure("Bedroom")
+
+    with pytest.raises(SpeakerUnavailableError):
+        controller.set_volume(10, "Bedroom")
+    now[0] = 31
+    with pytest.raises(SpeakerUnavailableError):
+        controller.set_volume(10, "Bedroom")
+    controller._executor.shutdown(wait=True)
+
+    assert health.allow("Bedroom") is True
+
+
+def test_unknown_room_is_merged_from_one_topology_read_without_discovery():
+    class TopologyDevice(FakeDevice):
+        household: ClassVar[list] = []
+
+        def __init__(self, name):
+            super().__init__(name)
+            self.zone_group_state = SimpleNamespace(clear_cache=self.record_clear)
+
+        def record_clear(self):
+            self.calls.append("clear_cache")
+
+        @property
+        def visible_zones(self):
+            return set(self.household)
+
+    def discoverer(**_kwargs):
+        raise AssertionError("a known household must not be rediscovered")
+
+    office = TopologyDevice("Office")
+    den = TopologyDevice("Den")
+    TopologyDevice.household = [office, den]
+    controller = SonosController(discoverer=discoverer)
+    controller.speakers = (office,)
+
+    assert controller.resolve_speaker("den", coordinator=False) is den
+    assert controller.speakers == (den, office)
+    assert office.calls == ["clear_cache"]
+    with pytest.raises(SpeakerNotFoundError):
+        controller.resolve_speaker("garage")
+
+
+def test_batch_orders_shared_rooms_and_runs_disjoint_rooms_together():
+    kitchen = FakeDevice("Kitchen")
+    lounge = FakeDevice("Lounge")
+    office = FakeDevice("Office")
+    den = FakeDevice("Den")
+    controller = SonosController(
+        discoverer=lambda **_kwargs: {kitchen, lounge, office, den}
+    )
+    controller.speakers = (kitchen, lounge, office, den)
+    operations = [
+        {"op": "pause", "speaker": "Kitchen"},
+        {"op": "volume", "speaker": "Lounge", "level": 20},
+        {"op": "group", "coordinator": "Office", "members": ["Den"]},
+        {"op": "volume", "speaker": "Den", "delta": 5},
+        {"op": "play"},
+    ]
+
+    waves = [op.wave for op in batch.plan(controller, operations, Deadline(None))]
+
+    assert waves == [0, 0, 0, 1, 2]
+
+
+def test_batch_reports_each_operation_without_stopping_the_others():
+    kitchen = FakeDevice("Kitchen", state="STOPPED")
+    lounge = FakeDevice("Lounge")
+    controller = SonosController(discoverer=lambda **_kwargs: {kitchen, lounge})
+    controller.speakers = (kitchen, lounge)
+
+    results = controller.run_batch(
+        [
+            {"op": "pause", "speaker": "Kitchen"},
+            {"op": "volume", "speaker": "Lounge", "level": 20},
+            {"op": "mute", "speaker": "Garage"},
+            {"op": "crossfade", "speaker": "Lounge"},
+        ]
+    )
+
+    assert results[:2] == [
+        {"op": "pause", "ok": True, "result": 0},
+        {"op": "volume", "ok": True, "result": 1},
+    ]
+    assert [result["ok"] for result in results[2:]] == [False, False]
+    assert lounge.volume == 20
+    assert kitchen.calls == []
+
+
+def test_batch_play_without_a_speaker_only_resumes_paused_rooms():
+    stopped = FakeDevice("Kitchen", state="STOPPED")
+    paused = FakeDevice("Lounge", state="PAUSED_PLAYBACK")
+    controller = SonosController(discoverer=lambda **_kwargs: {stopped, paused})
+    controller.speakers = (stopped, paused)
+
+    assert controller.run_batch([{"op": "play"}]) == [
+        {"op": "play", "ok": True, "result": 1}
+    ]
+    assert stopped.calls == []
+    assert paused.calls == ["play"]
+    controller.close()
+
+
+def test_batch_rejects_malformed_values_per_operation():
+    lounge = FakeDevice("Lounge")
+    controller = SonosController(discoverer=lambda **_kwargs: {lounge})
+    controller.speakers = (lounge,)
+
+    results = controller.run_batch(
+        [
+            {"op": "volume", "speaker": "Lounge", "level": None},
+            {"op": "volume", "speaker": "Lounge", "delta": [5]},
+            {"op": "mute", "speaker": "Lounge", "muted": "false"},
+            {"op": "shuffle", "speaker": "Lounge", "enabled": 0},
+            {"op": "group", "coordinator": "Lounge", "members": "Den"},
+            {"op": "pause", "speaker": {"name": "Lounge"}},
+            {"op": "volume", "speaker": "Lounge", "level": "25"},
+        ]
+    )
+
+    assert [result["ok"] for result in results] == [False] * 6 + [True]
+    assert results[2]["error"] == "muted must be true or false"
+    assert (lounge.volume, lounge.mute) == (25, False)
+    controller.close()
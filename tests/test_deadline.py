@@ -0,0 +1,44 @@
+"""Unit tests for end-to-end command budgets."""
+
+import pytest
+
+from skill_sonos_controller.deadline import Deadline
+from skill_sonos_controller.exceptions import DeadlineExceededError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_unbounded_deadline_never_expires_or_caps_timeouts():
+    deadline = Deadline(None)
+
+    assert deadline.bounded is False
+    assert deadline.remaining() is None
+    assert deadline.expired is False
+    assert deadline.timeout(20) == 20
+
+
+def test_bounded_deadline_caps_socket_timeouts_and_then_expires():
+    clock = FakeClock()
+    deadline = Deadline(8, clock=clock)
+
+    assert deadline.timeout(20) == 8
+    clock.now += 5
+    assert deadline.timeout(20) == pytest.approx(3)
+    assert deadline.timeout(1) == 1
+    clock.now += 4
+    assert deadline.expired is True
+    assert deadline.remaining() == 0
+    with pytest.raises(DeadlineExceededError, match="search"):
+        deadline.timeout(20, "search")
+
+
+def test_deadline_errors_are_reported_as_timeouts():
+    # Voice handlers already report OSError failures as a Sonos error.
+    assert issubclass(DeadlineExceededError, TimeoutError)
+    assert issubclass(DeadlineExceededError, OSError)
@@ -0,0 +1,266 @@
+"""Unit tests for the streaming SSDP search."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import ifaddr
+import pytest
+
+from skill_sonos_controller.discovery import (
+    DiscoveryHistory,
+    DiscoveryRun,
+    Responder,
+    interface_addresses,
+    search,
+)
+
+
+def response(uid: str, server: str = "Linux UPnP/1.0 Sonos/81.1-58074 (ZPS33)"):
+    return (
+        "HTTP/1.1 200 OK\r\n"
+        "CACHE-CONTROL: max-age = 1800\r\n"
+        "LOCATION: http://10.0.0.2:1400/xml/device_description.xml\r\n"
+        f"SERVER: {server}\r\n"
+        "ST: urn:schemas-upnp-org:device:ZonePlayer:1\r\n"
+        f"USN: uuid:{uid}::urn:schemas-upnp-org:device:ZonePlayer:1\r\n"
+        "X-RINCON-BOOTSEQ: 7\r\n"
+        "X-RINCON-HOUSEHOLD: Sonos_household\r\n"
+        "\r\n"
+    ).encode()
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeSocket:
+    """Deliver scripted responses at fixed times on a fake clock."""
+
+    def __init__(self, clock: Clock, answers: list[tuple[float, bytes, str]]):
+        self.clock = clock
+        self.answers = sorted(answers, key=lambda answer: answer[0])
+        self.sent: list[bytes] = []
+        self.closed = False
+
+    def sendto(self, data: bytes, _address) -> None:
+        self.sent.append(data)
+
+    def recvfrom(self, _size: int):
+        _at, data, address = self.answers.pop(0)
+        return data, (address, 1900)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def fake_select(readers, _writers, _errors, timeout):
+    """Advance the fake clock to the next answer due within ``timeout``."""
+    clock = readers[0].clock
+    due = [sock for sock in readers if sock.answers]
+    if due:
+        first = min(due, key=lambda sock: sock.answers[0][0])
+        if first.answers[0][0] <= clock.now + timeout:
+            clock.now = max(clock.now, first.answers[0][0])
+            return [first], [], []
+    clock.now += timeout
+    return [], [], []
+
+
+def run_search(sockets, clock, **kwargs):
+    return search(5, sockets=sockets, clock=clock, wait=fake_select, **kwargs)
+
+
+def test_responses_name_the_player_household_and_boot_sequence():
+    assert Responder.parse(response("RINCON_A"), "10.0.0.2") == Responder(
+        "10.0.0.2", "RINCON_A", "Sonos_household", "7"
+    )
+    assert Responder.parse(response("uuid", server="Linux UPnP/1.0 TV"), "x") is None
+
+
+def test_players_are_reported_once_as_they_answer():
+    clock = Clock()
+    sock = FakeSocket(
+        clock,
+        [
+            (0.2, response("RINCON_A"), "10.0.0.2"),
+            (0.3, b"HTTP/1.1 200 OK\r\nSERVER: printer\r\n\r\n", "10.0.0.9"),
+            (0.4, response("RINCON_A"), "10.0.0.2"),
+            (0.6, response("RINCON_B"), "10.0.0.3"),
+        ],
+    )
+
+    found = [(clock.now, responder.uid) for responder in run_search([sock], clock)]
+
+    assert found == [(0.2, "RINCON_A"), (0.6, "RINCON_B")]
+    assert len(sock.sent) == 3
+    assert clock.now >= 5
+    assert not sock.closed
+
+
+def test_search_ends_after_a_quiet_period_without_new_players():
+    clock = Clock()
+    sock = FakeSocket(
+        clock,
+        [
+            (0.2, response("RINCON_A"), "10.0.0.2"),
+            (0.5, response("RINCON_B"), "10.0.0.3"),
+            (3.0, response("RINCON_C"), "10.0.0.4"),
+        ],
+    )
+
+    found = [responder.uid for responder in run_search([sock], clock, quiet_period=1.0)]
+
+    assert found == ["RINCON_A", "RINCON_B"]
+    assert 1.5 <= clock.now < 1.7
+
+
+def test_quiet_period_only_starts_with_the_first_answer():
+    clock = Clock()
+    sock = FakeSocket(clock, [(2.5, response("RINCON_A"), "10.0.0.2")])
+
+    found = [responder.uid for responder in run_search([sock], clock, quiet_period=1.0)]
+
+    assert found == ["RINCON_A"]
+    assert 3.5 <= clock.now < 3.7
+
+
+def test_search_without_a_sent_request_finds_nothing():
+    class Offline(FakeSocket):
+        def sendto(self, data, address):
+            raise OSError("network unreachable")
+
+    sock = Offline(Clock(), [(0.1, response("RINCON_A"), "10.0.0.2")])
+
+    assert list(run_search([sock], sock.clock)) == []
+
+
+def test_every_interface_is_searched_and_answers_are_merged():
+    clock = Clock()
+    docker = FakeSocket(clock, [])
+    lan = FakeSocket(
+        clock,
+        [
+            (0.2, response("RINCON_A"), "192.168.1.2"),
+            (0.3, response("RINCON_B"), "192.168.1.3"),
+        ],
+    )
+    vpn = FakeSocket(clock, [(0.25, response("RINCON_A"), "192.168.1.2")])
+
+    found = [responder.uid for responder in run_search([docker, lan, vpn], clock)]
+
+    assert found == ["RINCON_A", "RINCON_B"]
+    assert [len(sock.sent) for sock in (docker, lan, vpn)] == [3, 3, 3]
+
+
+def test_interfaces_skip_loopback_link_local_and_ipv6(monkeypatch):
+    def adapter(*ips):
+        return SimpleNamespace(ips=[SimpleNamespace(ip=ip) for ip in ips])
+
+    monkeypatch.setattr(
+        ifaddr,
+        "get_adapters",
+        lambda: [
+            adapter("127.0.0.1"),
+            adapter("192.168.1.10", ("fe80::1", 0, 2)),
+            adapter("169.254.3.4"),
+            adapter("172.17.0.1"),
+        ],
+    )
+
+    assert interface_addresses() == ("172.17.0.1", "192.168.1.10")
+
+
+def test_history_timeout_adapts_to_the_household():
+    history = DiscoveryHistory()
+
+    assert history.timeout(5) == 5
+
+    history.record(DiscoveryRun(1.0, 0.4, 2), {"RINCON_A", "RINCON_B"})
+    assert history.timeout(5) == 2
+
+    history.record(DiscoveryRun(2.0, 1.5, 2), {"RINCON_A", "RINCON_B"})
+    assert history.timeout(5) == 3
+
+    history.record(DiscoveryRun(4.5, 3.5, 2), {"RINCON_A", "RINCON_B"})
+    assert history.timeout(5) == 7
+
+    history.record(DiscoveryRun(9.0, 8.0, 2), {"RINCON_A", "RINCON_B"})
+    assert history.timeout(5) == 10
+
+
+def test_history_keeps_known_rooms_after_an_empty_discovery():
+    history = DiscoveryHistory(max_runs=2)
+    history.record(DiscoveryRun(1.0, 0.4, 1), {"RINCON_A"})
+    history.record(DiscoveryRun(5.0, None, 0, ("RINCON_A",), "timeout"), set())
+    history.record(DiscoveryRun(0.5, 0.3, 1, ended="complete"), {"RINCON_A"})
+
+    snapshot = history.snapshot()
+
+    assert history.expected() == {"RINCON_A"}
+    assert snapshot["expected"] == ["RINCON_A"]
+    assert [run["ended"] for run in snapshot["runs"]] == ["timeout", "complete"]
+
+
+def test_history_stops_expecting_rooms_missed_three_times_in_a_row():
+    history = DiscoveryHistory()
+    history.record(DiscoveryRun(1.0, 0.4, 2), {"RINCON_A", "RINCON_B"})
+
+    for _ in range(2):
+        history.record(DiscoveryRun(5.0, None, 1, ("RINCON_B",)), {"RINCON_A"})
+        assert history.expected() == {"RINCON_A", "RINCON_B"}
+    history.record(DiscoveryRun(5.0, None, 0, ("RINCON_A", "RINCON_B")), set())
+    assert history.expected() == {"RINCON_A", "RINCON_B"}
+
+    history.record(DiscoveryRun(5.0, None, 1, ("RINCON_B",)), {"RINCON_A"})
+    assert history.expected() == {"RINCON_A"}
+    assert history.snapshot()["misses"] == {}
+
+
+def test_history_forgets_misses_of_a_room_that_answers_again(tmp_path):
+    path = tmp_path / "discovery.json"
+    history = DiscoveryHistory(path)
+    history.record(DiscoveryRun(1.0, 0.4, 2), {"RINCON_A", "RINCON_B"})
+    history.record(DiscoveryRun(5.0, None, 1, ("RINCON_B",)), {"RINCON_A"})
+    history.record(DiscoveryRun(5.0, None, 1, ("RINCON_B",)), {"RINCON_A"})
+    assert DiscoveryHistory(path).snapshot()["misses"] == {"RINCON_B": 2}
+
+    history.record(DiscoveryRun(1.0, 0.4, 2), {"RINCON_A", "RINCON_B"})
+    history.record(DiscoveryRun(5.0, None, 1, ("RINCON_B",)), {"RINCON_A"})
+
+    assert DiscoveryHistory(path).expected() == {"RINCON_A", "RINCON_B"}
+
+
+def test_history_is_persisted(tmp_path):
+    path = tmp_path / "discovery.json"
+    DiscoveryHistory(path).record(
+        DiscoveryRun(5.0, 4.0, 1, ("RINCON_B",), "timeout"), {"RINCON_A"}
+    )
+
+    history = DiscoveryHistory(path)
+
+    assert history.expected() == {"RINCON_A"}
+    assert history.timeout(5) == 8
+    assert history.snapshot()["runs"][0]["missing"] == ("RINCON_B",)
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        '{"expected": ["RINCON_A"], "runs": [',
+        '{"expected": ["RINCON_A"], "runs": [{"seconds": 1, "legacy": true}]}',
+        '["RINCON_A"]',
+    ],
+)
+def test_unreadable_history_starts_empty(tmp_path, content):
+    path = tmp_path / "discovery.json"
+    path.write_text(content, encoding="utf-8")
+    history = DiscoveryHistory(path)
+
+    assert history.expected() == frozenset()
+    history.record(DiscoveryRun(1.0, 0.4, 1), {"RINCON_B"})
+    assert DiscoveryHistory(path).expected() == {"RINCON_B"}
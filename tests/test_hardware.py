@@ -0,0 +1,96 @@
+"""Unit tests for stored speaker hardware details."""
+
+import pytest
+
+from skill_sonos_controller.hardware import (
+    SpeakerInfo,
+    SpeakerInfoStore,
+    description_services,
+)
+
+DESCRIPTION = b"""<?xml version="1.0"?>
+<root xmlns="urn:schemas-upnp-org:device-1-0">
+  <device>
+    <modelName>Sonos Arc Ultra</modelName>
+    <serviceList>
+      <service><serviceId>urn:upnp-org:serviceId:AudioIn</serviceId></service>
+      <service><serviceId>urn:upnp-org:serviceId:HTControl</serviceId></service>
+    </serviceList>
+    <deviceList>
+      <device>
+        <serviceList>
+          <service><serviceId>urn:upnp-org:serviceId:AVTransport</serviceId></service>
+        </serviceList>
+      </device>
+    </deviceList>
+  </device>
+</root>
+"""
+
+
+@pytest.mark.parametrize(
+    ("model_name", "home_theater", "line_in", "battery", "trueplay"),
+    [
+        ("Sonos Arc", True, False, False, True),
+        ("Sonos Amp", True, True, False, True),
+        ("Sonos Play:5", False, True, False, True),
+        ("Sonos:Era 100", False, True, False, True),
+        ("Sonos Roam", False, False, True, True),
+        ("Sonos Port", False, True, False, False),
+    ],
+)
+def test_capabilities_follow_the_model_name(
+    model_name, home_theater, line_in, battery, trueplay
+):
+    assert SpeakerInfo("uid", model_name).capabilities() == {
+        "home_theater": home_theater,
+        "line_in": line_in,
+        "battery": battery,
+        "trueplay": trueplay,
+    }
+
+
+def test_details_round_trip_and_ignore_unknown_fields(tmp_path):
+    path = tmp_path / "speakers.json"
+    info = SpeakerInfo.from_soco(
+        "RINCON_1",
+        {"model_name": "Sonos Arc", "serial_number": "00-11", "player_icon": "/i"},
+        boot_seq="12",
+    )
+    SpeakerInfoStore(path).put(info)
+
+    assert SpeakerInfoStore(path).get("RINCON_1") == info
+    assert info.serial_number == "00-11"
+    assert SpeakerInfoStore(path).get("RINCON_2") is None
+
+
+def test_the_device_description_decides_home_theater_support(tmp_path):
+    services = description_services(DESCRIPTION)
+    path = tmp_path / "speakers.json"
+    info = SpeakerInfo.from_soco(
+        "RINCON_1", {"model_name": "Sonos Arc Ultra", "services": services}
+    )
+    SpeakerInfoStore(path).put(info)
+
+    assert services == ("AVTransport", "AudioIn", "HTControl")
+    assert info.home_theater
+    assert not SpeakerInfo(
+        "RINCON_2", "Sonos Arc", services=("AVTransport",)
+    ).home_theater
+    assert SpeakerInfoStore(path).get("RINCON_1") == info
+
+
+@pytest.mark.parametrize(
+    "content",
+    ['{"speakers": [', '{"speakers": [{"uid": "RINCON_1", "zone": "Den"}]}', "[]"],
+)
+def test_unreadable_details_are_read_again(tmp_path, content):
+    path = tmp_path / "speakers.json"
+    path.write_text(content, encoding="utf-8")
+    store = SpeakerInfoStore(path)
+
+    assert store.get("RINCON_1") is None
+    store.put(SpeakerInfo("RINCON_1", "Sonos Arc"))
+    assert SpeakerInfoStore(path).get("RINCON_1") == SpeakerInfo(
+        "RINCON_1", "Sonos Arc"
+    )
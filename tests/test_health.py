@@ -0,0 +1,55 @@
+"""Unit tests for per-speaker health tracking."""
+
+from skill_sonos_controller.health import HealthTracker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_breaker_opens_after_consecutive_failures_only():
+    tracker = HealthTracker(failure_threshold=3, clock=FakeClock())
+
+    tracker.record_failure("kitchen")
+    tracker.record_failure("kitchen")
+    tracker.record_success("kitchen", 0.02)
+    tracker.record_failure("kitchen")
+    tracker.record_failure("kitchen")
+    assert tracker.allow("kitchen") is True
+
+    tracker.record_failure("kitchen")
+    assert tracker.allow("kitchen") is False
+    assert tracker.snapshot()["kitchen"]["state"] == "open"
+    assert tracker.snapshot()["kitchen"]["failures"] == 5
+
+
+def test_single_probe_is_reserved_after_the_cool_down():
+    clock = FakeClock()
+    tracker = HealthTracker(failure_threshold=1, reset_timeout=30, clock=clock)
+    tracker.record_failure("office")
+
+    assert tracker.begin_probe("office") is False
+    clock.now = 31
+    assert tracker.begin_probe("office") is True
+    assert tracker.begin_probe("office") is False
+
+    tracker.record_failure("office")
+    clock.now = 40
+    assert tracker.begin_probe("office") is False
+    clock.now = 62
+    assert tracker.begin_probe("office") is True
+    tracker.record_success("office", 0.1)
+    assert tracker.allow("office") is True
+
+
+def test_latency_is_smoothed():
+    tracker = HealthTracker()
+
+    tracker.record_success("den", 0.1)
+    tracker.record_success("den", 0.2)
+
+    assert abs(tracker.snapshot()["den"]["latency"] - 0.13) < 1e-9
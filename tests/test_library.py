@@ -0,0 +1,39 @@
+"""Unit tests for the local audio file index."""
+
+from pathlib import Path
+
+from skill_sonos_controller.library import LocalLibrary, LocalTrack
+
+
+def test_names_are_inferred_from_the_folder_layout():
+    root = Path("/music")
+
+    track = LocalTrack.from_path(
+        root / "Miles Davis/Kind of Blue/02 - Freddie.flac", root
+    )
+    loose = LocalTrack.from_path(root / "Nina Simone - Sinnerman.mp3", root)
+
+    assert (track.artist, track.album, track.title) == (
+        "Miles Davis",
+        "Kind of Blue",
+        "Freddie",
+    )
+    assert (loose.artist, loose.album, loose.title) == (
+        "Nina Simone",
+        None,
+        "Sinnerman",
+    )
+
+
+def test_index_only_keeps_audio_and_rescans_when_stale(tmp_path):
+    (tmp_path / "Band" / "Album").mkdir(parents=True)
+    (tmp_path / "Band" / "Album" / "01 Song.mp3").write_bytes(b"")
+    (tmp_path / "Band" / "Album" / "cover.jpg").write_bytes(b"")
+    now = [0.0]
+    library = LocalLibrary((tmp_path,), ttl=60, clock=lambda: now[0])
+
+    assert [track.title for track in library.tracks()] == ["Song"]
+    (tmp_path / "Band" / "Album" / "02 Other.ogg").write_bytes(b"")
+    assert len(library.tracks()) == 1
+    now[0] = 61
+    assert [track.title for track in library.tracks()] == ["Song", "Other"]
@@ -0,0 +1,182 @@
+"""Unit tests for lazily loaded per-language tables."""
+
+from __future__ import annotations
+
+import sys
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from skill_sonos_controller import CLASSIFIER_INTENT_HANDLERS
+from skill_sonos_controller.locales import LocaleResources, spelling_alphabet
+from skill_sonos_controller.templates import TemplateIndex
+
+LOCALE_DIR = Path(__file__).parents[1] / "skill_sonos_controller" / "locale"
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Loader:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    def __call__(self, lang: str):
+        self.calls.append(lang)
+        return SimpleNamespace(
+            load_named_value_file=lambda _name: {"Alfa": "a", "one": "1"},
+            load_intent_file=lambda name: [f"say {name}", "play {music}"],
+        )
+
+
+def test_spelling_alphabet_indexes_standard_named_values_by_system_value():
+    values = {
+        "'A' as in Alfa": "A",
+        "the number one": "1",
+    }
+
+    assert spelling_alphabet(values) == {
+        "A": "'A' as in Alfa",
+        "1": "the number one",
+    }
+
+
+def test_spelling_is_loaded_once_and_shared_read_only():
+    loader = Loader()
+    locales = LocaleResources(loader, (), LOCALE_DIR)
+
+    first = locales.spelling("en-US")
+    second = locales.spelling("en-us")
+
+    assert first is second
+    assert dict(first) == {"A": "Alfa", "1": "one"}
+    assert loader.calls == ["en-US"]
+    with pytest.raises(TypeError):
+        first["B"] = "Bravo"  # type: ignore[index]
+
+
+def test_languages_are_only_loaded_when_used():
+    loader = Loader()
+    locales = LocaleResources(loader, CLASSIFIER_INTENT_HANDLERS, LOCALE_DIR)
+
+    assert locales.stats() == {}
+
+    locales.parser("en-us")
+
+    assert loader.calls == ["en-us"]
+    assert set(locales.stats()) == {"en-us"}
+
+
+def test_template_strings_are_interned():
+    locales = LocaleResources(Loader(), ("sonos.tv.intent",), LOCALE_DIR)
+
+    templates = locales.templates("en-us")
+
+    name = next(iter(templates))
+    assert name is sys.intern("sonos.tv.intent")
+    assert templates[name][0] is sys.intern("say sonos.tv.intent")
+
+
+def test_parser_reuses_stored_templates_after_a_restart(tmp_path):
+    intents = ("sonos.tv.intent",)
+    LocaleResources(
+        Loader(), intents, LOCALE_DIR, index=TemplateIndex(tmp_path)
+    ).parser("en-us")
+
+    def unavailable(_lang):
+        raise AssertionError("stored templates must be reused")
+
+    parser = LocaleResources(
+        unavailable, intents, LOCALE_DIR, index=TemplateIndex(tmp_path)
+    ).parser("en-us")
+
+    assert parser.match("say sonos.tv.intent") == ("sonos.tv.intent", {})
+
+
+def test_idle_languages_are_evicted_unless_pinned():
+    clock = Clock()
+    loader = Loader()
+    locales = LocaleResources(loader, (), LOCALE_DIR, max_idle=60.0, clock=clock)
+    locales.pin("en-us")
+    locales.spelling("en-us")
+    locales.spelling("de-de")
+
+    clock.now = 61.0
+    locales.spelling("fr-fr")
+
+    assert set(locales.stats()) == {"en-us", "fr-fr"}
+
+    locales.spelling("de-de")
+
+    assert loader.calls == ["en-us", "de-de", "fr-fr", "de-de"]
+
+
+def test_stats_report_table_sizes_and_hits():
+    clock = Clock()
+    locales = LocaleResources(Loader(), ("sonos.tv.intent",), LOCALE_DIR, clock=clock)
+    locales.parser("en-us")
+    locales.parser("en-us")
+    locales.spelling("en-us")
+    clock.now = 2.5
+
+    assert locales.stats() == {
+        "en-us": {
+            "idle": 2.5,
+            "spelling": 2,
+            "templates": 2,
+            "template_characters": len("say sonos.tv.intent") + len("play {music}"),
+            "hits": {"parser": 2, "spelling": 1},
+        }
+    }
+
+
+def test_evict_drops_a_loaded_language():
+    locales = LocaleResources(Loader(), (), LOCALE_DIR)
+    locales.spelling("en-us")
+
+    assert locales.evict("en-US") is True
+    assert locales.evict("en-us") is False
+    assert locales.stats() == {}
+
+
+def test_a_slow_parser_build_does_not_block_other_callers():
+    release = threading.Event()
+    building = threading.Event()
+    loader = Loader()
+
+    def load(lang: str):
+        resources = loader(lang)
+        if len(loader.calls) == 1:
+            # The first build stands for the niced warm-up thread.
+            building.set()
+            release.wait(5)
+        return resources
+
+    locales = LocaleResources(load, ("sonos.tv.intent",), Path("missing"))
+    background = threading.Thread(target=locales.parser, args=("en-us",))
+    background.start()
+    assert building.wait(5)
+
+    results = []
+    foreground = threading.Thread(
+        target=lambda: results.extend(
+            (locales.parser("en-us"), locales.spelling("de-de"))
+        )
+    )
+    foreground.start()
+    foreground.join(2)
+    finished_first = not foreground.is_alive()
+    release.set()
+    background.join(5)
+    foreground.join(5)
+
+    assert finished_first
+    assert locales.parser("en-us") is results[0]
+    assert locales.stats()["en-us"]["hits"]["parser"] == 3
@@ -0,0 +1,94 @@
+"""Unit tests for the local announcement media server."""
+
+import http.client
+import socket
+
+import pytest
+
+from skill_sonos_controller import media_server
+from skill_sonos_controller.media_server import MediaServer, parse_range
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        (None, None),
+        ("bytes=0-9", (0, 9)),
+        ("bytes=5-", (5, 99)),
+        ("bytes=-10", (90, 99)),
+        ("bytes=90-500", (90, 99)),
+    ],
+)
+def test_single_byte_ranges_are_parsed(header, expected):
+    assert parse_range(header, 100) == expected
+
+
+@pytest.mark.parametrize("header", ["bytes=100-", "bytes=-", "items=0-1", "bytes=5-2"])
+def test_unsatisfiable_ranges_are_rejected(header):
+    with pytest.raises(ValueError):
+        parse_range(header, 100)
+
+
+def test_published_files_are_served_with_ranges(tmp_path):
+    clip = tmp_path / "chime.mp3"
+    clip.write_bytes(bytes(range(256)))
+    server = MediaServer(host="127.0.0.1")
+    url = server.url_for(clip, "127.0.0.1")
+    path = url.split(str(server.port), 1)[1]
+    try:
+        connection = http.client.HTTPConnection("127.0.0.1", server.port, timeout=5)
+        connection.request("GET", path, headers={"Range": "bytes=10-19"})
+        response = connection.getresponse()
+        assert response.status == 206
+        assert response.getheader("Content-Range") == "bytes 10-19/256"
+        assert response.getheader("Content-Type") == "audio/mpeg"
+        assert response.read() == bytes(range(10, 20))
+
+        connection.request("GET", "/chime.mp3")
+        response = connection.getresponse()
+        response.read()
+        assert response.status == 404
+    finally:
+        server.stop()
+
+
+def test_published_names_are_random_and_stable_per_file(tmp_path):
+    clip = tmp_path / "chime.mp3"
+    clip.write_bytes(b"ID3")
+    server = MediaServer()
+    other = MediaServer(host="127.0.0.1")
+    try:
+        url = server.url_for(clip, "127.0.0.1")
+
+        assert server.host == "127.0.0.1"
+        assert server.url_for(clip, "127.0.0.1") == url
+        assert url.endswith(".mp3")
+        assert (
+            url.rsplit("/", 1)[1] != other.url_for(clip, "127.0.0.1").rsplit("/", 1)[1]
+        )
+    finally:
+        server.stop()
+        other.stop()
+
+
+def test_connections_are_capped_and_idle_ones_time_out(tmp_path, monkeypatch):
+    monkeypatch.setattr(media_server._MediaRequestHandler, "timeout", 0.2)
+    clip = tmp_path / "chime.mp3"
+    clip.write_bytes(b"ID3")
+    server = MediaServer(host="127.0.0.1", max_connections=1)
+    path = server.url_for(clip, "127.0.0.1").split(str(server.port), 1)[1]
+    try:
+        with socket.create_connection(("127.0.0.1", server.port), 5) as idle:
+            with socket.create_connection(("127.0.0.1", server.port), 5) as extra:
+                # The second connection is closed without being served.
+                assert extra.recv(1) == b""
+            # The idle connection is dropped once the handler times out.
+            assert idle.recv(1) == b""
+
+        connection = http.client.HTTPConnection("127.0.0.1", server.port, timeout=5)
+        connection.request("GET", path)
+        response = connection.getresponse()
+        assert response.status == 200
+        assert response.read() == b"ID3"
+    finally:
+        server.stop()
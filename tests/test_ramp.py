@@ -0,0 +1,37 @@
+"""Unit tests for the shared volume-ramp scheduler."""
+
+import pytest
+
+from skill_sonos_controller.ramp import RampScheduler
+
+
+def test_ramp_reports_progress_until_the_final_step():
+    steps = []
+    scheduler = RampScheduler(interval=0.01)
+
+    future = scheduler.start("kitchen", steps.append, 0.05)
+
+    assert future.result(timeout=2) is True
+    assert steps[-1] == 1.0
+    assert steps == sorted(steps)
+    assert scheduler.active() == ()
+
+
+def test_new_ramp_replaces_and_cancel_stops_the_previous_one():
+    scheduler = RampScheduler(interval=0.01)
+    first = scheduler.start("kitchen", lambda _progress: None, 10)
+    second = scheduler.start("kitchen", lambda _progress: None, 10)
+
+    assert first.result(timeout=1) is False
+    scheduler.cancel("kitchen")
+    assert second.result(timeout=1) is False
+
+
+def test_failed_step_ends_the_ramp_with_its_error():
+    def apply(_progress):
+        raise OSError("unreachable")
+
+    future = RampScheduler(interval=0.01).start("kitchen", apply, 1)
+
+    with pytest.raises(OSError):
+        future.result(timeout=2)
@@ -0,0 +1,50 @@
+"""Unit tests for scene persistence."""
+
+import pytest
+
+from skill_sonos_controller.scenes import RoomState, Scene, SceneStore
+
+
+def test_scenes_round_trip_through_json(tmp_path):
+    path = tmp_path / "scenes.json"
+    scene = Scene(
+        "Downstairs Party",
+        (
+            RoomState("kitchen", "Kitchen", "kitchen", 30, False, "SHUFFLE", "x"),
+            RoomState("den", "Den", "kitchen", 25, True),
+        ),
+    )
+    SceneStore(path).save(scene)
+
+    store = SceneStore(path)
+    assert store.get("downstairs  party") == scene
+    assert store.names() == ("Downstairs Party",)
+    assert store.delete("Downstairs Party") is True
+    assert SceneStore(path).names() == ()
+
+
+def test_scenes_without_a_path_stay_in_memory():
+    store = SceneStore()
+    store.save(Scene("Morning", ()))
+
+    assert store.names() == ("Morning",)
+    assert store.delete("Evening") is False
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        '{"scenes": [',
+        '{"scenes": [{"name": "Party", "rooms": [{"uid": "den", "old": 1}]}]}',
+        '{"scenes": [{"rooms": []}]}',
+        "[]",
+    ],
+)
+def test_unreadable_scenes_start_empty(tmp_path, content):
+    path = tmp_path / "scenes.json"
+    path.write_text(content, encoding="utf-8")
+    store = SceneStore(path)
+
+    assert store.names() == ()
+    store.save(Scene("Morning", ()))
+    assert SceneStore(path).names() == ("Morning",)
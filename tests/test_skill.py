@@ -1,23 +1,21 @@
 """Focused tests for helpers in the OVOS voice layer."""
 
+from pathlib import Path
 from types import SimpleNamespace
 
 import requests
 from ovos_bus_client.message import Message
 
-from skill_sonos_controller import SonosControllerSkill, _spelling_alphabet
+from skill_sonos_controller import CLASSIFIER_INTENT_HANDLERS, SonosControllerSkill
+from skill_sonos_controller.locales import LocaleResources
 
+LOCALE_DIR = Path(__file__).parents[1] / "skill_sonos_controller" / "locale"
 
-def test_spelling_alphabet_indexes_standard_named_values_by_system_value():
-    values = {
-        "'A' as in Alfa": "A",
-        "the number one": "1",
-    }
 
-    assert _spelling_alphabet(values) == {
-        "A": "'A' as in Alfa",
-        "1": "the number one",
-    }
+def locales_for(resources):
+    return LocaleResources(
+        lambda _lang: resources, CLASSIFIER_INTENT_HANDLERS, LOCALE_DIR
+    )
 
 
 def test_classifier_only_message_is_hydrated_from_selected_intent_file():
@@ -32,11 +30,7 @@ def test_classifier_only_message_is_hydrated_from_selected_intent_file():
         _entity_parser = SonosControllerSkill._entity_parser
 
         def __init__(self):
-            self._entity_parsers = {}
-
-        @staticmethod
-        def load_lang(**_kwargs):
-            return Resources()
+            self.locales = locales_for(Resources())
 
     skill = Skill()
     message = Message(
@@ -56,7 +50,44 @@ def test_classifier_only_message_is_hydrated_from_selected_intent_file():
         ("speaker", "office"),
         ("track", "imagine"),
     }
-    assert set(skill._entity_parsers) == {"en-us"}
+    assert set(skill.locales.stats()) == {"en-us"}
+
+
+def test_unmatched_or_unsure_labels_are_rerouted_by_the_full_parser():
+    class Resources:
+        @staticmethod
+        def load_intent_file(name):
+            return {
+                "sonos.pause.music.intent": ["pause music in {speaker}"],
+                "sonos.next.music.intent": ["skip song in {speaker}"],
+            }.get(name, [])
+
+    class Skill:
+        _entity_parser = SonosControllerSkill._entity_parser
+
+        def __init__(self):
+            self.locales = locales_for(Resources())
+            self.bus = SimpleNamespace(emit=lambda _message: None)
+            self.rerouted = []
+
+        def _handle_next_music(self, message):
+            self.rerouted.append(message.data["speaker"])
+
+    skill = Skill()
+    for confidence in (0.9, 0.2):
+        message = Message(
+            "skill.intent",
+            {
+                "confidence": confidence,
+                "lang": "en-US",
+                "utterance": "skip song in den",
+            },
+        )
+        assert SonosControllerSkill._hydrate_message_entities(
+            skill, message, "sonos.pause.music.intent"
+        )
+
+    assert skill.rerouted == ["den", "den"]
 
 
 def test_completed_authentication_is_kept_when_link_cleanup_fails(monkeypatch):
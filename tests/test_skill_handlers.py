@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
+from pathlib import Path
 from types import SimpleNamespace
-from unittest.mock import MagicMock
+from unittest.mock import ANY, MagicMock
 
 import pytest
 import requests
@@ -15,19 +16,24 @@ from skill_sonos_controller import (
     SonosControllerSkill,
     _as_bool,
 )
+from skill_sonos_controller.announce import AnnouncementCache
 from skill_sonos_controller.auth import AuthenticationLink
 from skill_sonos_controller.constants import DEFAULT_SOURCE, DEFAULT_VOLUME_STEP
-from skill_sonos_controller.controller import PlaybackResult
+from skill_sonos_controller.controller import NowPlaying, PlaybackResult
 from skill_sonos_controller.exceptions import (
     AmbiguousSpeakerError,
     AuthenticationNotSupportedError,
     AuthenticationRequiredError,
     CategoryNotSupportedError,
+    FeatureNotSupportedError,
     NoResultsError,
     NoSpeakersError,
     ServiceNotFoundError,
     SpeakerNotFoundError,
 )
+from skill_sonos_controller.hardware import SpeakerInfo, SpeakerInfoStore
+from skill_sonos_controller.locales import LocaleResources
+from skill_sonos_controller.scenes import Scene, SceneStore
 
 
 class Settings(dict):
@@ -45,6 +51,7 @@ class SkillHarness:
     """Bind the voice helpers without starting an OVOS message bus."""
 
     _refresh_household = SonosControllerSkill._refresh_household
+    _emit_speaker_found = SonosControllerSkill._emit_speaker_found
     _message_service = SonosControllerSkill._message_service
     _play_from_message = SonosControllerSkill._play_from_message
     _confirm_playback = SonosControllerSkill._confirm_playback
@@ -55,6 +62,11 @@ class SkillHarness:
     _change_group = SonosControllerSkill._change_group
     _change_home_theater = SonosControllerSkill._change_home_theater
     _speak_track_info = SonosControllerSkill._speak_track_info
+    _reply = SonosControllerSkill._reply
+    _configure_local_library = SonosControllerSkill._configure_local_library
+    _announcement_uri = SonosControllerSkill._announcement_uri
+    _warm_entity_parser = SonosControllerSkill._warm_entity_parser
+    _warm_default_service = SonosControllerSkill._warm_default_service
 
     def __init__(self) -> None:
         self.controller = MagicMock()
@@ -64,10 +76,21 @@ class SkillHarness:
         self.duck_enabled = False
         self.playing_confirmation = False
         self.searching_confirmation = False
-        self.nato_dict = {"A": "Alfa", "1": "one"}
+        self.locales = LocaleResources(
+            lambda _lang: SimpleNamespace(
+                load_named_value_file=lambda _name: {"Alfa": "A", "one": "1"}
+            ),
+            (),
+            Path(),
+        )
         self.dialogs: list[tuple[str, dict, dict]] = []
         self.spoken: list[str] = []
         self.yesno = "no"
+        self.bus = MagicMock()
+        self.scenes = SceneStore()
+        self.announcements = None
+        self.clip_roots = ()
+        self.warm_up = None
 
         speaker = SimpleNamespace(
             player_name="Office",
@@ -88,6 +111,13 @@ class SkillHarness:
             },
         )
         self.controller.speakers = (speaker,)
+        self.controller.speaker_info.return_value = SpeakerInfo.from_soco(
+            "RINCON_TEST", speaker.get_speaker_info()
+        )
+        self.controller.hardware = SpeakerInfoStore()
+        self.controller.now_playing.return_value = (
+            NowPlaying("Office", "Imagine", "John Lennon"),
+        )
         self.controller.registry.household_services = (
             SimpleNamespace(name="Music Library"),
             SimpleNamespace(name="Spotify"),
@@ -140,6 +170,8 @@ def test_settings_refresh_uses_safe_defaults_for_empty_values():
     skill.settings.update(
         default_source="  ",
         duck="yes",
+        group_volume="on",
+        local_music_path=" ~/Music ",
         playing_confirmation="true",
         searching_confirmation="off",
     )
@@ -148,6 +180,11 @@ def test_settings_refresh_uses_safe_defaults_for_empty_values():
 
     assert skill.service == DEFAULT_SOURCE
     assert skill.duck_enabled is True
+    assert skill.controller.group_volume is True
+    library = skill.controller.local_library
+    assert library.directories == (Path("~/Music").expanduser(),)
+    SonosControllerSkill.on_settings_changed(skill)
+    assert skill.controller.local_library is library
     assert skill.playing_confirmation is True
     assert skill.searching_confirmation is False
     assert skill._message_service(message(service="  ")) == DEFAULT_SOURCE
@@ -177,6 +214,31 @@ def test_discovery_and_service_listing_use_current_household_data():
     assert skill.spoken == ["Office", "Music Library", "Spotify"]
 
 
+def test_discovery_publishes_each_room_as_it_is_found():
+    skill = SkillHarness()
+    kitchen = SimpleNamespace(
+        uid="RINCON_K", player_name="Kitchen", ip_address="10.0.0.2"
+    )
+
+    def refresh(on_found):
+        on_found(kitchen)
+        return (kitchen,)
+
+    skill.controller.refresh.side_effect = refresh
+    skill.controller.speakers = (kitchen,)
+
+    SonosControllerSkill._handle_speaker_discovery(skill, message())
+
+    [published] = [call.args[0] for call in skill.bus.emit.call_args_list]
+    assert published.msg_type == "sonos.speaker.found"
+    assert published.data == {
+        "uid": "RINCON_K",
+        "name": "Kitchen",
+        "ip_address": "10.0.0.2",
+    }
+    assert skill.dialogs[0] == ("sonos.discovery.result", {"total": 1}, {})
+
+
 @pytest.mark.parametrize("failure", [OSError("offline"), SoCoException("offline")])
 def test_discovery_failures_are_reported(failure):
     skill = SkillHarness()
@@ -224,6 +286,7 @@ def test_every_playback_category_reaches_the_controller(category, query_key, art
         category=category,
         query="Query",
         artist=artist,
+        deadline=ANY,
     )
     suffix = "artist" if artist and category in {"albums", "tracks"} else "result"
     assert_last_dialog(skill, f"sonos.{category[:-1]}.{suffix}")
@@ -319,6 +382,7 @@ def test_every_transport_command_preserves_its_required_state(command, state):
         speaker="Office",
         required_state=state,
         mode=None,
+        deadline=ANY,
     )
 
 
@@ -428,7 +492,9 @@ def test_control_helpers_reach_the_expected_controller_method(
 
     getattr(skill, helper)(message(speaker="Office"), *arguments)
 
-    getattr(skill.controller, method).assert_called_once_with(*expected_call)
+    getattr(skill.controller, method).assert_called_once_with(
+        *expected_call, deadline=ANY
+    )
 
 
 def test_every_grouping_operation_reaches_the_controller():
@@ -438,9 +504,11 @@ def test_every_grouping_operation_reaches_the_controller():
     skill._change_group("all", message(speaker="Office"))
     skill._change_group("ungroup", message(speaker="Office"))
 
-    skill.controller.group_speakers.assert_called_once_with("Office", ("Kitchen",))
-    skill.controller.group_all.assert_called_once_with("Office")
-    skill.controller.ungroup_speaker.assert_called_once_with("Office")
+    skill.controller.group_speakers.assert_called_once_with(
+        "Office", ("Kitchen",), deadline=ANY
+    )
+    skill.controller.group_all.assert_called_once_with("Office", deadline=ANY)
+    skill.controller.ungroup_speaker.assert_called_once_with("Office", deadline=ANY)
     with pytest.raises(ValueError, match="Unsupported grouping operation"):
         skill._change_group("invalid", message(speaker="Office"))
 
@@ -462,6 +530,15 @@ def test_control_failures_have_specific_dialogs(failure, expected):
     assert_last_dialog(skill, expected)
 
 
+def test_unsupported_home_theater_rooms_are_named_in_the_reply():
+    skill = SkillHarness()
+    skill.controller.switch_to_tv.side_effect = FeatureNotSupportedError("Office")
+
+    skill._change_home_theater(message(speaker="Office"), "tv")
+
+    assert skill.dialogs[-1][:2] == ("error.capability", {"speaker": "Office"})
+
+
 @pytest.mark.parametrize("raw_level", ["", "101", "-1", "twelve point five"])
 def test_exact_volume_rejects_missing_out_of_range_and_fractional_values(raw_level):
     skill = SkillHarness()
@@ -481,7 +558,7 @@ def test_exact_volume_uses_the_locale_aware_number_parser():
         skill, message(volume="twelve", speaker="Office", lang="en-US")
     )
 
-    skill.controller.set_volume.assert_called_once_with(12, "Office")
+    skill.controller.set_volume.assert_called_once_with(12, "Office", deadline=ANY)
 
 
 def test_ducking_is_opt_in_and_fail_safe():
@@ -493,8 +570,8 @@ def test_ducking_is_opt_in_and_fail_safe():
     skill.duck_enabled = True
     SonosControllerSkill._handle_duck_volume(skill, message())
     SonosControllerSkill._handle_unduck_volume(skill, message())
-    skill.controller.duck.assert_called_once_with(DEFAULT_VOLUME_STEP)
-    skill.controller.unduck.assert_called_once_with()
+    skill.controller.duck.assert_called_once_with(DEFAULT_VOLUME_STEP, ANY)
+    skill.controller.unduck.assert_called_once_with(ANY)
 
     skill.controller.duck.side_effect = NoSpeakersError()
     SonosControllerSkill._handle_duck_volume(skill, message())
@@ -538,7 +615,7 @@ def test_speaker_information_covers_summary_and_detailed_answers(detailed, expec
 
 def test_no_active_track_is_reported():
     skill = SkillHarness()
-    skill.controller.transport_state.return_value = "STOPPED"
+    skill.controller.now_playing.return_value = ()
 
     skill._speak_track_info(message(), artist_only=False)
 
@@ -616,3 +693,208 @@ def test_authentication_failures_have_specific_dialogs(monkeypatch, failure, exp
     SonosControllerSkill._handle_authenticate(skill, message(service="Spotify"))
 
     assert_last_dialog(skill, expected)
+
+
+def test_scenes_are_saved_and_applied_over_the_bus():
+    skill = SkillHarness()
+    skill.controller.capture_scene.return_value = Scene("Party", ())
+    skill.controller.apply_scene.return_value = 2
+
+    SonosControllerSkill._handle_scene_save(skill, message(name="Party"))
+    SonosControllerSkill._handle_scene_apply(skill, message(name="party"))
+    SonosControllerSkill._handle_scene_apply(skill, message(name="Brunch"))
+
+    replies = [call.args[0].data for call in skill.bus.emit.call_args_list]
+    assert replies == [
+        {"name": "Party", "rooms": []},
+        {"name": "Party", "changed": 2},
+        {"name": "Brunch", "error": "unknown scene"},
+    ]
+    skill.controller.apply_scene.assert_called_once_with(
+        Scene("Party", ()), deadline=ANY
+    )
+
+
+def test_scene_write_errors_are_replied_to(tmp_path):
+    skill = SkillHarness()
+    skill.scenes = SceneStore(tmp_path)
+    skill.controller.capture_scene.return_value = Scene("Party", ())
+
+    SonosControllerSkill._handle_scene_save(skill, message(name="Party"))
+
+    [reply] = [call.args[0].data for call in skill.bus.emit.call_args_list]
+    assert reply["name"] == "Party"
+    assert reply["error"]
+
+
+def test_announcements_forward_a_url_and_report_missing_audio():
+    skill = SkillHarness()
+    skill.controller.announce.return_value = 2
+
+    SonosControllerSkill._handle_announce(
+        skill, message(uri="http://host/chime.mp3", speaker="Office", volume=40)
+    )
+    SonosControllerSkill._handle_announce(skill, message(speaker="Office"))
+
+    skill.controller.announce.assert_called_once_with(
+        "http://host/chime.mp3", ["Office"], 40, deadline=ANY
+    )
+    replies = [call.args[0].data for call in skill.bus.emit.call_args_list]
+    assert replies == [{"rooms": 2}, {"error": "missing text, path, or uri"}]
+
+
+def test_announcements_refuse_files_outside_the_clip_folders(tmp_path):
+    skill = SkillHarness()
+    skill.clip_roots = (tmp_path,)
+    (tmp_path / "chime.mp3").write_bytes(b"ID3")
+    skill.controller.speakers = [SimpleNamespace(ip_address="10.0.0.2")]
+    skill.controller.media_server.url_for.return_value = "http://10.0.0.1/x.mp3"
+    skill.controller.announce.return_value = 1
+
+    SonosControllerSkill._handle_announce(skill, message(path="/etc/passwd"))
+    SonosControllerSkill._handle_announce(skill, message(path="chime.mp3"))
+
+    skill.controller.media_server.url_for.assert_called_once_with(
+        (tmp_path / "chime.mp3").resolve(), "10.0.0.2"
+    )
+    replies = [call.args[0].data for call in skill.bus.emit.call_args_list]
+    assert replies == [
+        {"error": "not an announcement clip: /etc/passwd"},
+        {"rooms": 1},
+    ]
+
+
+def test_announcements_reply_when_the_tts_engine_fails(tmp_path):
+    skill = SkillHarness()
+    skill._voice = lambda: "piper:alan"
+
+    def synthesize(_text, _lang, _target):
+        raise RuntimeError("voice model is missing")
+
+    def no_plugin_manager():
+        raise ModuleNotFoundError("No module named 'ovos_plugin_manager'")
+
+    skill.announcements = AnnouncementCache(tmp_path, synthesize)
+    SonosControllerSkill._handle_announce(skill, message(text="Dinner is ready"))
+    skill._voice = no_plugin_manager
+    SonosControllerSkill._handle_announce(skill, message(text="Dinner is ready"))
+
+    skill.controller.announce.assert_not_called()
+    replies = [call.args[0].data for call in skill.bus.emit.call_args_list]
+    assert replies == [
+        {"error": "voice model is missing"},
+        {"error": "No module named 'ovos_plugin_manager'"},
+    ]
+
+
+def test_batch_replies_with_per_operation_results():
+    skill = SkillHarness()
+    skill.controller.run_batch.return_value = [{"op": "pause", "ok": True}]
+    operations = [{"op": "pause", "speaker": "Kitchen"}]
+
+    SonosControllerSkill._handle_batch(skill, message(operations=operations))
+    SonosControllerSkill._handle_batch(skill, message(operations="pause"))
+
+    skill.controller.run_batch.assert_called_once_with(operations, deadline=ANY)
+    replies = [call.args[0].data for call in skill.bus.emit.call_args_list]
+    assert replies == [
+        {"results": [{"op": "pause", "ok": True}]},
+        {"error": "operations must be a list of objects"},
+    ]
+
+
+def test_state_queries_are_answered_from_the_cache():
+    skill = SkillHarness()
+    skill.controller.speakers = (
+        SimpleNamespace(player_name="Kitchen", uid="RINCON_K", ip_address="10.0.0.2"),
+    )
+    playing = {"uid": "RINCON_K", "coordinator": "RINCON_K"}
+    member = {"uid": "RINCON_D", "coordinator": "RINCON_K"}
+    skill.controller.cached_rooms.return_value = [
+        {**playing, "transport_state": "PLAYING"},
+        {**member, "transport_state": "PLAYING"},
+        {"uid": "RINCON_G", "subscribed": False},
+    ]
+
+    SonosControllerSkill._handle_speakers_get(skill, message())
+    SonosControllerSkill._handle_now_playing_get(skill, message())
+
+    replies = [call.args[0].data for call in skill.bus.emit.call_args_list]
+    assert replies == [
+        {
+            "speakers": [
+                {"name": "Kitchen", "uid": "RINCON_K", "ip_address": "10.0.0.2"}
+            ]
+        },
+        {"rooms": [{**playing, "transport_state": "PLAYING"}]},
+    ]
+
+
+def test_diagnostics_include_loaded_locale_tables():
+    skill = SkillHarness()
+    skill.controller.diagnostics.return_value = {"speakers": {}}
+    skill.locales.spelling("en-us")
+
+    SonosControllerSkill._handle_diagnostics_get(skill, message())
+
+    reply = skill.bus.emit.call_args.args[0].data
+    assert reply["speakers"] == {}
+    assert reply["locales"]["en-us"]["spelling"] == 2
+    assert reply["locales"]["en-us"]["hits"] == {"spelling": 1}
+
+
+def test_warm_up_prepares_the_parser_and_default_service():
+    skill = SkillHarness()
+    skill.service = "Spotify"
+    skill._entity_parser = MagicMock()
+
+    SonosControllerSkill._start_warm_up(skill)
+    skill.warm_up._thread.join(2)
+
+    skill._entity_parser.assert_called_once_with("en-US")
+    skill.controller.prepare_service.assert_called_once_with("Spotify", deadline=ANY)
+    assert set(skill.warm_up.stats()["stages"]) == {"parser", "service"}
+
+
+def test_warm_up_can_be_disabled():
+    skill = SkillHarness()
+    skill.settings["warm_up"] = False
+
+    SonosControllerSkill._start_warm_up(skill)
+
+    assert skill.warm_up is None
+
+
+def test_service_warm_up_is_skipped_without_speakers_and_logs_failures():
+    skill = SkillHarness()
+    skill.controller.speakers = ()
+
+    SonosControllerSkill._warm_default_service(skill)
+
+    skill.controller.prepare_service.assert_not_called()
+
+    skill.controller.speakers = (MagicMock(),)
+    skill.controller.prepare_service.side_effect = ServiceNotFoundError("Radio")
+
+    SonosControllerSkill._warm_default_service(skill)
+
+
+def test_state_changes_are_published_for_subscribed_rooms():
+    skill = SkillHarness()
+    room = {"uid": "RINCON_K", "name": "Kitchen", "subscribed": True, "volume": 9}
+    skill.controller.cached_room.side_effect = [
+        room,
+        {"uid": "Garage", "name": "Garage", "subscribed": False},
+    ]
+
+    SonosControllerSkill._emit_state_change(skill, "RINCON_K", {"volume": 9})
+    SonosControllerSkill._emit_state_change(skill, "Garage", {"volume": 9})
+
+    [published] = [call.args[0] for call in skill.bus.emit.call_args_list]
+    assert published.msg_type == "sonos.state.changed"
+    assert published.data == {
+        "uid": "RINCON_K",
+        "name": "Kitchen",
+        "changes": {"volume": 9},
+        "room": room,
+    }
@@ -0,0 +1,74 @@
+"""Unit tests for event-fed player state."""
+
+from types import SimpleNamespace
+
+from skill_sonos_controller.state import (
+    StateCache,
+    coordinator_uid,
+    values_from_event,
+)
+
+
+def test_event_variables_are_reduced_to_master_values():
+    assert values_from_event(
+        {
+            "volume": {"Master": "32", "LF": "100"},
+            "mute": {"Master": "1"},
+            "transport_state": "playing",
+            "av_transport_uri": "x-rincon-queue:RINCON_1#0",
+        }
+    ) == {
+        "volume": 32,
+        "mute": True,
+        "uri": "x-rincon-queue:RINCON_1#0",
+        "transport_state": "PLAYING",
+    }
+    assert values_from_event({"bass": "0"}) == {}
+
+
+def test_state_cache_updates_and_forgets_players():
+    cache = StateCache()
+    cache.update("uid-1", volume=20)
+    cache.update("uid-1", mute=False)
+
+    assert cache.get("uid-1", "volume") == 20
+    assert cache.snapshot() == {"uid-1": {"volume": 20, "mute": False}}
+    cache.forget("uid-1")
+    assert cache.get("uid-1", "volume", 5) == 5
+
+
+def test_track_metadata_and_group_source_are_cached():
+    values = values_from_event(
+        {
+            "current_play_mode": "shuffle",
+            "current_track_meta_data": SimpleNamespace(
+                title="Imagine", creator="John Lennon", album="", album_art_uri="/a"
+            ),
+            "av_transport_uri": "x-rincon:RINCON_LEADER",
+        }
+    )
+
+    assert values == {
+        "uri": "x-rincon:RINCON_LEADER",
+        "play_mode": "SHUFFLE",
+        "title": "Imagine",
+        "artist": "John Lennon",
+        "album": None,
+        "album_art": "/a",
+    }
+    assert coordinator_uid("RINCON_MEMBER", values) == "RINCON_LEADER"
+    assert coordinator_uid("RINCON_LEADER", {"uri": "x-file:a"}) == "RINCON_LEADER"
+
+
+def test_listeners_only_hear_values_that_changed():
+    cache = StateCache()
+    heard = []
+    cache.add_listener(lambda uid, changes: heard.append((uid, changes)))
+    cache.update("uid-1", volume=20, mute=False)
+    cache.update("uid-1", volume=20, mute=True)
+    cache.update("uid-1", volume=20)
+
+    assert heard == [
+        ("uid-1", {"volume": 20, "mute": False}),
+        ("uid-1", {"mute": True}),
+    ]
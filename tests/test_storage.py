@@ -0,0 +1,30 @@
+"""Unit tests for the shared JSON writer."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from skill_sonos_controller.storage import atomic_write_json
+
+
+def test_documents_are_replaced_in_place(tmp_path):
+    path = tmp_path / "state" / "scenes.json"
+
+    atomic_write_json(path, {"scenes": []})
+    atomic_write_json(path, {"scenes": ["Party"]}, indent=None)
+
+    assert json.loads(path.read_text(encoding="utf-8")) == {"scenes": ["Party"]}
+    assert [entry.name for entry in path.parent.iterdir()] == ["scenes.json"]
+
+
+def test_a_failed_write_keeps_the_previous_document(tmp_path):
+    path = tmp_path / "scenes.json"
+    atomic_write_json(path, {"scenes": ["Party"]})
+
+    with pytest.raises(TypeError):
+        atomic_write_json(path, {"scenes": [object()]})
+
+    assert json.loads(path.read_text(encoding="utf-8")) == {"scenes": ["Party"]}
+    assert [entry.name for entry in tmp_path.iterdir()] == ["scenes.json"]
@@ -0,0 +1,116 @@
+"""Unit tests for the stored intent template index."""
+
+from pathlib import Path
+
+import pytest
+from ovos_utils import flatten_list
+from ovos_utils.bracket_expansion import expand_template
+
+from skill_sonos_controller.constants import SUPPORTED_LOCALES
+from skill_sonos_controller.templates import (
+    SlotEngine,
+    TemplateIndex,
+    compile_template,
+    locale_digest,
+)
+
+
+def test_digest_tracks_intent_file_contents(tmp_path):
+    (tmp_path / "intents").mkdir()
+    intent = tmp_path / "intents" / "sonos.play.intent"
+    intent.write_text("play {track}\n", encoding="utf-8")
+    (tmp_path / "dialog.dialog").write_text("ignored", encoding="utf-8")
+
+    first = locale_digest(tmp_path)
+    intent.write_text("play {track} in {speaker}\n", encoding="utf-8")
+
+    assert first is not None
+    assert locale_digest(tmp_path) not in (None, first)
+    assert locale_digest(tmp_path / "missing") is None
+
+
+def test_templates_are_only_reused_for_the_same_digest(tmp_path):
+    intents = {"sonos.play.intent": ["play {track}", "start {track}"]}
+    TemplateIndex(tmp_path).save("en-US", "abc", intents)
+
+    assert TemplateIndex(tmp_path).load("en-us", "abc") == intents
+    assert TemplateIndex(tmp_path).load("en-us", "def") is None
+    assert TemplateIndex(tmp_path).load("de-de", "abc") is None
+    assert TemplateIndex().load("en-us", "abc") is None
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        '{"digest": "abc", "intents": {',
+        "[]",
+        '{"digest": "abc", "intents": ["play"]}',
+        '{"digest": "abc", "intents": {"play": 1}}',
+    ],
+)
+def test_malformed_entries_are_a_cache_miss(tmp_path, content):
+    (tmp_path / "en-us.json").write_text(content, encoding="utf-8")
+
+    assert TemplateIndex(tmp_path).load("en-US", "abc") is None
+
+
+def test_unreadable_entries_are_a_cache_miss(tmp_path):
+    (tmp_path / "en-us.json").mkdir()
+
+    assert TemplateIndex(tmp_path).load("en-US", "abc") is None
+
+
+def test_expanded_templates_match_whole_utterances_with_loose_spacing():
+    pattern = compile_template("play  song {track} on  {speaker}")
+
+    assert pattern.fullmatch("Play song Imagine on Living Room").groupdict() == {
+        "track": "Imagine",
+        "speaker": "Living Room",
+    }
+    assert pattern.fullmatch("please play song imagine on den") is None
+
+
+def test_engine_prefers_the_most_specific_template():
+    engine = SlotEngine(
+        {
+            "sonos.track.intent": [
+                "play {track}",
+                "play {track} by {artist} in {speaker}",
+            ],
+            "sonos.album.intent": ["play album {album} in {speaker}"],
+            "sonos.volume.intent": ["{speaker} volume {volume}"],
+        }
+    )
+
+    assert engine.match("play imagine by john in den") == (
+        "sonos.track.intent",
+        {"track": "imagine", "artist": "john", "speaker": "den"},
+    )
+    assert engine.match("Play album Abbey Road in den") == (
+        "sonos.album.intent",
+        {"album": "Abbey Road", "speaker": "den"},
+    )
+    assert engine.match("play album x in den", "sonos.track.intent") == (
+        "sonos.track.intent",
+        {"track": "album x in den"},
+    )
+    assert engine.match("den volume 20")[0] == "sonos.volume.intent"
+    assert engine.match("stop") is None
+    assert engine.size == 4
+
+
+@pytest.mark.parametrize("lang", SUPPORTED_LOCALES)
+def test_every_shipped_template_compiles(lang):
+    intents = Path(__file__).parents[1] / "skill_sonos_controller" / "locale" / lang
+    templates = {
+        path.name: flatten_list(
+            expand_template(line.strip().lower())
+            for line in path.read_text(encoding="utf-8").splitlines()
+            if line.strip()
+        )
+        for path in (intents / "intents").glob("*.intent")
+    }
+
+    engine = SlotEngine(templates)
+
+    assert engine.size == sum(len(set(lines)) for lines in templates.values())
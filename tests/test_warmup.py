@@ -0,0 +1,86 @@
+"""Unit tests for the background warm-up pipeline."""
+
+from __future__ import annotations
+
+import threading
+
+from skill_sonos_controller.warmup import WarmUp
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_stages_run_in_order_and_report_their_duration():
+    clock = Clock()
+    calls = []
+
+    def slow():
+        calls.append("parser")
+        clock.now += 0.25
+
+    warm_up = WarmUp(
+        (("parser", slow), ("service", lambda: calls.append("service"))),
+        clock=clock,
+    )
+
+    assert warm_up.stats() == {"state": "pending", "stages": {}}
+
+    warm_up.run()
+
+    assert calls == ["parser", "service"]
+    assert warm_up.stats() == {
+        "state": "done",
+        "stages": {"parser": 0.25, "service": 0.0},
+    }
+
+
+def test_cancel_skips_the_remaining_stages():
+    calls = []
+    warm_up = WarmUp(())
+    warm_up.stages = (
+        ("parser", lambda: (calls.append("parser"), warm_up.cancel())),
+        ("service", lambda: calls.append("service")),
+    )
+
+    warm_up.run()
+
+    assert calls == ["parser"]
+    assert warm_up.cancelled
+    assert warm_up.stats() == {"state": "cancelled", "stages": {"parser": 0.0}}
+
+
+def test_a_cancelled_pipeline_never_starts():
+    calls = []
+    warm_up = WarmUp((("parser", lambda: calls.append("parser")),))
+
+    warm_up.cancel()
+    warm_up.start()
+
+    assert calls == []
+    assert warm_up.stats()["state"] == "cancelled"
+
+
+def test_stages_run_once_on_a_daemon_thread():
+    threads = []
+    finished = threading.Event()
+    warm_up = WarmUp(
+        (
+            ("parser", lambda: threads.append(threading.current_thread())),
+            ("service", finished.set),
+        )
+    )
+
+    warm_up.start()
+    warm_up.start()
+
+    assert finished.wait(2)
+    warm_up.cancel(timeout=2)
+    assert len(threads) == 1
+    assert threads[0] is not threading.current_thread()
+    assert threads[0].daemon
+    assert threads[0].name == "sonos-warm-up"